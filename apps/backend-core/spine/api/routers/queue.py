@@ -5,6 +5,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from spine.db.engine import get_db
 from spine.db.models import DBQueueItem
+from spine.db.search import apply_queue_search
 
 router = APIRouter()
 
@@ -36,7 +37,7 @@ def get_queue_items(
     current_user: DBUser = Depends(get_current_active_user)
 ):
     # Security: Allowlist sort fields
-    allowed_sorts = ["priority", "sla_deadline", "title", "created_at"]
+    allowed_sorts = ["priority", "sla_deadline", "title", "created_at", "relevance"]
     if sort_by not in allowed_sorts:
         raise HTTPException(status_code=400, detail=f"Invalid sort_by field. Allowed: {allowed_sorts}")
 
@@ -50,15 +51,20 @@ def get_queue_items(
     if priority is not None:
         query = query.filter(DBQueueItem.priority == priority)
         
+    rank = None
     if search is not None and search.strip():
-        query = query.filter(DBQueueItem.title.ilike(f"%{search}%"))
+        # Indexed title search (FTS5 / pg_trgm), see spine.db.search
+        query, rank = apply_queue_search(db, query, search)
     
-    # 2. Apply Sorting
-    sort_attr = getattr(DBQueueItem, sort_by)
+    # 2. Apply Sorting (id breaks ties so pages do not overlap)
+    if sort_by == "relevance":
+        sort_attr = rank if rank is not None else DBQueueItem.created_at
+    else:
+        sort_attr = getattr(DBQueueItem, sort_by)
     if order == "desc":
-        query = query.order_by(sort_attr.desc())
+        query = query.order_by(sort_attr.desc(), DBQueueItem.id.desc())
     else:
-        query = query.order_by(sort_attr.asc())
+        query = query.order_by(sort_attr.asc(), DBQueueItem.id.asc())
 
     # 3. Apply Pagination
     items = query.offset(skip).limit(limit).all()
@@ -1,7 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, DDL, event
 from sqlalchemy.sql import func
 from spine.db.engine import Base
 
+# Title search indexes are only created where the database supports them; without
+# them spine.db.search falls back to unindexed substring matching.
+def _fts5_available(ddl, target, bind, **kw) -> bool:
+    return bool(bind.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar())
+
+def _pg_trgm_available(ddl, target, bind, **kw) -> bool:
+    return bind.exec_driver_sql("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'").first() is not None
+
 class DBQueueItem(Base):
     """
     Real World persistence for Unified Queue.
@@ -18,6 +26,34 @@ class DBQueueItem(Base):
     created_at = Column(DateTime, default=func.now())
     tenant_id = Column(String, index=True) # Multi-tenancy enforcement
 
+    __table_args__ = (
+        # Title search on Postgres (SQLite uses the FTS5 table below)
+        Index(
+            "ix_queue_items_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql", callable_=_pg_trgm_available),
+    )
+
+# SQLite title search: an FTS5 table kept in sync with queue_items by triggers.
+QUEUE_SEARCH_FTS = "queue_items_search"
+QUEUE_SEARCH_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {QUEUE_SEARCH_FTS} USING fts5(id UNINDEXED, title)",
+    f"""CREATE TRIGGER IF NOT EXISTS queue_items_search_insert AFTER INSERT ON queue_items BEGIN
+        INSERT INTO {QUEUE_SEARCH_FTS} (id, title) VALUES (NEW.id, COALESCE(NEW.title, ''));
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS queue_items_search_update AFTER UPDATE OF id, title ON queue_items BEGIN
+        DELETE FROM {QUEUE_SEARCH_FTS} WHERE id = OLD.id;
+        INSERT INTO {QUEUE_SEARCH_FTS} (id, title) VALUES (NEW.id, COALESCE(NEW.title, ''));
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS queue_items_search_delete AFTER DELETE ON queue_items BEGIN
+        DELETE FROM {QUEUE_SEARCH_FTS} WHERE id = OLD.id;
+    END""",
+]
+for _statement in QUEUE_SEARCH_FTS_DDL:
+    event.listen(DBQueueItem.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite", callable_=_fts5_available))
+event.listen(DBQueueItem.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql", callable_=_pg_trgm_available))
+event.listen(DBQueueItem.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {QUEUE_SEARCH_FTS}").execute_if(dialect="sqlite"))
+
 class DBAuditLog(Base):
     """
     Start of the Evidence Store.
@@ -0,0 +1,77 @@
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, Float, MetaData, String, Table, func, literal_column, select, text, type_coerce
+from sqlalchemy.orm import Query, Session
+
+from spine.db.models import DBQueueItem, QUEUE_SEARCH_FTS
+
+# Search terms beyond this are ignored.
+MAX_SEARCH_TERMS = 8
+
+# Created by DDL in spine.db.models, not by the ORM metadata.
+_fts = Table(
+    QUEUE_SEARCH_FTS, MetaData(),
+    Column("id", String),
+    Column("title", String),
+)
+
+
+def search_terms(text: str) -> List[str]:
+    """
+    Words of a search box query, lowercased (punctuation and '_' separate words).
+    """
+    return re.findall(r"[^\W_]+", (text or "").lower())[:MAX_SEARCH_TERMS]
+
+
+# Search backend per engine, detected on first use.
+_backends = {}
+
+
+def search_backend(db: Session) -> str:
+    """
+    'fts5' (SQLite with the FTS5 title table), 'trgm' (Postgres with pg_trgm) or
+    'like' (unindexed substring match: any other database, or no search index).
+    """
+    bind = db.get_bind()
+    backend = _backends.get(bind)
+    if backend is None:
+        backend = _backends[bind] = _detect_backend(db, bind.dialect.name)
+    return backend
+
+
+def _detect_backend(db: Session, dialect: str) -> str:
+    if dialect == "sqlite":
+        found = db.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": QUEUE_SEARCH_FTS}).first()
+        return "fts5" if found else "like"
+    if dialect == "postgresql":
+        found = db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first()
+        return "trgm" if found else "like"
+    return "like"
+
+
+def apply_queue_search(db: Session, query: Query, text: str) -> Tuple[Query, Optional[object]]:
+    """
+    Restricts a DBQueueItem query to items whose title matches every term, using
+    FTS5 (word prefixes) on SQLite or the pg_trgm GIN index (substrings) on Postgres,
+    else plain substring matching (see search_backend).
+    Returns the query and a rank expression, lower = more relevant (None if unranked).
+    """
+    terms = search_terms(text)
+    if not terms:
+        return query, None
+
+    backend = search_backend(db)
+    if backend == "fts5":
+        match = " ".join(f'"{t}"*' for t in terms)
+        hits = select(
+            _fts.c.id,
+            type_coerce(func.bm25(literal_column(QUEUE_SEARCH_FTS)), Float).label("rank")
+        ).where(_fts.c.title.op("MATCH")(match)).subquery()
+        return query.join(hits, hits.c.id == DBQueueItem.id), hits.c.rank
+
+    for term in terms:
+        query = query.filter(DBQueueItem.title.icontains(term, autoescape=True))
+    if backend == "trgm":
+        return query, type_coerce(-func.similarity(DBQueueItem.title, " ".join(terms)), Float)
+    return query, None
@@ -0,0 +1,64 @@
+"""queue_title_search
+
+Revision ID: 5d2e9c7b4a10
+Revises: 38275ab3968d
+Create Date: 2026-10-18 17:05:12.408117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e9c7b4a10'
+down_revision: Union[str, Sequence[str], None] = '38275ab3968d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors spine.db.models.QUEUE_SEARCH_FTS_DDL
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS queue_items_search USING fts5(id UNINDEXED, title)",
+    """CREATE TRIGGER IF NOT EXISTS queue_items_search_insert AFTER INSERT ON queue_items BEGIN
+        INSERT INTO queue_items_search (id, title) VALUES (NEW.id, COALESCE(NEW.title, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS queue_items_search_update AFTER UPDATE OF id, title ON queue_items BEGIN
+        DELETE FROM queue_items_search WHERE id = OLD.id;
+        INSERT INTO queue_items_search (id, title) VALUES (NEW.id, COALESCE(NEW.title, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS queue_items_search_delete AFTER DELETE ON queue_items BEGIN
+        DELETE FROM queue_items_search WHERE id = OLD.id;
+    END""",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Without FTS5 / pg_trgm no index is created; search falls back to LIKE (spine.db.search).
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    if dialect == "sqlite":
+        if not bind.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar():
+            return
+        for statement in FTS_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO queue_items_search (id, title) SELECT id, COALESCE(title, '') FROM queue_items")
+    elif dialect == "postgresql":
+        if bind.exec_driver_sql("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'").first() is None:
+            return
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'ix_queue_items_title_trgm', 'queue_items', ['title'], unique=False,
+            postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("queue_items_search_delete", "queue_items_search_update", "queue_items_search_insert"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS queue_items_search")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_queue_items_title_trgm")
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, sessionmaker
+from spine.db.engine import Base
+from spine.db.models import DBQueueItem
+from spine.db import search
+from spine.db.search import apply_queue_search, search_backend
+from spine.api.routers.queue import get_queue_items
+
+def queue_db(tmp_path, name="queue.db"):
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def seed(db, titles):
+    start = datetime(2026, 1, 1)
+    for i, title in enumerate(titles):
+        db.add(DBQueueItem(id=f"item_{i}", title=title, priority=1, status="PENDING", sla_deadline=start, created_at=start + timedelta(minutes=i)))
+    db.commit()
+
+def matching(db, text_):
+    query, _ = apply_queue_search(db, db.query(DBQueueItem), text_)
+    return sorted(item.id for item in query)
+
+def queue(db, **params):
+    defaults = dict(skip=0, limit=10, sort_by="priority", order="asc", status="PENDING", priority=None, search=None)
+    return [item.id for item in get_queue_items(**{**defaults, **params}, db=db, current_user=None)]
+
+def test_fts_search_matches_every_term_as_a_word_prefix(tmp_path):
+    db = queue_db(tmp_path)
+    try:
+        assert search_backend(db) == "fts5"
+        seed(db, ["Lease renewal Unit 4B", "Lease_termination notice", "Renew insurance", "Plumbing leak"])
+
+        assert matching(db, "lease") == ["item_0", "item_1"]
+        assert matching(db, "LEASE renew") == ["item_0"]
+        assert matching(db, "termin") == ["item_1"]
+        assert matching(db, "lease leak") == []
+        # Punctuation is a separator, never FTS syntax.
+        assert matching(db, 'lease" OR "leak') == []
+
+        # Triggers keep the index in step with the titles.
+        db.get(DBQueueItem, "item_3").title = "Lease for plumbing"
+        db.delete(db.get(DBQueueItem, "item_0"))
+        db.commit()
+        assert matching(db, "lease") == ["item_1", "item_3"]
+    finally:
+        db.close()
+
+def test_relevance_sort_ranks_better_matches_first(tmp_path):
+    db = queue_db(tmp_path)
+    try:
+        seed(db, [
+            "Lease question from the tenant of unit twelve about parking and storage",
+            "Lease lease renewal",
+            "Unrelated work order",
+        ])
+        assert queue(db, search="lease", sort_by="relevance") == ["item_1", "item_0"]
+        assert queue(db, search="lease", sort_by="relevance", order="desc") == ["item_0", "item_1"]
+        # Without a search, relevance is creation order.
+        assert queue(db, sort_by="relevance") == ["item_0", "item_1", "item_2"]
+    finally:
+        db.close()
+
+def test_search_falls_back_to_substring_match_without_fts5(tmp_path):
+    db = queue_db(tmp_path, "no_fts.db")
+    try:
+        # A SQLite build without FTS5 gets no search table or triggers.
+        for trigger in ("queue_items_search_insert", "queue_items_search_update", "queue_items_search_delete"):
+            db.execute(text(f"DROP TRIGGER {trigger}"))
+        db.execute(text("DROP TABLE queue_items_search"))
+        db.commit()
+        seed(db, ["Lease renewal Unit 4B", "Sublease request", "Plumbing leak"])
+
+        assert search_backend(db) == "like"
+        assert matching(db, "lease") == ["item_0", "item_1"]
+        assert matching(db, "lease 4b") == ["item_0"]
+        assert queue(db, search="lease", sort_by="relevance") == ["item_0", "item_1"]
+    finally:
+        db.close()
+
+def test_postgres_uses_trigram_similarity_only_with_pg_trgm(monkeypatch):
+    def postgres_session(has_pg_trgm):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        db.execute.return_value.first.return_value = (1,) if has_pg_trgm else None
+        return db
+
+    assert search._detect_backend(postgres_session(True), "postgresql") == "trgm"
+    assert search._detect_backend(postgres_session(False), "postgresql") == "like"
+
+    for backend, ranked in (("trgm", True), ("like", False)):
+        monkeypatch.setattr(search, "search_backend", lambda db, backend=backend: backend)
+        query, rank = apply_queue_search(None, Session().query(DBQueueItem), "lease renewal")
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+        assert sql.count("ILIKE") == 2
+        assert (rank is not None) == ranked
@@ -0,0 +1,46 @@
+-- Migration 0007: O(1) Chain Head
+-- Depends on: 0005_proof_chain_link
+
+-- 1. Chain Head Table (one row per chain; the application moves it in the insert transaction)
+CREATE TABLE IF NOT EXISTS chain_heads (
+    chain TEXT PRIMARY KEY,
+    head_hash TEXT NOT NULL,
+    head_decision_id UUID,
+    length INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 2. Seed from the existing chain (last full scan the chain will ever need)
+INSERT INTO chain_heads (chain, head_hash, head_decision_id, length)
+SELECT 'decisions',
+       COALESCE((SELECT decision_hash FROM decision_objects ORDER BY timestamp DESC, decision_id DESC LIMIT 1), 'GENESIS'),
+       (SELECT decision_id FROM decision_objects ORDER BY timestamp DESC, decision_id DESC LIMIT 1),
+       (SELECT COUNT(*) FROM decision_objects)
+ON CONFLICT (chain) DO NOTHING;
+
+-- 3. Chain Enforcement Trigger Function: validate against the head row instead of scanning.
+-- The row lock replaces advisory lock 1000 and serializes appends.
+CREATE OR REPLACE FUNCTION maintain_prover_chain()
+RETURNS TRIGGER AS $$
+DECLARE
+    last_hash TEXT;
+BEGIN
+    SELECT head_hash INTO last_hash
+    FROM chain_heads
+    WHERE chain = 'decisions'
+    FOR UPDATE;
+
+    IF last_hash IS NULL THEN
+        last_hash := 'GENESIS';
+    END IF;
+
+    IF NEW.previous_hash IS NULL THEN
+        NEW.previous_hash := last_hash; -- Auto-link if not provided
+    ELSIF NEW.previous_hash != last_hash THEN
+        -- OPTIMISTIC CONCURRENCY CHECK
+        RAISE EXCEPTION 'Invalid previous_hash. Chain tip has moved. Expected %, got %', last_hash, NEW.previous_hash;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
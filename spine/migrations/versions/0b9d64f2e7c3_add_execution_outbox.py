@@ -0,0 +1,38 @@
+"""Add execution_outbox table
+
+Revision ID: 0b9d64f2e7c3
+Revises: f5b3e81a6c20
+Create Date: 2026-10-18 17:31:52.846120+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b9d64f2e7c3'
+down_revision: Union[str, None] = 'f5b3e81a6c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('execution_outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('decision_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('dispatched_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['decision_id'], ['decision_objects.decision_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('decision_id')
+    )
+    op.create_index('ix_execution_outbox_pending', 'execution_outbox', ['dispatched_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_execution_outbox_pending', table_name='execution_outbox')
+    op.drop_table('execution_outbox')
@@ -0,0 +1,34 @@
+"""Add projection_checkpoints table
+
+Revision ID: 3b7d21e4c9a1
+Revises: 9f8825c0bb8c
+Create Date: 2026-10-18 09:12:41.503218+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d21e4c9a1'
+down_revision: Union[str, None] = '9f8825c0bb8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('projection_checkpoints',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('last_timestamp', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('last_decision_id', sa.Uuid(), nullable=True),
+    sa.Column('last_decision_hash', sa.String(), nullable=True),
+    sa.Column('decisions_applied', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('projection_checkpoints')
@@ -0,0 +1,36 @@
+"""Add merkle_nodes table
+
+Revision ID: 3f6e1b9a4d07
+Revises: 7d3a0c52b9e1
+Create Date: 2026-10-18 19:26:41.208816+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6e1b9a4d07'
+down_revision: Union[str, None] = '7d3a0c52b9e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('merkle_nodes',
+    sa.Column('position', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('height', sa.Integer(), nullable=False),
+    sa.Column('hash', sa.String(), nullable=False),
+    sa.Column('leaf_index', sa.Integer(), nullable=True),
+    sa.Column('decision_id', sa.Uuid(), nullable=True),
+    sa.ForeignKeyConstraint(['decision_id'], ['decision_objects.decision_id'], ),
+    sa.PrimaryKeyConstraint('position'),
+    sa.UniqueConstraint('decision_id'),
+    sa.UniqueConstraint('leaf_index')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('merkle_nodes')
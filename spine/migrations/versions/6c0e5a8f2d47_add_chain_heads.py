@@ -0,0 +1,33 @@
+"""Add chain_heads table
+
+Revision ID: 6c0e5a8f2d47
+Revises: 3b7d21e4c9a1
+Create Date: 2026-10-18 11:40:07.218953+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c0e5a8f2d47'
+down_revision: Union[str, None] = '3b7d21e4c9a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('chain_heads',
+    sa.Column('chain', sa.String(), nullable=False),
+    sa.Column('head_hash', sa.String(), nullable=False),
+    sa.Column('head_decision_id', sa.Uuid(), nullable=True),
+    sa.Column('length', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('chain')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('chain_heads')
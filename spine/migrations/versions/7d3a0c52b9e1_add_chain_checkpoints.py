@@ -0,0 +1,38 @@
+"""Add chain_checkpoints table
+
+Revision ID: 7d3a0c52b9e1
+Revises: 0b9d64f2e7c3
+Create Date: 2026-10-18 18:42:07.519304+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3a0c52b9e1'
+down_revision: Union[str, None] = '0b9d64f2e7c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('chain_checkpoints',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('chain', sa.String(), nullable=False),
+    sa.Column('height', sa.Integer(), nullable=False),
+    sa.Column('head_hash', sa.String(), nullable=False),
+    sa.Column('head_decision_id', sa.Uuid(), nullable=False),
+    sa.Column('links_only', sa.Boolean(), nullable=False, server_default=sa.false()),
+    sa.Column('verified_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('signature', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_chain_checkpoints_chain_height', 'chain_checkpoints', ['chain', 'height'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chain_checkpoints_chain_height', table_name='chain_checkpoints')
+    op.drop_table('chain_checkpoints')
@@ -0,0 +1,96 @@
+"""Add decision_objects.chain_seq (chain position)
+
+Revision ID: 9a2c4e7f1b65
+Revises: 3f6e1b9a4d07
+Create Date: 2026-10-19 09:12:33.604918+00:00
+
+"""
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a2c4e7f1b65'
+down_revision: Union[str, None] = '3f6e1b9a4d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+def _link_order(group, previous):
+    # Decisions sharing a timestamp, in the order their previous_hash links give
+    # (decision_id order where no link continues the chain).
+    remaining = list(group)
+    ordered = []
+    while remaining:
+        row = next((r for r in remaining if r.previous_hash == previous), remaining[0])
+        remaining.remove(row)
+        ordered.append(row)
+        previous = row.decision_hash
+    return ordered, previous
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('decision_objects') as batch_op:
+        batch_op.add_column(sa.Column('chain_seq', sa.Integer(), nullable=True))
+
+    # Existing rows are numbered in (timestamp, decision_id) order, keyset-batched;
+    # rows with the same timestamp are put in link order.
+    bind = op.get_bind()
+    decisions = sa.table(
+        'decision_objects',
+        sa.column('decision_id'), sa.column('timestamp'), sa.column('decision_hash'),
+        sa.column('previous_hash'), sa.column('chain_seq')
+    )
+    assign = decisions.update().where(decisions.c.decision_id == sa.bindparam('id')).values(chain_seq=sa.bindparam('seq'))
+
+    seq = 0
+    previous = "GENESIS"
+    group = []
+    last = None
+    while True:
+        query = sa.select(decisions.c.decision_id, decisions.c.timestamp, decisions.c.decision_hash, decisions.c.previous_hash) \
+            .order_by(decisions.c.timestamp, decisions.c.decision_id).limit(BACKFILL_BATCH)
+        if last is not None:
+            query = query.where(sa.or_(
+                decisions.c.timestamp > last.timestamp,
+                sa.and_(decisions.c.timestamp == last.timestamp, decisions.c.decision_id > last.decision_id)
+            ))
+        rows = bind.execute(query).fetchall()
+        if not rows:
+            break
+        last = rows[-1]
+
+        # A timestamp group may continue into the next batch: keep the trailing one.
+        done = [r for r in group + rows if r.timestamp != last.timestamp]
+        group = [r for r in group + rows if r.timestamp == last.timestamp]
+        updates = []
+        for _, tied in groupby(done, key=lambda r: r.timestamp):
+            ordered, previous = _link_order(list(tied), previous)
+            for row in ordered:
+                seq += 1
+                updates.append({"id": row.decision_id, "seq": seq})
+        if updates:
+            bind.execute(assign, updates)
+
+    ordered, previous = _link_order(group, previous)
+    updates = []
+    for row in ordered:
+        seq += 1
+        updates.append({"id": row.decision_id, "seq": seq})
+    if updates:
+        bind.execute(assign, updates)
+
+    # New appends continue after the backfilled positions.
+    bind.execute(sa.text("UPDATE chain_heads SET length = :length WHERE chain = 'decisions'"), {"length": seq})
+    op.create_index('ix_decision_objects_chain_seq', 'decision_objects', ['chain_seq'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_decision_objects_chain_seq', table_name='decision_objects')
+    with op.batch_alter_table('decision_objects') as batch_op:
+        batch_op.drop_column('chain_seq')
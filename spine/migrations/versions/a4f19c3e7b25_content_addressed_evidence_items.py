@@ -0,0 +1,38 @@
+"""Content-addressed evidence items
+
+Revision ID: a4f19c3e7b25
+Revises: 6c0e5a8f2d47
+Create Date: 2026-10-18 14:05:52.901344+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f19c3e7b25'
+down_revision: Union[str, None] = '6c0e5a8f2d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('evidence_items',
+    sa.Column('item_hash', sa.String(), nullable=False),
+    sa.Column('content', sa.JSON(), nullable=False),
+    sa.Column('first_seen_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('item_hash')
+    )
+    with op.batch_alter_table('evidence_bundles') as batch_op:
+        batch_op.add_column(sa.Column('item_hashes', sa.JSON(), nullable=True))
+        batch_op.alter_column('items_json', existing_type=sa.JSON(), nullable=True)
+
+
+def downgrade() -> None:
+    # Bundles stored by hash only must be re-inlined before downgrading.
+    with op.batch_alter_table('evidence_bundles') as batch_op:
+        batch_op.alter_column('items_json', existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column('item_hashes')
+    op.drop_table('evidence_items')
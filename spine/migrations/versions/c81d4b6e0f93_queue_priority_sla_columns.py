@@ -0,0 +1,53 @@
+"""Persist queue priority and SLA deadline on decisions
+
+Revision ID: c81d4b6e0f93
+Revises: a4f19c3e7b25
+Create Date: 2026-10-18 15:27:13.662019+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d4b6e0f93'
+down_revision: Union[str, None] = 'a4f19c3e7b25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('decision_objects') as batch_op:
+        batch_op.add_column(sa.Column('priority', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('sla_deadline', sa.TIMESTAMP(timezone=True), nullable=True))
+
+    # Backfill with the rules in vte.orm.queue_priority / QUEUE_SLA
+    if op.get_bind().dialect.name == "sqlite":
+        sla = "datetime(timestamp, '+1 day')"
+    else:
+        sla = "timestamp + interval '1 day'"
+    op.execute(f"""
+        UPDATE decision_objects SET
+            priority = CASE
+                WHEN intent_action LIKE '%High%' THEN 1
+                WHEN intent_action LIKE '%Low%' THEN 3
+                ELSE 2
+            END,
+            sla_deadline = {sla}
+    """)
+
+    with op.batch_alter_table('decision_objects') as batch_op:
+        batch_op.alter_column('priority', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('sla_deadline', existing_type=sa.TIMESTAMP(timezone=True), nullable=False)
+        batch_op.create_index('ix_decision_objects_queue_priority', ['outcome', 'priority', 'decision_id'], unique=False)
+        batch_op.create_index('ix_decision_objects_queue_sla', ['outcome', 'sla_deadline', 'decision_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('decision_objects') as batch_op:
+        batch_op.drop_index('ix_decision_objects_queue_sla')
+        batch_op.drop_index('ix_decision_objects_queue_priority')
+        batch_op.drop_column('sla_deadline')
+        batch_op.drop_column('priority')
@@ -0,0 +1,31 @@
+"""Composite indexes for keyset decision listing
+
+Revision ID: e2a7c59d1b38
+Revises: c81d4b6e0f93
+Create Date: 2026-10-18 16:02:41.208733+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c59d1b38'
+down_revision: Union[str, None] = 'c81d4b6e0f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_decision_objects_timestamp', 'decision_objects', ['timestamp', 'decision_id'], unique=False)
+    op.create_index('ix_decision_objects_outcome_timestamp', 'decision_objects', ['outcome', 'timestamp', 'decision_id'], unique=False)
+    op.create_index('ix_decision_objects_actor_timestamp', 'decision_objects', ['actor_user_id', 'timestamp', 'decision_id'], unique=False)
+    op.create_index('ix_decision_objects_target_timestamp', 'decision_objects', ['intent_target', 'timestamp', 'decision_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_decision_objects_target_timestamp', table_name='decision_objects')
+    op.drop_index('ix_decision_objects_actor_timestamp', table_name='decision_objects')
+    op.drop_index('ix_decision_objects_outcome_timestamp', table_name='decision_objects')
+    op.drop_index('ix_decision_objects_timestamp', table_name='decision_objects')
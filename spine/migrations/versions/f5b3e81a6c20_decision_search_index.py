@@ -0,0 +1,70 @@
+"""Search index over decisions (FTS5 on SQLite, pg_trgm on Postgres)
+
+Revision ID: f5b3e81a6c20
+Revises: e2a7c59d1b38
+Create Date: 2026-10-18 16:48:09.517362+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from vte.orm import DECISION_SEARCH_FTS, DECISION_SEARCH_FTS_DDL, search_document
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b3e81a6c20'
+down_revision: Union[str, None] = 'e2a7c59d1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('decision_objects') as batch_op:
+        batch_op.add_column(sa.Column('search_text', sa.Text(), nullable=True))
+
+    # The document mixes JSON parameters in, so it is built in Python (vte.orm.search_document).
+    bind = op.get_bind()
+    decisions = sa.table(
+        'decision_objects',
+        sa.column('decision_id'), sa.column('intent_action'), sa.column('intent_target'),
+        sa.column('intent_params', sa.JSON()), sa.column('search_text')
+    )
+    assign = decisions.update().where(decisions.c.decision_id == sa.bindparam('id')).values(search_text=sa.bindparam('text'))
+    # Keyset-batched on decision_id: one batch of rows in memory at a time.
+    last = None
+    while True:
+        query = sa.select(decisions.c.decision_id, decisions.c.intent_action, decisions.c.intent_target, decisions.c.intent_params) \
+            .order_by(decisions.c.decision_id).limit(BACKFILL_BATCH)
+        if last is not None:
+            query = query.where(decisions.c.decision_id > last)
+        rows = bind.execute(query).fetchall()
+        if not rows:
+            break
+        last = rows[-1].decision_id
+        bind.execute(assign, [{"id": r.decision_id, "text": search_document(r.intent_action, r.intent_target, r.intent_params)} for r in rows])
+
+    if bind.dialect.name == "sqlite":
+        for statement in DECISION_SEARCH_FTS_DDL:
+            op.execute(statement)
+        op.execute(f"INSERT INTO {DECISION_SEARCH_FTS} (decision_id, document) SELECT decision_id, COALESCE(search_text, '') FROM decision_objects")
+    elif bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'ix_decision_objects_search_trgm', 'decision_objects', ['search_text'], unique=False,
+            postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS decision_search_delete")
+        op.execute("DROP TRIGGER IF EXISTS decision_search_insert")
+        op.execute(f"DROP TABLE IF EXISTS {DECISION_SEARCH_FTS}")
+    elif op.get_bind().dialect.name == "postgresql":
+        op.drop_index('ix_decision_objects_search_trgm', table_name='decision_objects')
+    with op.batch_alter_table('decision_objects') as batch_op:
+        batch_op.drop_column('search_text')
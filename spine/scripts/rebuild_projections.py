@@ -0,0 +1,24 @@
+from vte.db import SessionLocal
+from vte.core.replay import ProjectionReplayer, REPLAY_BATCH_SIZE
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("rebuild_projections")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the Property/Unit projections from the decision log.")
+    parser.add_argument("--reset", action="store_true", help="Delete the projections and replay from genesis instead of resuming.")
+    parser.add_argument("--batch-size", type=int, default=REPLAY_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = ProjectionReplayer(db, batch_size=args.batch_size).rebuild(reset=args.reset)
+        logger.info(f"Done: {stats}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
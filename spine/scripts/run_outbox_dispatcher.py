@@ -0,0 +1,27 @@
+from vte.core.outbox import OutboxDispatcher, OUTBOX_DISPATCH_BATCH, OUTBOX_POLL_SECONDS
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("run_outbox_dispatcher")
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand approved decisions from the execution outbox to the Celery workers.")
+    parser.add_argument("--once", action="store_true", help="Drain the outbox once and exit instead of polling.")
+    parser.add_argument("--batch-size", type=int, default=OUTBOX_DISPATCH_BATCH)
+    parser.add_argument("--poll-interval", type=float, default=OUTBOX_POLL_SECONDS)
+    args = parser.parse_args()
+
+    dispatcher = OutboxDispatcher(batch_size=args.batch_size, poll_interval=args.poll_interval)
+    if args.once:
+        dispatcher.dispatch_pending()
+        logger.info("Outbox drained")
+        return
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from vte.core.chain_verify import ChainVerifier, CHAIN_VERIFY_FETCH_SIZE, CHAIN_VERIFY_WORKERS
+import argparse
+import json
+import logging
+import sys
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("verify_chain")
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the decision chain (hashes and links) and checkpoint it.")
+    parser.add_argument("--full", action="store_true", help="Verify from genesis, ignoring checkpoints.")
+    parser.add_argument(
+        "--seal-legacy", action="store_true",
+        help="Once, at upgrade: accept decisions whose hashes predate recomputable hashing "
+             "(links still checked) and checkpoint them as legacy."
+    )
+    parser.add_argument("--workers", type=int, default=CHAIN_VERIFY_WORKERS)
+    parser.add_argument("--fetch-size", type=int, default=CHAIN_VERIFY_FETCH_SIZE)
+    args = parser.parse_args()
+
+    report = ChainVerifier(workers=args.workers, fetch_size=args.fetch_size, full=args.full, seal_legacy=args.seal_legacy).verify()
+    for problem in report.problems:
+        logger.error(json.dumps(problem))
+    # Non-zero exit so the nightly job alerts.
+    sys.exit(0 if report.ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
+import os
+# Tests run Celery eagerly and expect approved decisions to execute within the request.
+os.environ.setdefault("VTE_OUTBOX_DISPATCH", "inline")
+
 import pytest
 from vte.db import engine, Base
 
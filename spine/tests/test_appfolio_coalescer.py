@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from vte.adapters.appfolio.coalescer import WriteBackCoalescer
+
+class FakeClient:
+    def __init__(self, reachable=True):
+        self.reachable = reachable
+        self.navigations = []
+        self.notes = []
+
+    def navigate_to_tenant(self, tenant_id):
+        self.navigations.append(tenant_id)
+        return self.reachable
+
+    def write_note(self, content, dry_run=False):
+        self.notes.append(content)
+        return content != "rejected"
+
+class FakePool:
+    def __init__(self, client):
+        self.client = client
+
+    @contextmanager
+    def lease(self):
+        yield self.client
+
+def note(content):
+    return lambda client: client.write_note(content)
+
+def test_writebacks_for_one_tenant_share_a_navigation():
+    client = FakeClient()
+    coalescer = WriteBackCoalescer(window_seconds=0.2, workers=1, pool=FakePool(client))
+
+    futures = {
+        "d1": coalescer.submit("tenant_a", "d1", note("first")),
+        "d2": coalescer.submit("tenant_a", "d2", note("rejected")),
+        "d3": coalescer.submit("tenant_a", "d3", note("third")),
+        "d4": coalescer.submit("tenant_b", "d4", note("other tenant")),
+    }
+    results = {decision_id: f.result(timeout=5) for decision_id, f in futures.items()}
+
+    assert results == {"d1": True, "d2": False, "d3": True, "d4": True}
+    assert sorted(client.navigations) == ["tenant_a", "tenant_b"]
+    # Notes for one tenant are written in submission order.
+    assert [n for n in client.notes if n != "other tenant"] == ["first", "rejected", "third"]
+
+def test_failed_navigation_fails_every_decision_in_the_group():
+    client = FakeClient(reachable=False)
+    coalescer = WriteBackCoalescer(window_seconds=0.1, workers=1, pool=FakePool(client))
+
+    futures = [coalescer.submit("tenant_x", f"d{i}", note(f"n{i}")) for i in range(3)]
+
+    assert [f.result(timeout=5) for f in futures] == [False, False, False]
+    assert client.navigations == ["tenant_x"]
+    assert client.notes == []
+
+def test_full_group_flushes_without_waiting_for_the_window():
+    client = FakeClient()
+    coalescer = WriteBackCoalescer(window_seconds=60, max_group=2, workers=1, pool=FakePool(client))
+
+    futures = [coalescer.submit("tenant_a", f"d{i}", note(f"n{i}")) for i in range(2)]
+
+    assert [f.result(timeout=5) for f in futures] == [True, True]
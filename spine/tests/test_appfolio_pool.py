@@ -0,0 +1,67 @@
+import threading
+import pytest
+from vte.adapters.appfolio.pool import AppFolioSessionPool
+
+class FakeClient:
+    started = 0
+
+    def __init__(self):
+        self.healthy = True
+        self.closed = False
+
+    def start(self):
+        FakeClient.started += 1
+
+    def is_healthy(self):
+        return self.healthy
+
+    def close(self):
+        self.closed = True
+
+def test_lease_reuses_warm_session_until_max_uses():
+    FakeClient.started = 0
+    pool = AppFolioSessionPool(factory=FakeClient, max_uses=3)
+
+    seen = []
+    for _ in range(4):
+        with pool.lease() as client:
+            seen.append(client)
+
+    assert seen[0] is seen[1] is seen[2]
+    assert seen[3] is not seen[0]
+    assert seen[0].closed
+    assert FakeClient.started == 2
+
+def test_failed_lease_and_unhealthy_sessions_are_recycled():
+    pool = AppFolioSessionPool(factory=FakeClient)
+
+    with pytest.raises(RuntimeError):
+        with pool.lease() as first:
+            raise RuntimeError("navigation crashed")
+    assert first.closed
+
+    with pool.lease() as second:
+        pass
+    second.healthy = False
+    with pool.lease() as third:
+        pass
+    assert third is not second
+    assert second.closed
+
+def test_sessions_are_not_shared_across_threads():
+    pool = AppFolioSessionPool(factory=FakeClient)
+    with pool.lease() as main_client:
+        pass
+
+    leased = []
+    def worker():
+        with pool.lease() as client:
+            leased.append(client)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert leased[0] is not main_client
+    with pool.lease() as again:
+        assert again is main_client
@@ -0,0 +1,77 @@
+from vte.db import SessionLocal
+from vte.orm import DecisionObject, PermitToken, Property, Unit
+from vte.api.schema import RoleEnum, OutcomeEnum
+from unittest.mock import patch
+from datetime import datetime
+import uuid
+
+inventory_contract = {
+    "feature_id": "inventory",
+    "transitions": [
+        {"trigger": "REGISTER_PROPERTY", "from": "*", "to": "ACTIVE", "target_type": "property"},
+        {"trigger": "REGISTER_UNIT", "from": "*", "to": "VACANT", "target_type": "unit"},
+        {"trigger": "UPDATE_UNIT_TENANT", "from": "VACANT", "to": "OCCUPIED", "target_type": "unit"},
+        {"trigger": "MOVE_OUT", "from": "OCCUPIED", "to": "VACANT", "target_type": "unit"}
+    ],
+    "side_effects": {
+        "REGISTER_PROPERTY": ["db_projection_property"],
+        "REGISTER_UNIT": ["db_projection_unit"],
+        "UPDATE_UNIT_TENANT": ["db_projection_unit_status", "db_update_tenant_info"],
+        "MOVE_OUT": ["db_projection_unit_status"]
+    }
+}
+
+def make_decision(action, target, params=None):
+    decision_id = uuid.uuid4()
+    return DecisionObject(
+        decision_id=decision_id,
+        timestamp=datetime.utcnow(),
+        actor_user_id="batch_tester",
+        actor_role=RoleEnum.system_bot,
+        intent_action=action,
+        intent_target=target,
+        intent_params=params or {},
+        outcome=OutcomeEnum.APPROVED,
+        policy_version="1.0",
+        decision_hash=f"hash_{decision_id}",
+        previous_hash="chain"
+    )
+
+def test_batch_execution_chains_state_and_isolates_failures():
+    db = SessionLocal()
+    try:
+        prop_id = str(uuid.uuid4())
+        unit_id = str(uuid.uuid4())
+        decisions = [
+            make_decision("REGISTER_PROPERTY", prop_id, {"name": "Batch Property"}),
+            make_decision("REGISTER_UNIT", unit_id, {"name": "B-1", "property_id": prop_id}),
+            make_decision("UPDATE_UNIT_TENANT", unit_id, {"tenant_name": "Batch Tenant"}),
+            # Unit is OCCUPIED now (only visible through the batch state view) -> invalid.
+            make_decision("UPDATE_UNIT_TENANT", unit_id, {"tenant_name": "Second Tenant"}),
+            make_decision("MOVE_OUT", unit_id),
+        ]
+        db.add_all(decisions)
+        db.commit()
+        ids = [d.decision_id for d in decisions]
+        missing_id = uuid.uuid4()
+
+        from vte.tasks import execute_decision_batch
+        with patch("vte.core.engine.WorkflowEngine._load_contracts", return_value={"inventory": inventory_contract}):
+            batch = execute_decision_batch([str(i) for i in ids[:3]] + [str(missing_id)] + [str(i) for i in ids[3:]])
+
+        assert batch["status"] == "success"
+        assert batch["total"] == 6
+        statuses = [r["status"] for r in batch["results"]]
+        assert statuses == ["success", "success", "success", "failed", "failed", "success"]
+        assert batch["results"][3]["decision_id"] == str(missing_id)
+
+        db.expire_all()
+        assert db.query(Property).filter(Property.property_id == uuid.UUID(prop_id)).first() is not None
+        unit = db.query(Unit).filter(Unit.unit_id == uuid.UUID(unit_id)).first()
+        assert unit.status == "VACANT"
+        assert unit.tenant_info["tenant_name"] == "Batch Tenant"
+
+        permits = db.query(PermitToken).filter(PermitToken.decision_id.in_(ids)).count()
+        assert permits == 4
+    finally:
+        db.close()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import random
+from enum import Enum, IntEnum
+from pathlib import Path
+import pytest
+from vte.core import canonicalize
+from vte.core.canonicalize import canonical_json_dumps, canonical_sha256
+
+# Conformance corpus: every backend must produce exactly the bytes of the
+# json.dumps reference, and hash them identically.
+
+FIXTURES = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "real_data_pack_v1"
+
+BACKENDS = ["python", "orjson"]
+
+
+class Outcome(str, Enum):
+    APPROVED = "APPROVED"
+
+
+class Level(IntEnum):
+    HIGH = 3
+
+
+def reference(data) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _random_value(rng: random.Random, depth: int):
+    kind = rng.randrange(7 if depth < 6 else 4)
+    if kind == 0:
+        return rng.choice([None, True, False])
+    if kind == 1:
+        return rng.choice([0, -1, rng.randrange(-2 ** 70, 2 ** 70), rng.randrange(-1000, 1000)])
+    if kind in (2, 3):
+        return _random_text(rng)
+    if kind == 4:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randrange(5))]
+    return {_random_text(rng): _random_value(rng, depth + 1) for _ in range(rng.randrange(5))}
+
+
+def _random_text(rng: random.Random) -> str:
+    # Control characters, ASCII, the BMP outside the surrogates, and astral planes.
+    return "".join(chr(rng.choice([rng.randrange(0x20), rng.randrange(0x20, 0x7f),
+                                   rng.randrange(0xa0, 0xd800), rng.randrange(0xe000, 0x110000)]))
+                   for _ in range(rng.randrange(12)))
+
+
+def _nested(depth: int):
+    value = {"leaf": "x"}
+    for i in range(depth):
+        value = {"level": i, "child": [value]}
+    return value
+
+
+def _load(name: str, **kwargs):
+    with open(FIXTURES / name, encoding="utf-8") as f:
+        return json.load(f, **kwargs)
+
+
+CORPUS = {
+    "empty_containers": {"d": {}, "l": [], "s": "", "nested": [{}, [], [[]]]},
+    "scalars": [None, True, False, 0, -0, 1, -1, "null"],
+    "unicode_text": {"text": "café 日本 \U0001f600 \u0000\u001f\u007f\u0080    \"\\/ \b\f\n\r\t"},
+    "unicode_keys": {"é": 1, "e": 2, "\U0001f600": 3, "￿": 4, "Z": 5, "a": 6, "\u0000": 7},
+    "large_integers": [2 ** 63 - 1, 2 ** 63, -(2 ** 63), -(2 ** 63) - 1, 2 ** 64 - 1, 2 ** 64, 10 ** 40, -(10 ** 40)],
+    "deep_nesting": _nested(200),
+    "wide": {f"key{i:05d}": [i, str(i), i % 2 == 0] for i in range(3000)},
+    "enums_and_tuples": {"outcome": Outcome.APPROVED, "level": Level.HIGH, "pair": (1, "a")},
+    "non_str_keys": {1: "a", 2: "b"},
+    "random": [_random_value(random.Random(seed), 0) for seed in range(200)],
+}
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(canonicalize, "CANONICAL_BACKEND", request.param)
+    assert canonicalize.canonical_backend() == request.param
+    return request.param
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_corpus_matches_reference(backend, name):
+    data = CORPUS[name]
+    expected = reference(data)
+    assert canonical_json_dumps(data) == expected
+    assert canonical_sha256(data) == hashlib.sha256(expected).hexdigest()
+
+
+@pytest.mark.parametrize("name", ["real_decision_sample.json", "real_evidence_sample.json"])
+def test_real_data_pack_matches_reference(backend, name):
+    # The fixtures carry decimal amounts; VTE stores those as strings.
+    data = _load(name, parse_float=str)
+    expected = reference(data)
+    digest = canonical_sha256(data)
+    print(f"{backend} {name}: {digest}")
+    assert canonical_json_dumps(data) == expected
+    assert digest == hashlib.sha256(expected).hexdigest()
+
+
+@pytest.mark.parametrize("name", ["real_decision_sample.json", "real_evidence_sample.json"])
+def test_real_data_pack_floats_are_rejected(backend, name):
+    with pytest.raises(ValueError):
+        canonical_json_dumps(_load(name))
+
+
+def test_backends_agree_on_unsupported_input(monkeypatch):
+    pytest.importorskip("orjson")
+    cases = [{"a": 1.5}, {"a": [0.0]}, {1.5: "a"}, {"a": object()}, {"a": "\ud800"}, {(1,): "a"},
+             {"b": 1.5, "a": object()}, {"b": object(), "a": 1.5}]
+    for data in cases:
+        outcomes = []
+        for name in BACKENDS:
+            monkeypatch.setattr(canonicalize, "CANONICAL_BACKEND", name)
+            try:
+                outcomes.append(canonical_json_dumps(data))
+            except Exception as e:
+                outcomes.append(type(e))
+        assert outcomes[0] == outcomes[1], data
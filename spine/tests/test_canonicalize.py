@@ -0,0 +1,58 @@
+import hashlib
+import io
+import json
+from enum import Enum, IntEnum
+import pytest
+from vte.core import canonicalize
+from vte.core.canonicalize import canonical_encode, canonical_json_dumps, canonical_sha256
+
+class Outcome(str, Enum):
+    APPROVED = "APPROVED"
+
+class Level(IntEnum):
+    HIGH = 1
+
+def reference(data):
+    # The previous implementation: json.dumps with canonical settings.
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+PAYLOADS = [
+    {},
+    [],
+    "plain",
+    {"b": 1, "a": [True, False, None], "c": {"z": "", "y": []}},
+    {"text": "quote \" backslash \\ newline \n tab \t nul \u0000 emoji \U0001F600 ünïcode", "big": 2 ** 80, "neg": -7},
+    {"outcome": Outcome.APPROVED, "level": Level.HIGH, "pair": ("a", 1)},
+    {10: "ten", 9: "nine"},
+    {"items": [{"source": "mailbox", "data": {"n": i}, "sha256": "x" * 64} for i in range(50)]},
+]
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_same_bytes_as_before(payload):
+    assert canonical_json_dumps(payload) == reference(payload)
+    assert canonical_sha256(payload) == hashlib.sha256(reference(payload)).hexdigest()
+
+@pytest.mark.parametrize("payload", [1.5, {"a": {"b": [1, 2.0]}}, ["x", ("y", 0.1)], {1.5: "float key"}])
+def test_floats_rejected_anywhere(payload):
+    with pytest.raises(ValueError):
+        canonical_json_dumps(payload)
+    with pytest.raises(ValueError):
+        canonical_sha256(payload)
+
+def test_streams_into_a_sink_in_slices(monkeypatch):
+    monkeypatch.setattr(canonicalize, "CANONICAL_FLUSH_PARTS", 16)
+    monkeypatch.setattr(canonicalize, "CANONICAL_BACKEND", "python")
+    payload = {"items": [{"n": i, "tags": ["a", "b"]} for i in range(200)]}
+    chunks = []
+    canonical_encode(payload, chunks.append)
+    print(f"Streamed {len(chunks)} chunks")
+    assert len(chunks) > 1
+    assert b"".join(chunks) == reference(payload)
+
+    buffer = io.BytesIO()
+    canonical_encode(payload, buffer.write)
+    assert buffer.getvalue() == reference(payload)
+
+def test_unserializable_objects_raise_type_error():
+    with pytest.raises(TypeError):
+        canonical_json_dumps({"when": object()})
@@ -0,0 +1,129 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from vte.main import app
+from vte.api.deps import get_current_user_claims
+from vte.api.schema import RoleEnum, OutcomeEnum
+from vte.db import Base, SessionLocal
+from vte.orm import DecisionObject
+from vte.core.chain import append_decisions
+from vte.core.chain_export import ChainExporter
+from vte.core.evidence_store import new_bundle
+
+client = TestClient(app)
+
+def as_role(role):
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "export_agent", "role": role, "permissions": ["*"]}
+
+def export(**params):
+    resp = client.get("/api/v1/decisions:export", params=params)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+def test_export_streams_chain_with_evidence_and_resumes():
+    as_role("system_bot")
+    try:
+        evidence = client.post("/api/v1/evidence", json={
+            "normalization_schema": "export_v1",
+            "items": [{"source": "mailbox", "type": "email", "data": {"subject": "Lease"}, "sha256": "export_item"}]
+        }).json()
+        drafts = [
+            {
+                "actor": {"user_id": "export_agent", "role": "system_bot", "session_id": "sess_export"},
+                "intent": {"action": "export_note", "target_resource": f"unit_{i}", "parameters": {}},
+                "evidence_hash": evidence["bundle_hash"] if i < 2 else None,
+                "outcome": "PROPOSED",
+                "policy_version": "v1.0"
+            }
+            for i in range(3)
+        ]
+        assert client.post("/api/v1/decisions:batch", json=drafts).status_code == 201
+
+        as_role("auditor")
+        with SessionLocal() as db:
+            total = db.query(DecisionObject).filter(DecisionObject.chain_seq.isnot(None)).count()
+
+        lines = export(include_evidence="true")
+        manifest = lines[-1]
+        decisions = [l["decision"] for l in lines if l["type"] == "decision"]
+        bundles = [l["bundle"] for l in lines if l["type"] == "evidence"]
+        print(f"Export manifest: {manifest}")
+
+        assert manifest["type"] == "manifest"
+        assert manifest["decisions"] == len(decisions) == total
+        assert manifest["head_hash"] == decisions[-1]["decision_hash"]
+        # The shared bundle is written once, before the first decision citing it.
+        assert [b["bundle_hash"] for b in bundles].count(evidence["bundle_hash"]) == 1
+        positions = [i for i, l in enumerate(lines) if l["type"] == "evidence" and l["bundle"]["bundle_hash"] == evidence["bundle_hash"]]
+        citing = [i for i, l in enumerate(lines) if l["type"] == "decision" and l["decision"]["evidence_hash"] == evidence["bundle_hash"]]
+        assert positions[0] < citing[0]
+
+        # Resume after the third-to-last decision: only the last two follow.
+        resumed = export(after=decisions[-3]["decision_hash"])
+        assert [l["decision"]["decision_hash"] for l in resumed[:-1]] == [d["decision_hash"] for d in decisions[-2:]]
+        assert resumed[-1]["head_hash"] == manifest["head_hash"]
+        assert resumed[-1]["broken_links"] == 0
+
+        assert client.get("/api/v1/decisions:export", params={"after": "no_such_hash"}).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+def test_export_requires_auditor_role():
+    as_role("user")
+    try:
+        assert client.get("/api/v1/decisions:export").status_code == 403
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+def test_export_loads_a_pages_evidence_items_in_one_query(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def item(n):
+        return {"source": "mailbox", "type": "email", "data": {"n": n}, "sha256": f"item_{n}"}
+
+    with session_factory() as db:
+        bundles = []
+        for i in range(20):
+            bundle = new_bundle(
+                db, [item(i), item("shared")],
+                collected_at=datetime.now(timezone.utc), normalization_schema="export_v1", bundle_hash=f"bundle_{i}"
+            )
+            db.add(bundle)
+            bundles.append(bundle.bundle_hash)
+        db.commit()
+
+        def decision(previous_hash, i):
+            return DecisionObject(
+                decision_id=uuid.uuid4(),
+                timestamp=datetime.now(timezone.utc),
+                actor_user_id="export_agent",
+                actor_role=RoleEnum.auditor,
+                intent_action="export_note",
+                intent_target=f"unit_{i}",
+                intent_params={},
+                evidence_hash=bundles[i],
+                outcome=OutcomeEnum.PROPOSED,
+                policy_version="1.0",
+                decision_hash=uuid.uuid4().hex,
+                previous_hash=previous_hash
+            )
+        append_decisions(db, [(lambda previous_hash, i=i: decision(previous_hash, i)) for i in range(20)])
+
+    selects = []
+    record = lambda conn, cursor, statement, *args: selects.append(statement) if statement.lstrip().upper().startswith("SELECT") else None
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        lines = [json.loads(line) for line in ChainExporter(session_factory, include_evidence=True, fetch_size=20).lines()]
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    exported = [l["bundle"] for l in lines if l["type"] == "evidence"]
+    assert [b["items"] for b in exported] == [[item(i), item("shared")] for i in range(20)]
+    # Decisions, bundles, items: not one item query per bundle.
+    assert len(selects) == 3, selects
@@ -0,0 +1,121 @@
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from vte.db import Base
+from vte.orm import ChainCheckpoint, DecisionObject
+from vte.api.routes import _build_decision
+from vte.api.schema import DecisionDraft
+from vte.core.canonicalize import canonical_sha256
+from vte.core.chain import append_decisions, hashed_payload
+from vte.core.chain_verify import ChainVerifier
+
+def ledger(tmp_path):
+    # A chain of its own: the shared test DB holds rows other tests insert unchained.
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def draft(label, i):
+    return DecisionDraft(
+        actor={"user_id": "verify_agent", "role": "system_bot", "session_id": "sess_verify"},
+        intent={"action": "verify_note", "target_resource": f"{label}_{i}", "parameters": {"n": i, "note": "café ✓"}},
+        evidence_hash=None,
+        outcome="PROPOSED",
+        policy_version="v1.0"
+    )
+
+def append(session_factory, count, label):
+    drafts = [draft(label, i) for i in range(count)]
+    with session_factory() as db:
+        append_decisions(db, [(lambda previous_hash, draft=draft: _build_decision(draft, previous_hash)) for draft in drafts])
+
+def test_parallel_verification_resumes_from_checkpoint(tmp_path):
+    session_factory = ledger(tmp_path)
+    append(session_factory, 30, "first")
+
+    report = ChainVerifier(session_factory, workers=2, fetch_size=7).verify()
+    print(report)
+    assert report.ok and report.height == 30 and report.verified == 30
+    assert report.checkpoint_written
+
+    append(session_factory, 5, "second")
+    tail = ChainVerifier(session_factory, workers=1, fetch_size=7).verify()
+    assert tail.ok and tail.resumed_from == 30 and tail.verified == 5 and tail.height == 35
+
+    full = ChainVerifier(session_factory, workers=2, fetch_size=4, full=True).verify()
+    assert full.ok and full.verified == 35 and full.head_hash == tail.head_hash
+
+def test_tampering_is_reported_and_bad_checkpoints_are_ignored(tmp_path):
+    session_factory = ledger(tmp_path)
+    append(session_factory, 12, "tamper")
+    assert ChainVerifier(session_factory, workers=1).verify().ok
+
+    with session_factory() as db:
+        checkpoint = db.query(ChainCheckpoint).one()
+        checkpoint.signature = "0" * 64
+        victim = db.query(DecisionObject).filter(DecisionObject.intent_target == "tamper_5").one()
+        victim.intent_target = "tamper_5_edited"
+        db.commit()
+
+    report = ChainVerifier(session_factory, workers=2, fetch_size=5).verify()
+    print(report.problems)
+    assert report.checkpoint_rejected == "bad signature"
+    assert report.resumed_from == 0 and report.verified == 12
+    assert report.hash_mismatches == 1 and report.broken_links == 0
+    assert report.problems[0]["height"] == 6
+    assert not report.checkpoint_written
+
+def test_decisions_sharing_a_clock_tick_keep_chain_order(tmp_path):
+    # Group commit writes bursts within one tick; (timestamp, uuid4) order would shuffle them.
+    session_factory = ledger(tmp_path)
+    tick = datetime.datetime.now(datetime.timezone.utc)
+
+    def build(previous_hash, i):
+        decision = _build_decision(draft("tick", i), previous_hash)
+        decision.timestamp = tick
+        decision.decision_hash = canonical_sha256(hashed_payload(decision))
+        return decision
+
+    with session_factory() as db:
+        append_decisions(db, [(lambda previous_hash, i=i: build(previous_hash, i)) for i in range(20)])
+
+    report = ChainVerifier(session_factory, workers=1).verify()
+    assert report.ok and report.verified == 20
+
+def test_legacy_hashes_are_sealed_once_and_reported_apart(tmp_path):
+    # Before hashed_payload, the hashed timestamp string was taken apart from the
+    # stored one, so those decisions link correctly but never rehash.
+    session_factory = ledger(tmp_path)
+
+    def legacy(previous_hash, i):
+        decision = _build_decision(draft("legacy", i), previous_hash)
+        payload = hashed_payload(decision)
+        payload["timestamp"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        decision.decision_hash = canonical_sha256(payload)
+        return decision
+
+    with session_factory() as db:
+        append_decisions(db, [(lambda previous_hash, i=i: legacy(previous_hash, i)) for i in range(10)])
+
+    strict = ChainVerifier(session_factory, workers=1).verify()
+    assert strict.hash_mismatches == 10 and not strict.checkpoint_written
+
+    sealed = ChainVerifier(session_factory, workers=1, seal_legacy=True).verify()
+    assert sealed.ok and sealed.legacy_hash_mismatches == 10 and sealed.checkpoint_written
+    with session_factory() as db:
+        assert db.query(ChainCheckpoint).one().links_only
+
+    append(session_factory, 5, "current")
+    tail = ChainVerifier(session_factory, workers=1).verify()
+    assert tail.ok and tail.resumed_from == 10 and tail.verified == 5 and tail.checkpoint_written
+
+    full = ChainVerifier(session_factory, workers=2, fetch_size=4, full=True).verify()
+    assert full.ok and full.verified == 15 and full.legacy_hash_mismatches == 10
+
+    # The seal covers only its prefix: a later decision that fails to rehash is a failure.
+    with session_factory() as db:
+        victim = db.query(DecisionObject).filter(DecisionObject.intent_target == "current_2").one()
+        victim.intent_target = "current_2_edited"
+        db.commit()
+    full = ChainVerifier(session_factory, workers=1, full=True).verify()
+    assert full.hash_mismatches == 1 and full.legacy_hash_mismatches == 10 and not full.ok
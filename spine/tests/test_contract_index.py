@@ -0,0 +1,45 @@
+from vte.core.contracts import ContractIndex
+
+inventory_contract = {
+    "feature_id": "inventory",
+    "transitions": [
+        {"trigger": "REGISTER_UNIT", "from": "*", "to": "VACANT", "target_type": "unit"},
+        {"trigger": "MOVE_OUT", "from": "OCCUPIED", "to": "VACANT", "target_type": "unit"}
+    ],
+    "side_effects": {
+        "REGISTER_UNIT": ["db_projection_unit"]
+    }
+}
+
+delinquency_contract = {
+    "feature_id": "delinquency",
+    "transitions": [
+        {"trigger": "payment_received", "from": "WARNING_SENT", "to": "GOOD_STANDING", "target_type": "unit"},
+        {"trigger": "payment_received", "from": "SUSPENDED", "to": "GOOD_STANDING", "target_type": "unit"},
+        {"trigger": "MOVE_OUT", "from": "*", "to": "TERMINATED", "target_type": "unit"}
+    ],
+    "side_effects": {}
+}
+
+def test_trigger_lookup():
+    index = ContractIndex({"inventory": inventory_contract, "delinquency": delinquency_contract})
+
+    assert len(index) == 3
+    assert index.find_contract("REGISTER_UNIT") is inventory_contract
+    assert index.find_contract("UNKNOWN") is None
+
+    binding = index.candidates("REGISTER_UNIT")[0]
+    assert binding.transition["to"] == "VACANT"
+    assert binding.side_effects == ("db_projection_unit",)
+
+def test_duplicate_triggers_keep_declaration_order():
+    index = ContractIndex({"inventory": inventory_contract, "delinquency": delinquency_contract})
+
+    # First declaring contract wins, like the old linear scan.
+    assert index.find_contract("MOVE_OUT") is inventory_contract
+    assert len(index.candidates("MOVE_OUT")) == 2
+    assert len(index.candidates("MOVE_OUT", inventory_contract)) == 1
+
+    # Several transitions may share a trigger inside one contract.
+    froms = [b.transition["from"] for b in index.candidates("payment_received", delinquency_contract)]
+    assert froms == ["WARNING_SENT", "SUSPENDED"]
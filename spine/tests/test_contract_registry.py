@@ -0,0 +1,62 @@
+import json
+import os
+from vte.core.contracts import ContractRegistry, validate_feature_contract
+
+def write_contract(path, feature_id, trigger, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "feature_id": feature_id,
+        "transitions": [{"trigger": trigger, "from": "*", "to": "ACTIVE", "target_type": "property"}],
+        "side_effects": {trigger: ["db_projection_property"]}
+    }))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+def make_registry(root):
+    return ContractRegistry(
+        root,
+        "*/*scope_contract*.json",
+        key=lambda path, data: data.get("feature_id"),
+        validate=validate_feature_contract,
+        compile_index=True,
+        check_interval=0
+    )
+
+def test_registry_loads_once_and_reloads_on_change(tmp_path):
+    contract_path = tmp_path / "feature_a" / "scope_contract.json"
+    write_contract(contract_path, "feature_a", "REGISTER_PROPERTY", mtime=1_000_000)
+    registry = make_registry(tmp_path)
+
+    first = registry.snapshot()
+    assert "REGISTER_PROPERTY" in first.index
+    # Unchanged files -> same snapshot object, nothing re-parsed.
+    assert registry.snapshot() is first
+
+    write_contract(contract_path, "feature_a", "ARCHIVE_PROPERTY", mtime=2_000_000)
+    second = registry.snapshot()
+    assert second is not first
+    assert "ARCHIVE_PROPERTY" in second.index
+
+    # In-flight holders of the old snapshot are unaffected by the swap.
+    assert "REGISTER_PROPERTY" in first.index
+
+def test_registry_keeps_last_good_snapshot_on_broken_file(tmp_path):
+    contract_path = tmp_path / "feature_a" / "scope_contract.json"
+    write_contract(contract_path, "feature_a", "REGISTER_PROPERTY", mtime=1_000_000)
+    registry = make_registry(tmp_path)
+    first = registry.snapshot()
+
+    contract_path.write_text("{ not json")
+    assert registry.snapshot() is first
+
+    write_contract(contract_path, "feature_a", "ARCHIVE_PROPERTY", mtime=3_000_000)
+    assert "ARCHIVE_PROPERTY" in registry.snapshot().index
+
+def test_registry_skips_invalid_contract_on_first_load(tmp_path):
+    write_contract(tmp_path / "feature_a" / "scope_contract.json", "feature_a", "REGISTER_PROPERTY")
+    bad = tmp_path / "feature_b" / "scope_contract.json"
+    bad.parent.mkdir()
+    bad.write_text(json.dumps({"feature_id": "feature_b", "transitions": [{"trigger": "X"}]}))
+
+    snapshot = make_registry(tmp_path).snapshot()
+    assert list(snapshot.contracts) == ["feature_a"]
@@ -0,0 +1,55 @@
+from fastapi.testclient import TestClient
+from vte.main import app
+from vte.api.deps import get_current_user_claims
+from unittest.mock import patch
+
+client = TestClient(app)
+
+def draft(outcome="PROPOSED", evidence_hash=None, policy_version="v1.0", target="unit_1"):
+    return {
+        "actor": {"user_id": "spoofed", "role": "system_bot", "session_id": "sess_batch"},
+        "intent": {"action": "batch_note", "target_resource": target, "parameters": {"n": 1}},
+        "evidence_hash": evidence_hash,
+        "outcome": outcome,
+        "policy_version": policy_version
+    }
+
+def test_batch_reports_per_item_results_and_chains_in_order():
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "batch_agent", "role": "system_bot", "permissions": ["*"]}
+    try:
+        drafts = [
+            draft(target="a"),
+            draft(outcome="APPROVED"),                 # no evidence: policy rejects
+            draft(outcome="APPROVED", evidence_hash="e" * 64, target="b"),
+            draft(policy_version="v0.1"),              # unsupported policy: rejected
+            draft(target="c"),
+        ]
+        with patch("vte.tasks.execute_decision_batch.delay") as enqueue:
+            resp = client.post("/api/v1/decisions:batch", json=drafts)
+
+        assert resp.status_code == 201, resp.text
+        body = resp.json()
+        print(f"Batch result: created={body['created']} rejected={body['rejected']} failed={body['failed']}")
+        assert [r["status"] for r in body["results"]] == ["created", "rejected", "created", "rejected", "created"]
+        assert (body["created"], body["rejected"], body["failed"]) == (3, 2, 0)
+
+        created = [r["decision"] for r in body["results"] if r["status"] == "created"]
+        assert [d["intent_target"] for d in created] == ["a", "b", "c"]
+        assert all(d["actor_user_id"] == "batch_agent" for d in created)
+        # Chained in submission order.
+        assert created[1]["previous_hash"] == created[0]["decision_hash"]
+        assert created[2]["previous_hash"] == created[1]["decision_hash"]
+
+        # Only the APPROVED decision is enqueued, in one call.
+        enqueue.assert_called_once_with(decision_ids=[created[1]["decision_id"]])
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+def test_batch_size_is_bounded():
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "batch_agent", "role": "system_bot", "permissions": ["*"]}
+    try:
+        with patch("vte.api.routes.MAX_DECISION_BATCH", 2):
+            resp = client.post("/api/v1/decisions:batch", json=[draft(), draft(), draft()])
+        assert resp.status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
@@ -0,0 +1,124 @@
+from vte.db import SessionLocal
+from vte.orm import ChainHead, DecisionObject
+from vte.api.schema import RoleEnum, OutcomeEnum
+from vte.core.chain import DECISION_CHAIN, GroupCommitWriter, append_decision, append_decisions, read_head
+from sqlalchemy import event
+from datetime import datetime
+import threading
+import time
+import hashlib
+import uuid
+
+def builder(label):
+    def build(previous_hash):
+        return DecisionObject(
+            decision_id=uuid.uuid4(),
+            timestamp=datetime.utcnow(),
+            actor_user_id="chain_tester",
+            actor_role=RoleEnum.admin,
+            intent_action="CHAIN_TEST",
+            intent_target=label,
+            intent_params={},
+            outcome=OutcomeEnum.PROPOSED,
+            policy_version="1.0",
+            decision_hash=hashlib.sha256(f"{previous_hash}:{label}:{uuid.uuid4()}".encode()).hexdigest(),
+            previous_hash=previous_hash
+        )
+    return build
+
+def test_append_links_to_head_and_moves_it():
+    db = SessionLocal()
+    try:
+        before = read_head(db)
+        start_hash, start_length = before.head_hash, before.length
+        db.commit()
+
+        first, second = append_decisions(db, [builder("a"), builder("b")])
+        assert first.previous_hash == start_hash
+        assert second.previous_hash == first.decision_hash
+
+        db.expire_all()
+        head = db.get(ChainHead, DECISION_CHAIN)
+        assert head.head_hash == second.decision_hash
+        assert head.head_decision_id == second.decision_id
+        assert head.length == start_length + 2
+    finally:
+        db.close()
+
+def test_concurrent_appends_never_fork():
+    appended = []
+    errors = []
+
+    def writer(n):
+        db = SessionLocal()
+        try:
+            for i in range(5):
+                appended.append(append_decision(db, builder(f"w{n}-{i}"), retries=50).decision_hash)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    db = SessionLocal()
+    try:
+        rows = db.query(DecisionObject.decision_hash, DecisionObject.previous_hash) \
+            .filter(DecisionObject.decision_hash.in_(appended)).all()
+        parents = [previous for _, previous in rows]
+        print(f"Appended {len(rows)} decisions concurrently")
+        # No two decisions share a parent, and the head is one of them.
+        assert len(rows) == 20
+        assert len(set(parents)) == len(parents)
+        assert db.get(ChainHead, DECISION_CHAIN).head_hash in appended
+    finally:
+        db.close()
+
+def test_group_commit_batches_concurrent_submissions():
+    commits = []
+
+    def session_factory(**kwargs):
+        db = SessionLocal(**kwargs)
+        event.listen(db, "after_commit", lambda session: commits.append(1))
+        return db
+
+    writer = GroupCommitWriter(session_factory=session_factory)
+    gate = threading.Barrier(10)
+    results, errors = {}, {}
+
+    def slow_builder(label):
+        build = builder(label)
+        def slow(previous_hash):
+            time.sleep(0.02) # Give the other callers time to queue behind the leader.
+            return build(previous_hash)
+        return slow
+
+    def caller(n):
+        gate.wait()
+        try:
+            build = slow_builder(f"g{n}") if n != 3 else (lambda previous_hash: 1 / 0)
+            results[n] = writer.submit(build)
+        except Exception as e:
+            errors[n] = e
+
+    threads = [threading.Thread(target=caller, args=(n,)) for n in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"{len(results)} decisions in {len(commits)} commits")
+    # Only the broken draft fails; every other caller gets its own decision.
+    assert list(errors) == [3] and isinstance(errors[3], ZeroDivisionError)
+    assert sorted(results) == [n for n in range(10) if n != 3]
+    assert all(d.intent_target == f"g{n}" for n, d in results.items())
+    assert len(commits) < len(results)
+
+    # The committed decisions form one unbroken chain.
+    parents = {d.previous_hash for d in results.values()}
+    assert len(parents) == len(results)
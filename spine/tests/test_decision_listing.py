@@ -0,0 +1,58 @@
+import uuid
+from fastapi.testclient import TestClient
+from vte.main import app
+from vte.api.deps import get_current_user_claims
+
+client = TestClient(app)
+
+def seed_decisions(actor, count):
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": actor, "role": "system_bot", "permissions": ["*"]}
+    try:
+        drafts = [
+            {
+                "actor": {"user_id": actor, "role": "system_bot", "session_id": "sess_listing"},
+                "intent": {"action": "listing_note", "target_resource": f"unit_{i % 2}", "parameters": {"n": i}},
+                "evidence_hash": None,
+                "outcome": "PROPOSED",
+                "policy_version": "v1.0"
+            }
+            for i in range(count)
+        ]
+        resp = client.post("/api/v1/decisions:batch", json=drafts)
+        assert resp.status_code == 201, resp.text
+        return [r["decision"]["decision_id"] for r in resp.json()["results"]]
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+def test_cursor_pages_are_stable_while_decisions_arrive():
+    actor = f"lister_{uuid.uuid4().hex[:8]}"
+    created = seed_decisions(actor, 5)
+
+    first = client.get("/api/v1/decisions", params={"actor": actor, "limit": 2})
+    assert first.status_code == 200
+    cursor = first.headers["X-Next-Cursor"]
+
+    # New decisions land on top of the listing, not in the pages after the cursor.
+    seed_decisions(actor, 3)
+
+    seen = [d["decision_id"] for d in first.json()]
+    while cursor:
+        resp = client.get("/api/v1/decisions", params={"actor": actor, "limit": 2, "cursor": cursor})
+        assert resp.status_code == 200
+        seen.extend(d["decision_id"] for d in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+
+    print(f"Listed {len(seen)} decisions across pages")
+    assert sorted(seen) == sorted(created)
+
+def test_listing_filters_by_target_and_rejects_bad_cursor():
+    actor = f"lister_{uuid.uuid4().hex[:8]}"
+    seed_decisions(actor, 4)
+
+    resp = client.get("/api/v1/decisions", params={"actor": actor, "target": "unit_1"})
+    assert resp.status_code == 200
+    assert [d["intent_target"] for d in resp.json()] == ["unit_1", "unit_1"]
+    assert "X-Next-Cursor" not in resp.headers
+
+    assert client.get("/api/v1/decisions", params={"cursor": "bm9wZQ"}).status_code == 400
+    assert client.get("/api/v1/decisions", params={"limit": 0}).status_code == 400
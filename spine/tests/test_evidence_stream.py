@@ -0,0 +1,88 @@
+from fastapi.testclient import TestClient
+from vte.main import app
+from vte.db import SessionLocal
+from vte.orm import EvidenceBundle, EvidenceItemRecord
+from vte.core.canonicalize import canonical_json_dumps
+from unittest.mock import patch
+import hashlib
+import json
+import uuid
+
+client = TestClient(app)
+
+def item(n):
+    return {"source": "mailbox", "type": "email", "data": {"subject": f"Rent {n}", "body": "ünïcode"}, "sha256": f"item_{n}"}
+
+def ndjson(records):
+    return "\n".join(json.dumps(r) for r in records).encode("utf-8")
+
+def test_stream_hashes_bundles_like_post_evidence():
+    body = ndjson(
+        [{"normalization_schema": "mailbox_v1"}] + [item(i) for i in range(100)] +
+        [{"normalization_schema": "ledger_v1", "items": [item("inline")]}]
+    )
+    resp = client.post("/api/v1/evidence:stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 201, resp.text
+    result = resp.json()
+    assert [b["item_count"] for b in result["bundles"]] == [100, 1]
+    assert result["items"] == 101
+
+    db = SessionLocal()
+    try:
+        stored = db.query(EvidenceBundle).filter(EvidenceBundle.bundle_hash == result["bundles"][0]["bundle_hash"]).one()
+        # Same digest POST /evidence computes over the whole payload.
+        expected = hashlib.sha256(canonical_json_dumps({
+            "normalization_schema": "mailbox_v1",
+            "items": stored.items,
+            "collected_at": stored.collected_at.replace(tzinfo=None).isoformat() + "Z"
+        })).hexdigest()
+        assert stored.bundle_hash == expected
+        assert stored.items_json is None
+        assert stored.items[0] == item(0)
+    finally:
+        db.close()
+
+def test_bad_line_reports_position_and_keeps_committed_bundles():
+    body = ndjson([
+        {"normalization_schema": "mailbox_v1"}, item(1),
+        {"normalization_schema": "mailbox_v1"}, item(2),
+        {"source": "mailbox", "type": "email", "data": {"amount": 1.5}, "sha256": "float"},
+    ])
+    with patch("vte.core.evidence_stream.EVIDENCE_STREAM_BATCH_BUNDLES", 1):
+        resp = client.post("/api/v1/evidence:stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert resp.status_code == 400
+    detail = resp.json()["detail"]
+    print(f"Stream error: {detail}")
+    assert detail["line"] == 5
+    assert "Floats" in detail["error"]
+    # The first bundle was complete (and flushed) before the bad line arrived.
+    assert len(detail["committed"]) == 1
+
+def test_header_items_must_be_a_list():
+    for items in (5, "item", {"source": "mailbox"}):
+        body = ndjson([{"normalization_schema": "mailbox_v1"}, item(1), {"normalization_schema": "ledger_v1", "items": items}])
+        resp = client.post("/api/v1/evidence:stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+        assert resp.status_code == 400, resp.text
+        detail = resp.json()["detail"]
+        assert detail["line"] == 3 and detail["error"] == "items must be a list"
+
+def test_repeated_items_are_stored_once():
+    repeated = {"source": "ledger", "type": "snapshot", "data": {"balance": "1200"}, "sha256": "ledger_snapshot"}
+    db = SessionLocal()
+    try:
+        before = db.query(EvidenceItemRecord).count()
+        bundle_ids = []
+        for _ in range(3):
+            resp = client.post("/api/v1/evidence", json={"normalization_schema": "ledger_v1", "items": [repeated, repeated]})
+            assert resp.status_code == 201, resp.text
+            assert resp.json()["items"] == [repeated, repeated]
+            bundle_ids.append(resp.json()["bundle_id"])
+
+        # Three bundles, one stored item.
+        assert db.query(EvidenceItemRecord).count() == before + 1
+        stored = db.query(EvidenceBundle).filter(EvidenceBundle.bundle_id == uuid.UUID(bundle_ids[-1])).one()
+        assert stored.items_json is None
+        assert stored.items == [repeated, repeated]
+    finally:
+        db.close()
@@ -0,0 +1,72 @@
+import uuid
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from vte.main import app
+from vte.api.deps import get_current_user_claims
+from vte.db import SessionLocal
+from vte.orm import ExecutionOutbox
+from vte.core import metrics
+from vte.core.outbox import OutboxDispatcher, outbox_dispatcher
+
+client = TestClient(app)
+
+def draft(outcome, target):
+    return {
+        "actor": {"user_id": "outbox_agent", "role": "system_bot", "session_id": "sess_outbox"},
+        "intent": {"action": "outbox_note", "target_resource": target, "parameters": {}},
+        "evidence_hash": "e" * 64 if outcome == "APPROVED" else None,
+        "outcome": outcome,
+        "policy_version": "v1.0"
+    }
+
+def outbox_row(decision_id):
+    with SessionLocal() as db:
+        return db.query(ExecutionOutbox).filter(ExecutionOutbox.decision_id == uuid.UUID(decision_id)).first()
+
+def gauge(name):
+    return next(g["value"] for g in metrics.snapshot()["gauges"] if g["name"] == name)
+
+def test_approved_decision_survives_a_failed_dispatch():
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "outbox_agent", "role": "system_bot", "permissions": ["*"]}
+    try:
+        with patch.object(outbox_dispatcher, "send", side_effect=RuntimeError("broker down")):
+            resp = client.post("/api/v1/decisions", json=draft("APPROVED", "unit_outbox"))
+        assert resp.status_code == 201, resp.text
+        approved_id = resp.json()["decision_id"]
+
+        proposed = client.post("/api/v1/decisions", json=draft("PROPOSED", "unit_outbox"))
+        assert outbox_row(proposed.json()["decision_id"]) is None
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+    # Committed with the decision, still pending after the failed send.
+    row = outbox_row(approved_id)
+    print(f"Outbox row after failed dispatch: attempts={row.attempts} error={row.last_error}")
+    assert row.dispatched_at is None
+    assert row.attempts == 1 and "broker down" in row.last_error
+    assert gauge("outbox_pending") >= 1
+
+    send = MagicMock()
+    OutboxDispatcher(send=send).dispatch_pending()
+    send.assert_called_once_with([approved_id])
+    assert outbox_row(approved_id).dispatched_at is not None
+    assert gauge("outbox_pending") == 0
+    assert gauge("outbox_lag_seconds") == 0
+
+def test_dispatcher_sends_in_batches_in_order():
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "outbox_agent", "role": "system_bot", "permissions": ["*"]}
+    try:
+        with patch.object(outbox_dispatcher, "send", side_effect=RuntimeError("broker down")):
+            resp = client.post("/api/v1/decisions:batch", json=[draft("APPROVED", f"unit_outbox_{i}") for i in range(3)])
+        assert resp.status_code == 201, resp.text
+        ids = [r["decision"]["decision_id"] for r in resp.json()["results"]]
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+    send = MagicMock()
+    OutboxDispatcher(send=send, batch_size=2).dispatch_pending()
+    assert [c.args[0] for c in send.call_args_list] == [ids[:2], ids[2:]]
+
+    # Nothing is sent twice.
+    OutboxDispatcher(send=send).dispatch_pending()
+    assert send.call_count == 2
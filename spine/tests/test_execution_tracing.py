@@ -0,0 +1,127 @@
+from vte.db import SessionLocal
+from vte.orm import DecisionObject, Property, Unit
+from vte.api.schema import RoleEnum, OutcomeEnum
+from vte.core.engine import WorkflowEngine
+from vte.core.tracing import tracer, JsonlFileExporter
+from unittest.mock import patch
+from datetime import datetime
+import json
+import uuid
+
+tenant_contract = {
+    "feature_id": "inventory",
+    "transitions": [
+        {"trigger": "UPDATE_UNIT_TENANT", "from": "VACANT", "to": "OCCUPIED", "target_type": "unit"}
+    ],
+    "side_effects": {
+        "UPDATE_UNIT_TENANT": ["appfolio_sync", "db_projection_unit_status", "db_update_tenant_info"]
+    }
+}
+
+def setup_vacant_unit(db):
+    setup_hash = f"setup_{uuid.uuid4()}"
+    db.add(DecisionObject(
+        decision_id=uuid.uuid4(),
+        timestamp=datetime.utcnow(),
+        actor_user_id="setup",
+        actor_role=RoleEnum.system_bot,
+        intent_action="SETUP",
+        intent_target="SETUP",
+        intent_params={},
+        outcome=OutcomeEnum.APPROVED,
+        policy_version="0",
+        decision_hash=setup_hash,
+        previous_hash="genesis"
+    ))
+    prop = Property(property_id=uuid.uuid4(), name="UoW Property", created_at_decision_hash=setup_hash, updated_at_decision_hash=setup_hash)
+    unit = Unit(unit_id=uuid.uuid4(), property_id=prop.property_id, name="UoW-1", status="VACANT", created_at_decision_hash=setup_hash, updated_at_decision_hash=setup_hash)
+    db.add_all([prop, unit])
+
+    decision_id = uuid.uuid4()
+    db.add(DecisionObject(
+        decision_id=decision_id,
+        timestamp=datetime.utcnow(),
+        actor_user_id="uow_tester",
+        actor_role=RoleEnum.admin,
+        intent_action="UPDATE_UNIT_TENANT",
+        intent_target=str(unit.unit_id),
+        intent_params={"tenant_name": "UoW Tenant"},
+        outcome=OutcomeEnum.APPROVED,
+        policy_version="1.0",
+        decision_hash=f"hash_{decision_id}",
+        previous_hash=setup_hash
+    ))
+    db.commit()
+    return unit.unit_id, decision_id
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+def test_execute_decision_records_a_span_per_stage():
+    db = SessionLocal()
+    exporter = ListExporter()
+    try:
+        unit_id, decision_id = setup_vacant_unit(db)
+
+        with patch("vte.core.engine.WorkflowEngine._load_contracts", return_value={"inventory": tenant_contract}), \
+             patch("vte.core.engine.WorkflowEngine._execute_appfolio_sync", return_value=True), \
+             patch.object(tracer, "exporter", exporter):
+            WorkflowEngine(db).execute_decision(decision_id)
+
+        spans = {s["name"]: s for s in exporter.spans}
+        print(f"Spans: {[s['name'] for s in exporter.spans]}")
+        for stage in ("decision.load", "integrity.check", "contract.lookup", "transition.validate",
+                      "permit.issue", "side_effect.db_projection_unit_status", "side_effect.appfolio_sync", "commit"):
+            assert stage in spans
+
+        root = spans["execute_decision"]
+        assert root["parent_id"] is None
+        assert root["attributes"]["outcome"] == "success"
+        assert root["attributes"]["trigger"] == "UPDATE_UNIT_TENANT"
+        for span in exporter.spans:
+            assert span["trace_id"] == root["trace_id"]
+            assert span["attributes"]["decision_id"] == str(decision_id)
+        # Stages after the decision is loaded also carry the trigger.
+        assert spans["permit.issue"]["attributes"]["trigger"] == "UPDATE_UNIT_TENANT"
+    finally:
+        db.close()
+
+def test_failed_stage_marks_span_and_outcome():
+    db = SessionLocal()
+    exporter = ListExporter()
+    try:
+        unit_id, decision_id = setup_vacant_unit(db)
+
+        with patch("vte.core.engine.WorkflowEngine._load_contracts", return_value={"inventory": tenant_contract}), \
+             patch("vte.core.engine.WorkflowEngine._execute_appfolio_sync", return_value=True), \
+             patch("vte.core.engine.WorkflowEngine._project_unit_tenant_info", side_effect=RuntimeError("boom")), \
+             patch.object(tracer, "exporter", exporter):
+            try:
+                WorkflowEngine(db).execute_decision(decision_id)
+            except RuntimeError:
+                pass
+
+        spans = {s["name"]: s for s in exporter.spans}
+        assert spans["side_effect.db_update_tenant_info"]["status"] == "error"
+        assert spans["execute_decision"]["status"] == "error"
+        assert spans["execute_decision"]["attributes"]["outcome"] == "failed"
+        # Rolled back before commit: the external effect never ran.
+        assert "side_effect.appfolio_sync" not in spans
+    finally:
+        db.close()
+
+def test_file_exporter_writes_one_json_line_per_span(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    with patch.object(tracer, "exporter", JsonlFileExporter(str(path))):
+        with tracer.span("outer", decision_id="d1"):
+            with tracer.span("inner"):
+                pass
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [s["name"] for s in lines] == ["inner", "outer"]
+    assert lines[0]["parent_id"] == lines[1]["span_id"]
+    assert lines[0]["attributes"]["decision_id"] == "d1"
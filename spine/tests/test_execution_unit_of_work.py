@@ -0,0 +1,144 @@
+from vte.db import SessionLocal
+from vte.orm import DecisionObject, PermitToken, Property, Unit
+from vte.api.schema import RoleEnum, OutcomeEnum
+from vte.core.engine import WorkflowEngine
+from sqlalchemy import event
+from unittest.mock import patch
+from datetime import datetime
+import pytest
+import threading
+import uuid
+
+tenant_contract = {
+    "feature_id": "inventory",
+    "transitions": [
+        {"trigger": "UPDATE_UNIT_TENANT", "from": "VACANT", "to": "OCCUPIED", "target_type": "unit"}
+    ],
+    "side_effects": {
+        "UPDATE_UNIT_TENANT": ["appfolio_sync", "db_projection_unit_status", "db_update_tenant_info"]
+    }
+}
+
+def setup_vacant_unit(db):
+    setup_hash = f"setup_{uuid.uuid4()}"
+    db.add(DecisionObject(
+        decision_id=uuid.uuid4(),
+        timestamp=datetime.utcnow(),
+        actor_user_id="setup",
+        actor_role=RoleEnum.system_bot,
+        intent_action="SETUP",
+        intent_target="SETUP",
+        intent_params={},
+        outcome=OutcomeEnum.APPROVED,
+        policy_version="0",
+        decision_hash=setup_hash,
+        previous_hash="genesis"
+    ))
+    prop = Property(property_id=uuid.uuid4(), name="UoW Property", created_at_decision_hash=setup_hash, updated_at_decision_hash=setup_hash)
+    unit = Unit(unit_id=uuid.uuid4(), property_id=prop.property_id, name="UoW-1", status="VACANT", created_at_decision_hash=setup_hash, updated_at_decision_hash=setup_hash)
+    db.add_all([prop, unit])
+
+    decision_id = uuid.uuid4()
+    db.add(DecisionObject(
+        decision_id=decision_id,
+        timestamp=datetime.utcnow(),
+        actor_user_id="uow_tester",
+        actor_role=RoleEnum.admin,
+        intent_action="UPDATE_UNIT_TENANT",
+        intent_target=str(unit.unit_id),
+        intent_params={"tenant_name": "UoW Tenant"},
+        outcome=OutcomeEnum.APPROVED,
+        policy_version="1.0",
+        decision_hash=f"hash_{decision_id}",
+        previous_hash=setup_hash
+    ))
+    db.commit()
+    return unit.unit_id, decision_id
+
+def test_execution_commits_once():
+    db = SessionLocal()
+    try:
+        unit_id, decision_id = setup_vacant_unit(db)
+        commits = []
+        event.listen(db, "after_commit", lambda session: commits.append(1))
+
+        with patch("vte.core.engine.WorkflowEngine._load_contracts", return_value={"inventory": tenant_contract}), \
+             patch("vte.core.engine.WorkflowEngine._execute_appfolio_sync") as appfolio_sync:
+            result = WorkflowEngine(db).execute_decision(decision_id)
+
+        assert len(commits) == 1
+        assert result["side_effects"] == ["db_projection_unit_status", "db_update_tenant_info", "appfolio_sync"]
+        appfolio_sync.assert_called_once()
+    finally:
+        db.close()
+
+def test_failed_projection_rolls_back_permit_and_skips_external_effects():
+    db = SessionLocal()
+    try:
+        unit_id, decision_id = setup_vacant_unit(db)
+
+        with patch("vte.core.engine.WorkflowEngine._load_contracts", return_value={"inventory": tenant_contract}), \
+             patch("vte.core.engine.WorkflowEngine._execute_appfolio_sync") as appfolio_sync, \
+             patch("vte.core.engine.WorkflowEngine._project_unit_tenant_info", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                WorkflowEngine(db).execute_decision(decision_id)
+
+        appfolio_sync.assert_not_called()
+        db.expire_all()
+        assert db.query(Unit).filter(Unit.unit_id == unit_id).first().status == "VACANT"
+        assert db.query(PermitToken).filter(PermitToken.decision_id == decision_id).count() == 0
+    finally:
+        db.close()
+
+def test_external_effects_never_touch_the_session_from_pool_threads():
+    note_contract = {
+        "feature_id": "notes",
+        "transitions": [{"trigger": "WRITE_NOTE", "from": "*", "to": "WRITTEN", "target_type": "note"}],
+        "side_effects": {"WRITE_NOTE": ["appfolio_sync"]}
+    }
+    db = SessionLocal()
+    try:
+        decisions = []
+        for i in range(4):
+            decision_id = uuid.uuid4()
+            decisions.append(DecisionObject(
+                decision_id=decision_id,
+                timestamp=datetime.utcnow(),
+                actor_user_id="uow_tester",
+                actor_role=RoleEnum.admin,
+                intent_action="WRITE_NOTE",
+                intent_target=f"tenant_page_{i}",
+                intent_params={"content": f"note {i}"},
+                outcome=OutcomeEnum.APPROVED,
+                policy_version="1.0",
+                decision_hash=f"hash_{decision_id}",
+                previous_hash="chain"
+            ))
+        db.add_all(decisions)
+        db.commit()
+        ids = [d.decision_id for d in decisions]
+
+        statements = []
+        engine = db.get_bind()
+        record = lambda conn, cursor, statement, *args: statements.append((threading.current_thread().name, statement))
+        written = []
+
+        def appfolio_sync(decision):
+            # The real handler reads these on the pool thread.
+            written.append((decision.intent_action, decision.intent_target, decision.intent_params["content"], str(decision.decision_id)))
+            return True
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            with patch("vte.core.engine.WorkflowEngine._load_contracts", return_value={"notes": note_contract}), \
+                 patch("vte.core.engine.WorkflowEngine._execute_appfolio_sync", side_effect=appfolio_sync):
+                results = WorkflowEngine(db).execute_decisions(ids)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert [r["side_effects"] for r in results] == [["appfolio_sync"]] * 4
+        assert sorted(target for _, target, _, _ in written) == [f"tenant_page_{i}" for i in range(4)]
+        pool_statements = [statement for thread, statement in statements if thread.startswith("vte-effect")]
+        assert pool_statements == []
+    finally:
+        db.close()
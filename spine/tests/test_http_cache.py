@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+from vte.main import app
+from vte.api.deps import get_current_user_claims
+from vte.api.http_cache import ImmutableResponseCache, decision_responses
+from vte.core import metrics
+
+client = TestClient(app)
+
+def test_evidence_reads_are_cacheable_and_revalidate_with_304():
+    resp = client.post("/api/v1/evidence", json={
+        "normalization_schema": "cache_test_v1",
+        "items": [{"source": "mailbox", "type": "email", "data": {"subject": "Rent"}, "sha256": "msg_cache"}]
+    })
+    assert resp.status_code == 201, resp.text
+    bundle = resp.json()
+
+    first = client.get(f"/api/v1/evidence/{bundle['bundle_id']}")
+    assert first.status_code == 200
+    assert first.headers["ETag"] == f'"{bundle["bundle_hash"]}"'
+    assert "immutable" in first.headers["Cache-Control"]
+    assert first.json()["items"][0]["sha256"] == "msg_cache"
+
+    again = client.get(f"/api/v1/evidence/{bundle['bundle_id']}", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    assert client.get("/api/v1/evidence/00000000-0000-0000-0000-000000000000").status_code == 404
+
+def test_decision_reads_are_served_from_the_response_cache():
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "cache_agent", "role": "system_bot", "permissions": ["*"]}
+    try:
+        resp = client.post("/api/v1/decisions", json={
+            "actor": {"user_id": "cache_agent", "role": "system_bot", "session_id": "sess_cache"},
+            "intent": {"action": "cache_note", "target_resource": "unit_cache", "parameters": {}},
+            "evidence_hash": None,
+            "outcome": "PROPOSED",
+            "policy_version": "v1.0"
+        })
+        assert resp.status_code == 201, resp.text
+        decision = resp.json()
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+    metrics.reset()
+    first = client.get(f"/api/v1/decisions/{decision['decision_id']}")
+    second = client.get(f"/api/v1/decisions/{decision['decision_id']}", headers={"If-None-Match": 'W/"stale", ' + first.headers["ETag"]})
+    assert first.status_code == 200
+    assert first.json()["decision_hash"] == decision["decision_hash"]
+    assert second.status_code == 304
+
+    lookups = {c["labels"]["result"]: c["value"] for c in metrics.snapshot()["counters"] if c["name"] == "response_cache_lookups_total"}
+    print(f"Decision response cache: {lookups}")
+    assert lookups == {"miss": 1, "hit": 1}
+    assert len(decision_responses) >= 1
+
+def test_response_cache_is_bounded_by_entries_and_bytes():
+    cache = ImmutableResponseCache("test", max_entries=2, max_bytes=10)
+    cache.put("a", '"a"', b"1234")
+    cache.put("b", '"b"', b"1234")
+    cache.get("a")
+    cache.put("c", '"c"', b"1234")  # over both bounds: least recently used ("b") goes
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"1234"
+    cache.put("d", '"d"', b"12345678901")  # larger than the cache: not stored
+    assert cache.get("d") is None
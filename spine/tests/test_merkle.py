@@ -0,0 +1,155 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from vte.main import app
+from vte.db import Base
+from vte.orm import DecisionObject, MerkleNode
+from vte.api.deps import get_current_user_claims
+from vte.api.schema import RoleEnum, OutcomeEnum
+from vte.core.chain import append_decisions
+from vte.core.merkle import bag_peaks, inclusion_proof, leaf_hash, node_hash, read_root, verify_inclusion
+from vte.core.verifier import ProofVerifier
+
+client = TestClient(app)
+
+def ledger(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'merkle.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def decision(label, previous_hash, timestamp=None):
+    return DecisionObject(
+        decision_id=uuid.uuid4(),
+        timestamp=timestamp or datetime.now(timezone.utc),
+        actor_user_id="merkle_tester",
+        actor_role=RoleEnum.admin,
+        intent_action="MERKLE_TEST",
+        intent_target=label,
+        intent_params={},
+        outcome=OutcomeEnum.PROPOSED,
+        policy_version="1.0",
+        decision_hash=uuid.uuid4().hex + uuid.uuid4().hex,
+        previous_hash=previous_hash
+    )
+
+def append(session_factory, labels):
+    with session_factory() as db:
+        append_decisions(db, [(lambda previous_hash, label=label: decision(label, previous_hash)) for label in labels])
+
+def reference_root(hashes):
+    # Perfect subtrees for the set bits of n, largest first, then bagged.
+    def subtree(leaves):
+        if len(leaves) == 1:
+            return leaves[0]
+        half = len(leaves) // 2
+        return node_hash(subtree(leaves[:half]), subtree(leaves[half:]))
+    peaks, start = [], 0
+    for height in range(len(hashes).bit_length() - 1, -1, -1):
+        if len(hashes) >> height & 1:
+            peaks.append(subtree([leaf_hash(h) for h in hashes[start:start + 2 ** height]]))
+            start += 2 ** height
+    return bag_peaks(peaks)
+
+def test_proofs_verify_for_every_leaf(tmp_path):
+    session_factory = ledger(tmp_path)
+    verifier = ProofVerifier()
+    for batch in (["a"], [f"b{i}" for i in range(6)], [f"c{i}" for i in range(13)]):
+        append(session_factory, batch)
+
+    with session_factory() as db:
+        chain = db.query(DecisionObject).order_by(DecisionObject.chain_seq).all()
+        root = read_root(db)
+        assert root["leaf_count"] == 20
+        assert root["root"] == reference_root([d.decision_hash for d in chain])
+        assert db.query(MerkleNode).count() == 2 * 20 - 2 # 20 = 0b10100
+
+        for index, d in enumerate(chain):
+            proof = inclusion_proof(db, d.decision_id)
+            assert proof["leaf_index"] == index and proof["root"] == root["root"]
+            assert len(proof["path"]) <= 4
+            assert verifier.verify_inclusion_proof(proof, root["root"])
+
+        proof = inclusion_proof(db, chain[7].decision_id)
+        for forged in (
+            {**proof, "decision_hash": chain[8].decision_hash},
+            {**proof, "leaf_index": 8},
+            {**proof, "path": [{**proof["path"][0], "side": "left" if proof["path"][0]["side"] == "right" else "right"}] + proof["path"][1:]},
+        ):
+            with pytest.raises(ValueError):
+                verifier.verify_inclusion_proof(forged, root["root"])
+
+def test_malformed_or_truncated_proofs_are_rejected(tmp_path):
+    session_factory = ledger(tmp_path)
+    append(session_factory, [f"t{i}" for i in range(11)])
+    with session_factory() as db:
+        chain = db.query(DecisionObject).order_by(DecisionObject.chain_seq).all()
+        root = read_root(db)["root"]
+        proof = inclusion_proof(db, chain[4].decision_id)
+    assert verify_inclusion(proof, root)
+
+    truncated = [{key: value for key, value in proof.items() if key != missing} for missing in ("peaks", "path", "peak_index", "leaf_count")]
+    broken = [
+        {**proof, "path": proof["path"][:-1]},
+        {**proof, "path": [{"hash": step["hash"]} for step in proof["path"]]},
+        {**proof, "path": ["not a step"] + proof["path"][1:]},
+        {**proof, "path": [{**proof["path"][0], "hash": "zz"}] + proof["path"][1:]},
+        {**proof, "peaks": proof["peaks"][:1]},
+        {**proof, "leaf_index": -1},
+        {**proof, "leaf_index": "4"},
+        {**proof, "decision_hash": None},
+        None,
+        [],
+    ]
+    for forged in truncated + broken:
+        assert verify_inclusion(forged, root) is False, forged
+        with pytest.raises(ValueError):
+            ProofVerifier().verify_inclusion_proof(forged, root)
+
+def test_existing_chain_is_bootstrapped_on_first_append(tmp_path):
+    session_factory = ledger(tmp_path)
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    with session_factory() as db:
+        previous = "GENESIS"
+        for i in range(9):
+            d = decision(f"legacy{i}", previous, timestamp=start + timedelta(seconds=i))
+            d.chain_seq = i + 1 # Backfilled by migration 9a2c4e7f1b65
+            db.add(d)
+            previous = d.decision_hash
+        db.commit()
+
+    append(session_factory, ["new"])
+    with session_factory() as db:
+        chain = db.query(DecisionObject).order_by(DecisionObject.chain_seq).all()
+        root = read_root(db)
+        assert root["leaf_count"] == 10
+        assert root["root"] == reference_root([d.decision_hash for d in chain])
+        assert ProofVerifier().verify_inclusion_proof(inclusion_proof(db, chain[3].decision_id), root["root"])
+
+def test_root_and_proof_endpoints():
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "merkle_agent", "role": "system_bot", "permissions": ["*"]}
+    try:
+        resp = client.post("/api/v1/decisions", json={
+            "actor": {"user_id": "merkle_agent", "role": "system_bot", "session_id": "sess_merkle"},
+            "intent": {"action": "merkle_note", "target_resource": "unit_merkle", "parameters": {}},
+            "evidence_hash": None,
+            "outcome": "PROPOSED",
+            "policy_version": "v1.0"
+        })
+        assert resp.status_code == 201, resp.text
+        created = resp.json()
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+    root = client.get("/api/v1/decisions:root").json()
+    proof = client.get(f"/api/v1/decisions/{created['decision_id']}/proof")
+    assert proof.status_code == 200, proof.text
+    proof = proof.json()
+    print(root["leaf_count"], len(proof["path"]), len(proof["peaks"]))
+    assert proof["decision_hash"] == created["decision_hash"]
+    assert proof["root"] == root["root"]
+    assert ProofVerifier().verify_inclusion_proof(proof, root["root"])
+
+    assert client.get(f"/api/v1/decisions/{uuid.uuid4()}/proof").status_code == 404
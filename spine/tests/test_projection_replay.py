@@ -0,0 +1,134 @@
+from vte.db import SessionLocal
+from vte.orm import DecisionObject, ExecutionOutbox, PermitToken, ProjectionCheckpoint, Property, Unit
+from vte.core.chain import append_decisions
+from vte.api.schema import RoleEnum, OutcomeEnum
+from vte.core import replay
+from vte.core.replay import ProjectionReplayer
+from unittest.mock import patch
+from datetime import datetime, timedelta
+import uuid
+
+replay_contracts = {
+    "replay_inventory": {
+        "feature_id": "replay_inventory",
+        "transitions": [
+            {"trigger": "REPLAY_REGISTER_PROPERTY", "from": "VOID", "to": "ACTIVE", "target_type": "property"},
+            {"trigger": "REPLAY_REGISTER_UNIT", "from": "VOID", "to": "VACANT", "target_type": "unit"},
+            {"trigger": "REPLAY_MOVE_IN", "from": "VACANT", "to": "OCCUPIED", "target_type": "unit"}
+        ],
+        "side_effects": {
+            "REPLAY_REGISTER_PROPERTY": ["db_projection_property"],
+            "REPLAY_REGISTER_UNIT": ["db_projection_unit"],
+            "REPLAY_MOVE_IN": ["appfolio_sync", "db_projection_unit_status", "db_update_tenant_info"]
+        }
+    }
+}
+
+def add_executed_decisions(db, intents, executed=True):
+    """
+    Appends decisions (with permits, as live execution leaves them) in chain order.
+    """
+    base = datetime.utcnow() + timedelta(days=1)
+
+    def builder(action, target, params):
+        def build(previous_hash):
+            return DecisionObject(
+                decision_id=uuid.uuid4(),
+                timestamp=base, # Same clock tick: chain order comes from chain_seq
+                actor_user_id="replay_tester",
+                actor_role=RoleEnum.admin,
+                intent_action=action,
+                intent_target=target,
+                intent_params=params,
+                outcome=OutcomeEnum.APPROVED,
+                policy_version="1.0",
+                decision_hash=f"replay_{uuid.uuid4()}",
+                previous_hash=previous_hash
+            )
+        return build
+
+    decisions = append_decisions(db, [builder(*intent) for intent in intents])
+    # Already executed (or deliberately left unexecuted): nothing for the outbox dispatcher.
+    db.query(ExecutionOutbox).filter(ExecutionOutbox.decision_id.in_([d.decision_id for d in decisions])) \
+        .update({ExecutionOutbox.dispatched_at: base}, synchronize_session=False)
+    if executed:
+        for decision in decisions:
+            db.add(PermitToken(token_id=uuid.uuid4(), decision_id=decision.decision_id, expires_at=base, scope_json={}, signature="sig"))
+    db.commit()
+    return decisions
+
+def test_replay_rebuilds_projections_in_chain_order_and_resumes():
+    db = SessionLocal()
+    try:
+        prop_id, unit_id, unexecuted_id = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+        decisions = add_executed_decisions(db, [
+            ("REPLAY_REGISTER_PROPERTY", prop_id, {"name": "Replay Property"}),
+            ("REPLAY_REGISTER_UNIT", unit_id, {"property_id": prop_id, "name": "R-1"}),
+            ("REPLAY_MOVE_IN", unit_id, {"tenant_name": "Replay Tenant"}),
+        ])
+        # Approved but never executed (no permit): must not be projected.
+        add_executed_decisions(db, [("REPLAY_REGISTER_UNIT", unexecuted_id, {"property_id": prop_id, "name": "R-2"})], executed=False)
+        permits_before = db.query(PermitToken).count()
+
+        name = f"test_{uuid.uuid4()}"
+        with patch("vte.core.engine.WorkflowEngine._execute_appfolio_sync") as appfolio_sync:
+            replayer = ProjectionReplayer(db, name=name, batch_size=2, contracts=replay_contracts)
+            first = replayer.rebuild(max_batches=1)
+            assert first["batches"] == 1
+            rest = ProjectionReplayer(db, name=name, batch_size=2, contracts=replay_contracts).rebuild()
+
+        print(f"Replay stats: {first} then {rest}")
+        appfolio_sync.assert_not_called()
+        assert db.query(PermitToken).count() == permits_before
+
+        unit = db.query(Unit).filter(Unit.unit_id == uuid.UUID(unit_id)).one()
+        assert unit.status == "OCCUPIED"
+        assert unit.tenant_info == {"tenant_name": "Replay Tenant"}
+        assert unit.created_at_decision_hash == decisions[1].decision_hash
+        assert unit.updated_at_decision_hash == decisions[2].decision_hash
+        assert db.query(Property).filter(Property.property_id == uuid.UUID(prop_id)).one().name == "Replay Property"
+        assert db.query(Unit).filter(Unit.unit_id == uuid.UUID(unexecuted_id)).count() == 0
+
+        checkpoint = db.get(ProjectionCheckpoint, name)
+        assert checkpoint.last_decision_hash == decisions[-1].decision_hash
+
+        # Nothing new after the checkpoint: a second run is a no-op.
+        again = ProjectionReplayer(db, name=name, batch_size=2, contracts=replay_contracts).rebuild()
+        assert again["batches"] == 0
+    finally:
+        db.close()
+
+def test_failed_decision_leaves_no_partial_projection_in_its_batch():
+    db = SessionLocal()
+    try:
+        # Catch up with whatever other tests left in the shared chain first.
+        name = f"test_{uuid.uuid4()}"
+        ProjectionReplayer(db, name=name, contracts=replay_contracts).rebuild()
+        applied_before = db.get(ProjectionCheckpoint, name).decisions_applied
+
+        prop_id, unit_id = str(uuid.uuid4()), str(uuid.uuid4())
+        add_executed_decisions(db, [
+            ("REPLAY_REGISTER_PROPERTY", prop_id, {"name": "Savepoint Property"}),
+            ("REPLAY_REGISTER_UNIT", unit_id, {"property_id": prop_id, "name": "S-1"}),
+            # Its status projection runs before the tenant projection fails.
+            ("REPLAY_MOVE_IN", unit_id, {"tenant_name": "Broken Tenant"}),
+            ("REPLAY_MOVE_IN", unit_id, {"tenant_name": "Savepoint Tenant"}),
+        ])
+        project_tenant = replay._REPLAYED_EFFECTS["db_update_tenant_info"]
+
+        def tenant_info(batch, decision, binding, params):
+            if params["tenant_name"] == "Broken Tenant":
+                raise RuntimeError("tenant projection failed")
+            project_tenant(batch, decision, binding, params)
+
+        with patch.dict(replay._REPLAYED_EFFECTS, {"db_update_tenant_info": tenant_info}):
+            stats = ProjectionReplayer(db, name=name, contracts=replay_contracts).rebuild()
+
+        assert stats["applied"] == 3 and stats["failed"] == 1
+        unit = db.query(Unit).filter(Unit.unit_id == uuid.UUID(unit_id)).one()
+        assert unit.status == "OCCUPIED"
+        assert unit.tenant_info == {"tenant_name": "Savepoint Tenant"}
+        checkpoint = db.get(ProjectionCheckpoint, name)
+        assert checkpoint.decisions_applied - applied_before == 3
+    finally:
+        db.close()
@@ -0,0 +1,117 @@
+import uuid
+from fastapi.testclient import TestClient
+from vte.main import app
+from vte.api.deps import get_current_user_claims
+
+client = TestClient(app)
+
+def seed_queue(tag):
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "queue_agent", "role": "system_bot", "permissions": ["*"]}
+    try:
+        drafts = [
+            {
+                "actor": {"user_id": "queue_agent", "role": "system_bot", "session_id": "sess_queue"},
+                "intent": {"action": f"{tag}_{kind}", "target_resource": f"unit_{i}", "parameters": {}},
+                "evidence_hash": None,
+                "outcome": "PROPOSED",
+                "policy_version": "v1.0"
+            }
+            for i, kind in enumerate(["High", "Low", "Normal", "High", "Normal", "Low", "Normal"])
+        ]
+        resp = client.post("/api/v1/decisions:batch", json=drafts)
+        assert resp.status_code == 201, resp.text
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+def test_queue_filters_priority_in_sql():
+    tag = f"queue_{uuid.uuid4().hex[:8]}"
+    seed_queue(tag)
+
+    resp = client.get("/api/v1/queue", params={"search": tag, "priority": "1"})
+    assert resp.status_code == 200
+    items = resp.json()
+    assert len(items) == 2
+    assert all(item["priority"] == 1 and "High" in item["title"] for item in items)
+    assert resp.headers["X-Total-Count"] == "2"
+
+    assert client.get("/api/v1/queue", params={"priority": "urgent"}).status_code == 400
+
+def test_queue_cursor_pages_cover_everything_once():
+    tag = f"queue_{uuid.uuid4().hex[:8]}"
+    seed_queue(tag)
+
+    seen = []
+    params = {"search": tag, "sort_by": "priority", "limit": 3}
+    while True:
+        resp = client.get("/api/v1/queue", params=params)
+        assert resp.status_code == 200
+        seen.extend(resp.json())
+        assert resp.headers["X-Total-Count"] == "7"
+        next_cursor = resp.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params["cursor"] = next_cursor
+
+    print(f"Paged queue: {[item['priority'] for item in seen]}")
+    assert len(seen) == 7
+    assert len({item["id"] for item in seen}) == 7
+    assert [item["priority"] for item in seen] == sorted(item["priority"] for item in seen)
+
+    assert client.get("/api/v1/queue", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_queue_cursor_is_bound_to_its_sort_order():
+    tag = f"queue_{uuid.uuid4().hex[:8]}"
+    seed_queue(tag)
+
+    params = {"search": tag, "sort_by": "priority", "order": "asc", "limit": 3}
+    resp = client.get("/api/v1/queue", params=params)
+    assert resp.status_code == 200
+    cursor = resp.headers["X-Next-Cursor"]
+
+    assert client.get("/api/v1/queue", params={**params, "cursor": cursor}).status_code == 200
+    for changed in ({"sort_by": "title"}, {"order": "desc"}, {"sort_by": "relevance"}):
+        resp = client.get("/api/v1/queue", params={**params, **changed, "cursor": cursor})
+        assert resp.status_code == 400, changed
+
+def test_queue_search_uses_index_over_params_and_ranks():
+    tag = uuid.uuid4().hex[:8]
+    app.dependency_overrides[get_current_user_claims] = lambda: {"user_id": "queue_agent", "role": "system_bot", "permissions": ["*"]}
+    try:
+        drafts = [
+            {
+                "actor": {"user_id": "queue_agent", "role": "system_bot", "session_id": "sess_queue"},
+                "intent": {"action": "review_lease", "target_resource": f"unit_{tag}_{i}", "parameters": params},
+                "evidence_hash": None,
+                "outcome": "PROPOSED",
+                "policy_version": "v1.0"
+            }
+            for i, params in enumerate([
+                {"tenant_name": f"Ada Lovelace{tag}"},
+                {"tenant_name": f"Ada Lovelace{tag}", "email": f"ada{tag}@example.com", "note": "not indexed"},
+                {"tenant_name": f"Grace Hopper{tag}"},
+            ])
+        ]
+        assert client.post("/api/v1/decisions:batch", json=drafts).status_code == 201
+    finally:
+        app.dependency_overrides.pop(get_current_user_claims, None)
+
+    # Tenant name from the parameters, matched by word prefix, across pages.
+    seen = []
+    params = {"search": f"lovelace{tag[:4]}", "limit": 1}
+    while True:
+        resp = client.get("/api/v1/queue", params=params)
+        assert resp.status_code == 200
+        seen.extend(item["title"] for item in resp.json())
+        if not resp.headers.get("X-Next-Cursor"):
+            break
+        params["cursor"] = resp.headers["X-Next-Cursor"]
+    print(f"Search hits: {seen}")
+    assert sorted(seen) == [f"review_lease unit_{tag}_0", f"review_lease unit_{tag}_1"]
+
+    # Every term must match; the decision matching on more fields ranks first.
+    resp = client.get("/api/v1/queue", params={"search": f"ada ada{tag}"})
+    assert [item["title"] for item in resp.json()] == [f"review_lease unit_{tag}_1"]
+    resp = client.get("/api/v1/queue", params={"search": f"ada lovelace{tag}"})
+    assert [item["title"] for item in resp.json()][0] == f"review_lease unit_{tag}_1"
+
+    assert client.get("/api/v1/queue", params={"search": "not indexed"}).json() == []
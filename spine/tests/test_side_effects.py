@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+import pytest
+from vte.core import metrics, side_effects
+from vte.core.side_effects import SideEffectRegistry, run_external_effects
+
+def test_independent_effects_run_concurrently_and_are_timed():
+    registry = SideEffectRegistry()
+    calls = []
+
+    @registry.register("slow_sync_a", independent=True)
+    def slow_sync_a(engine, decision, binding):
+        time.sleep(0.3)
+        calls.append("a")
+
+    @registry.register("slow_async_b", independent=True, is_async=True)
+    async def slow_async_b(engine, decision, binding):
+        await asyncio.sleep(0.3)
+        calls.append("b")
+
+    metrics.reset()
+    start = time.perf_counter()
+    ok = run_external_effects([
+        (registry.get("slow_sync_a"), (None, None, None)),
+        (registry.get("slow_async_b"), (None, None, None)),
+    ])
+    elapsed = time.perf_counter() - start
+
+    assert ok == [True, True]
+    assert sorted(calls) == ["a", "b"]
+    assert elapsed < 0.55, f"Effects did not overlap ({elapsed:.2f}s)"
+
+    timed = {t["labels"]["effect"]: t for t in metrics.snapshot()["timings"] if t["name"] == "side_effect_latency_seconds"}
+    assert timed["slow_sync_a"]["count"] == 1
+    assert timed["slow_async_b"]["count"] == 1
+
+def test_timeouts_and_failures_are_reported_not_raised():
+    registry = SideEffectRegistry()
+
+    @registry.register("hangs", timeout=0.1)
+    def hangs(engine, decision, binding):
+        time.sleep(0.5)
+
+    @registry.register("breaks", io_bound=False)
+    def breaks(engine, decision, binding):
+        raise RuntimeError("boom")
+
+    metrics.reset()
+    ok = run_external_effects([
+        (registry.get("hangs"), (None, None, None)),
+        (registry.get("breaks"), (None, None, None)),
+    ])
+
+    assert ok == [False, False]
+    counters = metrics.snapshot()["counters"]
+    assert any(c["name"] == "side_effect_timeouts_total" and c["labels"]["effect"] == "hangs" for c in counters)
+
+def test_hung_handlers_do_not_starve_later_effects(monkeypatch):
+    registry = SideEffectRegistry()
+    release = threading.Event()
+
+    @registry.register("hangs_forever", independent=True, timeout=0.05)
+    def hangs_forever(engine, decision, binding):
+        release.wait(5)
+
+    @registry.register("quick", timeout=1)
+    def quick(engine, decision, binding):
+        return True
+
+    metrics.reset()
+    workers = side_effects.EXTERNAL_EFFECT_WORKERS
+    try:
+        # Every thread of the pool is now stuck in a timed-out call.
+        assert run_external_effects([(registry.get("hangs_forever"), (None, None, None))] * workers) == [False] * workers
+
+        start = time.perf_counter()
+        assert run_external_effects([(registry.get("quick"), (None, None, None))]) == [True]
+        assert time.perf_counter() - start < 0.5
+
+        monkeypatch.setattr(side_effects, "MAX_HUNG_EFFECTS", workers)
+        assert run_external_effects([(registry.get("quick"), (None, None, None))]) == [False]
+        counters = metrics.snapshot()["counters"]
+        assert any(c["name"] == "side_effect_rejections_total" and c["labels"]["effect"] == "quick" for c in counters)
+    finally:
+        release.set()
+
+    deadline = time.monotonic() + 2
+    while side_effects._hung and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert run_external_effects([(registry.get("quick"), (None, None, None))]) == [True]
+
+def test_duplicate_registration_rejected():
+    registry = SideEffectRegistry()
+    registry.register("once")(lambda engine, decision, binding: None)
+    with pytest.raises(ValueError):
+        registry.register("once")(lambda engine, decision, binding: None)
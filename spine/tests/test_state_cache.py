@@ -0,0 +1,121 @@
+from vte.db import SessionLocal
+from vte.orm import DecisionObject, Property, Unit
+from vte.api.schema import RoleEnum, OutcomeEnum
+from vte.core.engine import WorkflowEngine
+from vte.core.state_cache import TargetStateCache, target_states
+from unittest.mock import patch
+from datetime import datetime
+import pytest
+import uuid
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TargetStateCache(max_entries=10, ttl=5, clock=clock)
+    cache.put("unit", "u1", "VACANT")
+
+    clock.now += 4.9
+    assert cache.get("unit", "u1") == "VACANT"
+    clock.now += 0.2
+    assert cache.get("unit", "u1") is None
+
+def test_lru_bound_and_invalidation():
+    cache = TargetStateCache(max_entries=2, ttl=60)
+    cache.put("unit", "u1", "VACANT")
+    cache.put("unit", "u2", "VACANT")
+    cache.get("unit", "u1")              # u1 is now most recently used
+    cache.put("unit", "u3", "OCCUPIED")  # evicts u2
+
+    assert len(cache) == 2
+    assert cache.get("unit", "u2") is None
+    assert cache.get("unit", "u1") == "VACANT"
+
+    cache.invalidate("unit", "u1")
+    assert cache.get("unit", "u1") is None
+
+tenant_contract = {
+    "feature_id": "inventory",
+    "transitions": [
+        {"trigger": "UPDATE_UNIT_TENANT", "from": "VACANT", "to": "OCCUPIED", "target_type": "unit"}
+    ],
+    "side_effects": {"UPDATE_UNIT_TENANT": ["db_projection_unit_status"]}
+}
+
+def setup_unit(db, status):
+    setup_hash = f"setup_{uuid.uuid4()}"
+    prop = Property(property_id=uuid.uuid4(), name="Cache Property", created_at_decision_hash=setup_hash, updated_at_decision_hash=setup_hash)
+    unit = Unit(unit_id=uuid.uuid4(), property_id=prop.property_id, name="C-1", status=status, created_at_decision_hash=setup_hash, updated_at_decision_hash=setup_hash)
+    db.add_all([prop, unit])
+    db.commit()
+    return str(unit.unit_id)
+
+def add_decision(db, unit_id):
+    decision_id = uuid.uuid4()
+    db.add(DecisionObject(
+        decision_id=decision_id,
+        timestamp=datetime.utcnow(),
+        actor_user_id="cache_tester",
+        actor_role=RoleEnum.admin,
+        intent_action="UPDATE_UNIT_TENANT",
+        intent_target=unit_id,
+        intent_params={},
+        outcome=OutcomeEnum.APPROVED,
+        policy_version="1.0",
+        decision_hash=f"hash_{decision_id}",
+        previous_hash="chain"
+    ))
+    db.commit()
+    return decision_id
+
+def test_engine_reads_through_and_publishes_on_commit():
+    db = SessionLocal()
+    try:
+        target_states.clear()
+        unit_id = setup_unit(db, "VACANT")
+        decision_id = add_decision(db, unit_id)
+
+        with patch("vte.core.engine.WorkflowEngine._load_contracts", return_value={"inventory": tenant_contract}):
+            engine = WorkflowEngine(db)
+            assert engine._get_current_state(unit_id, "unit") == "VACANT"
+            assert target_states.get("unit", unit_id) == "VACANT"
+
+            engine.execute_decision(decision_id)
+
+        # Our own committed write replaced the cached state.
+        assert target_states.get("unit", unit_id) == "OCCUPIED"
+
+        # Cached state is served without touching the DB.
+        with patch.object(db, "query", side_effect=AssertionError("DB hit")):
+            assert engine._get_current_state(unit_id, "unit") == "OCCUPIED"
+
+        # Absent targets are never cached.
+        missing = str(uuid.uuid4())
+        assert engine._get_current_state(missing, "property") == "VOID"
+        assert target_states.get("property", missing) is None
+    finally:
+        db.close()
+
+def test_rollback_invalidates_cached_state():
+    db = SessionLocal()
+    try:
+        target_states.clear()
+        unit_id = setup_unit(db, "VACANT")
+        decision_id = add_decision(db, unit_id)
+
+        with patch("vte.core.engine.WorkflowEngine._load_contracts", return_value={"inventory": tenant_contract}), \
+             patch("vte.core.permits.PermitIssuer.issue_permit", side_effect=RuntimeError("permit store down")):
+            engine = WorkflowEngine(db)
+            engine._remember_state("unit", uuid.UUID(unit_id), "OCCUPIED")
+            with pytest.raises(RuntimeError):
+                engine.execute_decision(decision_id)
+
+        assert target_states.get("unit", unit_id) is None
+        assert engine._get_current_state(unit_id, "unit") == "VACANT"
+    finally:
+        db.close()
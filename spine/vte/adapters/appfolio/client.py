@@ -18,6 +18,7 @@ class AppFolioClient:
             self.headless = False
             
         self.cookie_path = os.getenv("APPFOLIO_COOKIE_PATH", "/app/storage/cookies/appfolio.json")
+        self.p = None
         self.browser: Browser = None
         self.context: BrowserContext = None
         self.page: Page = None
@@ -109,6 +110,13 @@ class AppFolioClient:
         except Exception as e:
             logger.error(f"Auto-Login Failed (Selectors might be wrong): {e}")
 
+    def is_healthy(self) -> bool:
+        """Cheap liveness check used by the session pool before reusing a browser."""
+        return bool(
+            self.browser and self.browser.is_connected()
+            and self.page and not self.page.is_closed()
+        )
+
     def close(self):
         """Clean shutdown."""
         if self.browser:
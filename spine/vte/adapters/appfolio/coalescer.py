@@ -0,0 +1,120 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from vte.core import metrics
+
+logger = logging.getLogger("vte.adapter.appfolio.coalescer")
+
+# How long the first write-back for a tenant waits for others to join its group.
+APPFOLIO_COALESCE_WINDOW_SECONDS = float(os.getenv("APPFOLIO_COALESCE_WINDOW_SECONDS", "0.25"))
+# A group is flushed early once it holds this many write-backs.
+APPFOLIO_COALESCE_MAX_GROUP = int(os.getenv("APPFOLIO_COALESCE_MAX_GROUP", "50"))
+# Threads that own browser sessions and perform the flushes.
+APPFOLIO_COALESCE_WORKERS = int(os.getenv("APPFOLIO_COALESCE_WORKERS", "2"))
+
+
+class WriteBack(NamedTuple):
+    decision_id: str
+    # op(client) -> bool, run with the client already on the tenant page.
+    op: Callable[[Any], bool]
+    future: Future
+
+
+class WriteBackCoalescer:
+    """
+    Groups AppFolio write-backs by tenant for a short window, then performs ONE
+    navigate_to_tenant per group and runs the write-backs on that page in submission
+    order. Each submitter gets its own Future[bool], so the outcome stays traceable to
+    its decision.
+
+    Flushes run on the coalescer's own threads, which lease warm sessions from the pool.
+    """
+    def __init__(
+        self,
+        window_seconds: float = APPFOLIO_COALESCE_WINDOW_SECONDS,
+        max_group: int = APPFOLIO_COALESCE_MAX_GROUP,
+        workers: int = APPFOLIO_COALESCE_WORKERS,
+        pool: Any = None
+    ):
+        self.window_seconds = window_seconds
+        self.max_group = max_group
+        self._pool = pool
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vte-appfolio")
+        self._groups: Dict[str, List[WriteBack]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, tenant_id: str, decision_id: str, op: Callable[[Any], bool]) -> Future:
+        """
+        Queues a write-back for a tenant. Returns a Future resolving to True/False.
+        """
+        future: Future = Future()
+        with self._lock:
+            group = self._groups.setdefault(tenant_id, [])
+            group.append(WriteBack(decision_id, op, future))
+            first = len(group) == 1
+            full = len(group) >= self.max_group
+
+        if full:
+            self._flush(tenant_id)
+        elif first:
+            if self.window_seconds > 0:
+                timer = threading.Timer(self.window_seconds, self._flush, args=(tenant_id,))
+                timer.daemon = True
+                timer.start()
+            else:
+                self._flush(tenant_id)
+        return future
+
+    def _flush(self, tenant_id: str):
+        with self._lock:
+            group = self._groups.pop(tenant_id, None)
+        if group:
+            self._executor.submit(self._run_group, tenant_id, group)
+
+    def _lease(self):
+        if self._pool is None:
+            from vte.adapters.appfolio.pool import appfolio_pool
+            return appfolio_pool.lease()
+        return self._pool.lease()
+
+    def _run_group(self, tenant_id: str, group: List[WriteBack]):
+        start = time.perf_counter()
+        metrics.increment("appfolio_writebacks_total", len(group))
+        remaining = list(group)
+        try:
+            with self._lease() as client:
+                on_page = False
+                while remaining:
+                    writeback = remaining[0]
+                    if not on_page:
+                        metrics.increment("appfolio_tenant_navigations_total")
+                        on_page = client.navigate_to_tenant(tenant_id)
+                        if not on_page:
+                            logger.error(f"AppFolio Navigation Failed for tenant {tenant_id}")
+                            break
+                    remaining.pop(0)
+                    try:
+                        ok = bool(writeback.op(client))
+                    except Exception as e:
+                        logger.error(f"AppFolio write-back for decision {writeback.decision_id} raised: {e}")
+                        ok = False
+                        # Page state unknown; the next write-back navigates again.
+                        on_page = False
+                    logger.info(f"AppFolio write-back for decision {writeback.decision_id}: {'ok' if ok else 'failed'}")
+                    writeback.future.set_result(ok)
+        except Exception as e:
+            logger.error(f"AppFolio write-back group for tenant {tenant_id} failed: {e}")
+        finally:
+            for writeback in remaining:
+                if not writeback.future.done():
+                    logger.info(f"AppFolio write-back for decision {writeback.decision_id}: failed")
+                    writeback.future.set_result(False)
+            metrics.observe("appfolio_writeback_group_seconds", time.perf_counter() - start)
+
+
+# One coalescer per worker process.
+appfolio_coalescer = WriteBackCoalescer()
@@ -0,0 +1,164 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+from vte.core import metrics
+
+logger = logging.getLogger("vte.adapter.appfolio.pool")
+
+# Recycle a browser after this many leases (bounds memory growth / stale sessions).
+APPFOLIO_POOL_MAX_USES = int(os.getenv("APPFOLIO_POOL_MAX_USES", "50"))
+# Recycle a browser that sat idle this long (cookies may have been refreshed on disk).
+APPFOLIO_POOL_MAX_IDLE_SECONDS = float(os.getenv("APPFOLIO_POOL_MAX_IDLE_SECONDS", "600"))
+# Warm browsers kept per thread.
+APPFOLIO_POOL_MAX_IDLE_PER_THREAD = int(os.getenv("APPFOLIO_POOL_MAX_IDLE_PER_THREAD", "1"))
+
+
+def _default_factory():
+    # Looked up at call time so a replaced/patched AppFolioClient is picked up.
+    from vte.adapters.appfolio import client as client_module
+    return client_module.AppFolioClient
+
+
+class _PooledClient:
+    def __init__(self, client: Any, factory: Any, owner: int):
+        self.client = client
+        self.factory = factory
+        self.owner = owner
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+
+class AppFolioSessionPool:
+    """
+    Long-lived pool of started (cookie-authenticated) AppFolioClient sessions.
+
+    Playwright's sync API is bound to the thread that started it, so idle sessions
+    are kept per thread: a side-effect worker thread leases its own warm browser
+    instead of cold-starting Chromium for every decision.
+
+        with appfolio_pool.lease() as client:
+            client.navigate_to_tenant(...)
+
+    A session is discarded instead of returned when the body raised, when it fails
+    its health check, after max_uses leases, or after max_idle_seconds unused.
+    """
+    def __init__(
+        self,
+        factory: Optional[Callable[[], Any]] = None,
+        max_uses: int = APPFOLIO_POOL_MAX_USES,
+        max_idle_seconds: float = APPFOLIO_POOL_MAX_IDLE_SECONDS,
+        max_idle_per_thread: int = APPFOLIO_POOL_MAX_IDLE_PER_THREAD
+    ):
+        self._factory = factory
+        self.max_uses = max_uses
+        self.max_idle_seconds = max_idle_seconds
+        self.max_idle_per_thread = max_idle_per_thread
+
+        self._local = threading.local()
+        self._live: List[_PooledClient] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        entry = self._acquire()
+        healthy = False
+        try:
+            yield entry.client
+            healthy = True
+        finally:
+            self._release(entry, healthy)
+
+    def _idle(self) -> List[_PooledClient]:
+        idle = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = self._local.idle = []
+        return idle
+
+    def _current_factory(self):
+        return self._factory or _default_factory()
+
+    def _acquire(self) -> _PooledClient:
+        start = time.perf_counter()
+        factory = self._current_factory()
+        idle = self._idle()
+        entry = None
+        while idle:
+            candidate = idle.pop()
+            reason = self._unusable_reason(candidate, factory)
+            if reason is None:
+                entry = candidate
+                metrics.increment("appfolio_pool_leases_total", source="warm")
+                break
+            self._discard(candidate, reason)
+
+        if entry is None:
+            client = factory()
+            client.start()
+            entry = _PooledClient(client, factory, threading.get_ident())
+            with self._lock:
+                self._live.append(entry)
+            metrics.increment("appfolio_pool_leases_total", source="cold")
+            logger.info("Started new pooled AppFolio session")
+
+        entry.uses += 1
+        metrics.observe("appfolio_pool_lease_seconds", time.perf_counter() - start)
+        return entry
+
+    def _unusable_reason(self, entry: _PooledClient, factory: Any) -> Optional[str]:
+        if entry.factory is not factory:
+            return "client implementation changed"
+        if time.monotonic() - entry.last_used > self.max_idle_seconds:
+            return "idle timeout"
+        try:
+            if not entry.client.is_healthy():
+                return "health check failed"
+        except Exception as e:
+            return f"health check error: {e}"
+        return None
+
+    def _release(self, entry: _PooledClient, healthy: bool):
+        idle = self._idle()
+        if not healthy:
+            self._discard(entry, "lease raised")
+        elif entry.uses >= self.max_uses:
+            self._discard(entry, "max uses reached")
+        elif len(idle) >= self.max_idle_per_thread:
+            self._discard(entry, "pool full")
+        else:
+            entry.last_used = time.monotonic()
+            idle.append(entry)
+
+    def _discard(self, entry: _PooledClient, reason: str):
+        logger.info(f"Recycling pooled AppFolio session ({reason})")
+        metrics.increment("appfolio_pool_recycled_total", reason=reason)
+        with self._lock:
+            if entry in self._live:
+                self._live.remove(entry)
+        try:
+            entry.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled AppFolio session: {e}")
+
+    def close_all(self):
+        """
+        Best-effort shutdown. Sessions owned by other (possibly finished) threads may
+        refuse to close from here; the process exit then tears Chromium down.
+        """
+        with self._lock:
+            entries, self._live = self._live, []
+        for entry in entries:
+            try:
+                entry.client.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+
+# One pool per worker process.
+appfolio_pool = AppFolioSessionPool()
+atexit.register(appfolio_pool.close_all)
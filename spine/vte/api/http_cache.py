@@ -0,0 +1,90 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+from fastapi import Request, Response
+
+from vte.core import metrics
+
+# Decisions and evidence bundles never change once written, so their
+# serialized bodies can be cached (here and by clients) without invalidation.
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("VTE_RESPONSE_CACHE_SIZE", "10000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("VTE_RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Private: these reads are tenant data, so shared proxies must not keep them.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+class CachedBody(NamedTuple):
+    etag: str
+    body: bytes
+
+
+def strong_etag(content_hash: str) -> str:
+    return f'"{content_hash}"'
+
+
+class ImmutableResponseCache:
+    """
+    Bounded LRU of serialized response bodies (with their ETag) keyed by object ID.
+    Bounded both by entry count and by total body bytes.
+    """
+    def __init__(self, name: str, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        metrics.increment("response_cache_lookups_total", cache=self.name, result="hit" if entry else "miss")
+        return entry
+
+    def put(self, key: Hashable, etag: str, body: bytes) -> CachedBody:
+        entry = CachedBody(etag, body)
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # RFC 9110: weak comparison for If-None-Match; "*" matches any current representation.
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def immutable_response(request: Request, cached: CachedBody) -> Response:
+    """
+    200 with the cached JSON body, or 304 if the client already holds this ETag.
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+decision_responses = ImmutableResponseCache("decisions")
+evidence_responses = ImmutableResponseCache("evidence")
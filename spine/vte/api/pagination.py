@@ -0,0 +1,93 @@
+import base64
+import datetime
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Hashable, List, Sequence
+
+from sqlalchemy import and_, or_
+
+# Cursors are opaque to clients: urlsafe base64 of a JSON array of the last row's sort values,
+# preceded by the scope they were issued for (e.g. sort key and direction), if any.
+
+
+def encode_cursor(values: Sequence[Any], scope: Sequence[str] = ()) -> str:
+    raw = json.dumps([*scope, *[_encode_value(v) for v in values]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any], scope: Sequence[str] = ()) -> List[Any]:
+    """
+    Decodes a cursor into values typed like the given columns. Raises ValueError if malformed
+    or issued for another scope.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if not isinstance(values, list) or len(values) != len(scope) + len(columns):
+        raise ValueError("Cursor does not match this listing")
+    if values[:len(scope)] != list(scope):
+        raise ValueError(f"Cursor was issued for {values[:len(scope)]}, not {list(scope)}")
+    return [_decode_value(v, column) for v, column in zip(values[len(scope):], columns)]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, "value"): # Enum
+        return value.value
+    return value
+
+
+def _decode_value(value: Any, column: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return value
+
+
+def keyset_filter(columns: Sequence[Any], values: Sequence[Any], descending: bool = False):
+    """
+    WHERE clause selecting rows strictly after `values` in ORDER BY columns (all asc or all desc):
+    (a > x) OR (a = x AND b > y) OR ...
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*[columns[j] == values[j] for j in range(i)], after))
+    return or_(*clauses)
+
+
+class CountCache:
+    """
+    Short-lived cache of COUNT(*) results per filter combination, so listings can
+    report a total without counting the table on every page.
+    """
+    def __init__(self, ttl: float, max_entries: int = 1000, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get_or_count(self, key: Hashable, count: Callable[[], int]) -> int:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+        value = count()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[key] = (now + self.ttl, value)
+        return value
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text, desc
 from vte.db import get_db
 from typing import List, Optional
-from vte.api.schema import DecisionDraft, DecisionRead, EvidenceBundleDraft, EvidenceBundleRead, OutcomeEnum
+from vte.api.http_cache import decision_responses, evidence_responses, immutable_response, strong_etag
+from vte.api.pagination import CountCache, decode_cursor, encode_cursor, keyset_filter
+from vte.api.schema import DecisionDraft, DecisionRead, DecisionBatchItem, DecisionBatchResult, EvidenceBundleDraft, EvidenceBundleRead, EvidenceStreamResult, InclusionProofRead, MerkleRootRead, OutcomeEnum
 from vte.orm import DecisionObject, EvidenceBundle
 from vte.orm import OutcomeEnum as DBOutcomeEnum
 
 from vte.core.verifier import ProofVerifier
-from vte.core.canonicalize import canonical_json_dumps
-import hashlib
-import json
+from vte.core.canonicalize import canonical_sha256
+from vte.core.evidence_store import new_bundle
+from vte.core.evidence_stream import EvidenceStreamError, EvidenceStreamIngestor
+from vte.core.search import apply_search
 import datetime
 
 router = APIRouter()
@@ -44,22 +49,22 @@ def create_evidence(draft: EvidenceBundleDraft, db: Session = Depends(get_db)):
     hash_payload["collected_at"] = now_iso
     
     try:
-        canonical_bytes = canonical_json_dumps(hash_payload)
-        bundle_hash = hashlib.sha256(canonical_bytes).hexdigest()
+        bundle_hash = canonical_sha256(hash_payload)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Canonicalization failed: {str(e)}")
 
     # Create Bundle
     # For SQLite compatibility, pass datetime object, not ISO string.
     # SA will handle conversion.
-    db_obj = EvidenceBundle(
-        collected_at=datetime.datetime.now(datetime.timezone.utc),
-        normalization_schema=draft.normalization_schema,
-        items_json=json.loads(json.dumps(draft.model_dump()["items"], default=str)), # Ensure valid JSON
-        bundle_hash=bundle_hash
-    )
-    
+    # Items are stored once in the content-addressed item store; the bundle references them.
     try:
+        db_obj = new_bundle(
+            db,
+            payload["items"],
+            collected_at=datetime.datetime.now(datetime.timezone.utc),
+            normalization_schema=draft.normalization_schema,
+            bundle_hash=bundle_hash
+        )
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -71,13 +76,101 @@ def create_evidence(draft: EvidenceBundleDraft, db: Session = Depends(get_db)):
 
     return db_obj
 
+@router.get("/evidence/{bundle_id}", response_model=EvidenceBundleRead)
+def get_evidence(bundle_id: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Evidence bundles are immutable: strong ETag (the bundle hash), Cache-Control: immutable,
+    and the serialized body (items included) is cached in-process.
+    """
+    import uuid
+    try:
+        uid = uuid.UUID(bundle_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid UUID")
+    cached = evidence_responses.get(uid)
+    if cached is None:
+        obj = db.get(EvidenceBundle, uid)
+        if not obj:
+            raise HTTPException(status_code=404, detail="Evidence bundle not found")
+        body = EvidenceBundleRead.model_validate(obj).model_dump_json().encode("utf-8")
+        cached = evidence_responses.put(uid, strong_etag(obj.bundle_hash), body)
+    return immutable_response(request, cached)
+
+@router.post("/evidence:stream", response_model=EvidenceStreamResult, status_code=status.HTTP_201_CREATED)
+async def create_evidence_stream(request: Request, db: Session = Depends(get_db)):
+    """
+    Streaming Evidence Ingestion (application/x-ndjson), for large backfills.
+    A line with 'normalization_schema' opens a bundle (optionally with inline 'items');
+    the following lines are its items. Items are hashed as they arrive and bundles are
+    persisted in batches, so the payload is never held in memory as a whole.
+    Bundle hashes are identical to POST /evidence for the same content and collected_at.
+    On a bad line, bundles already persisted stay persisted and are listed in the error.
+    """
+    ingestor = EvidenceStreamIngestor(db)
+    line_no = 0
+    tail = b""
+    try:
+        async for chunk in request.stream():
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                line_no += 1
+                if ingestor.feed(line_no, line):
+                    await run_in_threadpool(ingestor.flush)
+        if tail:
+            ingestor.feed(line_no + 1, tail)
+        await run_in_threadpool(ingestor.close)
+    except EvidenceStreamError as e:
+        raise HTTPException(status_code=400, detail={"line": e.line, "error": e.message, "committed": [b["bundle_hash"] for b in ingestor.committed]})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Persistence failed (Collision?): {str(e)}")
+
+    return EvidenceStreamResult(bundles=ingestor.committed, items=sum(b["item_count"] for b in ingestor.committed))
+
 from vte.api.deps import get_current_user_claims
 from vte.core.policy import PolicyEngine
+from vte.core.chain import append_each, decision_writer, hashed_payload
+from vte.core.chain_export import ChainExporter, UnknownChainPosition
+from vte.core.outbox import outbox_dispatcher
+from vte.core.merkle import inclusion_proof, read_root
 
 policy_engine = PolicyEngine()
 
+# Upper bound on drafts per POST /decisions:batch (one transaction).
+MAX_DECISION_BATCH = 1000
+
+def _build_decision(draft: DecisionDraft, previous_hash: str) -> DecisionObject:
+    """
+    Builds the (unsaved) DecisionObject for a draft linked to previous_hash.
+    Called by the chain writer once it holds the chain head; called again on retry.
+    """
+    # The hash covers the nested payload built by chain.hashed_payload, previous_hash
+    # included (which cryptographically binds the chain). It is computed from the
+    # stored columns, timestamp included, so the chain verifier can recompute it.
+    decision = DecisionObject(
+        timestamp=datetime.datetime.now(datetime.timezone.utc), # Use object, not string
+        actor_user_id=draft.actor.user_id,
+        actor_role=draft.actor.role, # Enum
+        actor_session_id=draft.actor.session_id,
+        intent_action=draft.intent.action,
+        intent_target=draft.intent.target_resource,
+        intent_params=draft.intent.parameters,
+        evidence_hash=draft.evidence_hash,
+        outcome=draft.outcome, # Enum
+        policy_version=draft.policy_version,
+        permit_token_id=draft.permit_token_id,
+        previous_hash=previous_hash # Provided explicitly so Trigger doesn't fail
+    )
+
+    # Canonicalize & Hash
+    try:
+        decision.decision_hash = canonical_sha256(hashed_payload(decision))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Canonicalization failed: {str(e)}")
+    return decision
+
 @router.post("/decisions", response_model=DecisionRead, status_code=status.HTTP_201_CREATED)
-def create_decision(draft: DecisionDraft, claims: dict = Depends(get_current_user_claims), db: Session = Depends(get_db)):
+def create_decision(draft: DecisionDraft, claims: dict = Depends(get_current_user_claims)):
     """
     Ingests a Decision Draft. Requires JWT Auth.
     Ensures 'actor' in draft matches the authenticated user token.
@@ -94,199 +187,215 @@ def create_decision(draft: DecisionDraft, claims: dict = Depends(get_current_use
             detail=policy_result.reason
         )
     
-    # 1. Get Previous Hash...
-    # In a real app we'd use select ... for update or advisory lock here.
-    # We rely on the DB trigger to optimistic check, but we need the value to calc hash.
-    
-    last_decision = db.query(DecisionObject).order_by(desc(DecisionObject.timestamp), desc(DecisionObject.decision_id)).first()
-    previous_hash = last_decision.decision_hash if last_decision else "GENESIS"
-
-    # 2. Construct Canonical Payload (Nested)
-    # We must match the JSON structure expected by the 'decision_object_v1' schema AND the chaining logic.
-    # Note: verifier.py expects 'decision_hash' to be calculated from the payload.
-    # If we include 'previous_hash' in the payload effectively, we cryptographically bind the chain.
-    
-    payload = {
-        "timestamp": "PENDING", # We need a timestamp. Usually DB sets it, but for hashing we need to set it NOW.
-        "actor": {
-            "user_id": draft.actor.user_id,
-            "role": draft.actor.role.value,
-            "session_id": draft.actor.session_id
-        },
-        "intent": {
-            "action": draft.intent.action,
-            "target_resource": draft.intent.target_resource,
-            "parameters": draft.intent.parameters
-        },
-        "evidence_hash": draft.evidence_hash,
-        "outcome": draft.outcome.value,
-        "policy_version": draft.policy_version,
-        "permit_token_id": str(draft.permit_token_id) if draft.permit_token_id else None,
-        "previous_hash": previous_hash
-    }
-    
-    # Add timestamp
-    now_iso = datetime.datetime.utcnow().isoformat() + "Z" 
-    payload["timestamp"] = now_iso
-    
-    # 3. Canonicalize & Hash
-    try:
-        canonical_bytes = canonical_json_dumps(payload)
-        decision_hash = hashlib.sha256(canonical_bytes).hexdigest()
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Canonicalization failed: {str(e)}")
-
-    # 4. Map to ORM (Flattened)
-    db_obj = DecisionObject(
-        timestamp=datetime.datetime.now(datetime.timezone.utc), # Use object, not string
-        actor_user_id=draft.actor.user_id,
-        actor_role=draft.actor.role, # Enum
-        actor_session_id=draft.actor.session_id,
-        intent_action=draft.intent.action,
-        intent_target=draft.intent.target_resource,
-        intent_params=draft.intent.parameters,
-        evidence_hash=draft.evidence_hash,
-        outcome=draft.outcome, # Enum
-        policy_version=draft.policy_version,
-        permit_token_id=draft.permit_token_id,
-        decision_hash=decision_hash,
-        previous_hash=previous_hash # Provided explicitly so Trigger doesn't fail
-    )
-    
+    # 1-4. Link to the chain head, hash and persist (atomically with the head move).
+    # Concurrent requests are chained and committed together by the group-commit writer.
     try:
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db_obj = decision_writer.submit(lambda previous_hash: _build_decision(draft, previous_hash))
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Persistence failed: {str(e)}")
 
     # 5. Trigger Execution (Side Effect)
-    # If the decision is APPROVED, we must execute the intent.
-    # We do this asynchronously via Celery.
+    # APPROVED decisions were written to the execution outbox in the same transaction,
+    # so they cannot be lost; the dispatcher hands them to Celery in batches.
     if db_obj.outcome == OutcomeEnum.APPROVED:
+        outbox_dispatcher.notify()
+
+    return db_obj
+
+@router.post("/decisions:batch", response_model=DecisionBatchResult, status_code=status.HTTP_201_CREATED)
+def create_decisions_batch(drafts: List[DecisionDraft], claims: dict = Depends(get_current_user_claims)):
+    """
+    Bulk ingestion of Decision Drafts (ingestion agents, migrations). Requires JWT Auth.
+    Each draft is policy-checked like POST /decisions; allowed drafts are chained in
+    submission order and committed in ONE transaction. Results are reported per item
+    (created / rejected / failed). APPROVED decisions go through the execution outbox.
+    """
+    if len(drafts) > MAX_DECISION_BATCH:
+        raise HTTPException(status_code=400, detail=f"Batch too large: {len(drafts)} drafts (max {MAX_DECISION_BATCH})")
+
+    results: List[DecisionBatchItem] = []
+    allowed = []
+    for index, draft in enumerate(drafts):
+        # Security Enforcement: Overwrite Actor with Trusted Token Claims
+        draft.actor.user_id = claims["user_id"]
+        policy_result = policy_engine.evaluate(draft, claims)
+        if not policy_result.allowed:
+            results.append(DecisionBatchItem(index=index, status="rejected", error=policy_result.reason))
+        else:
+            allowed.append((index, draft))
+
+    created = []
+    if allowed:
+        # A session of the chain writer's own, like its group commits: the appended
+        # objects are serialized below, so they stay loaded after commit.
         try:
-            from vte.tasks import execute_decision
-            # We use delay() to send to Redis queue
-            execute_decision.delay(decision_id=str(db_obj.decision_id))
+            with decision_writer.session_factory(expire_on_commit=False) as db:
+                decisions, errors = append_each(db, [
+                    (lambda previous_hash, draft=draft: _build_decision(draft, previous_hash)) for _, draft in allowed
+                ])
         except Exception as e:
-            # We do NOT rollback the decision - it is committed.
-            # But we log the failure to enqueue.
-            # In a real system, we might need a reliable outbox pattern here.
-            # For VTE Phase 17, logging is sufficient.
-            print(f"CRITICAL: Failed to enqueue execution task: {e}")
+            decisions, errors = [None] * len(allowed), {i: Exception(f"Persistence failed: {str(e)}") for i in range(len(allowed))}
 
-    return db_obj
+        for i, ((index, _), decision) in enumerate(zip(allowed, decisions)):
+            if i in errors:
+                error = errors[i].detail if isinstance(errors[i], HTTPException) else str(errors[i])
+                results.append(DecisionBatchItem(index=index, status="failed", error=error))
+            else:
+                created.append(decision)
+                results.append(DecisionBatchItem(index=index, status="created", decision=decision))
+
+    # Trigger Execution (Side Effect): APPROVED decisions are already in the outbox.
+    if any(d.outcome == OutcomeEnum.APPROVED for d in created):
+        outbox_dispatcher.notify()
+
+    results.sort(key=lambda item: item.index)
+    return DecisionBatchResult(
+        created=len(created),
+        rejected=sum(1 for r in results if r.status == "rejected"),
+        failed=sum(1 for r in results if r.status == "failed"),
+        results=results
+    )
 
 @router.get("/decisions/{decision_id}", response_model=DecisionRead)
-def get_decision(decision_id: str, db: Session = Depends(get_db)):
+def get_decision(decision_id: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Decisions are immutable: the response carries a strong ETag (the decision hash)
+    and Cache-Control: immutable, and the serialized body is cached in-process.
+    """
     import uuid
     try:
         uid = uuid.UUID(decision_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid UUID")
-    obj = db.query(DecisionObject).filter(DecisionObject.decision_id == uid).first()
-    if not obj:
-        raise HTTPException(status_code=404, detail="Decision not found")
-    return obj
+    cached = decision_responses.get(uid)
+    if cached is None:
+        obj = db.query(DecisionObject).filter(DecisionObject.decision_id == uid).first()
+        if not obj:
+            raise HTTPException(status_code=404, detail="Decision not found")
+        body = DecisionRead.model_validate(obj).model_dump_json().encode("utf-8")
+        cached = decision_responses.put(uid, strong_etag(obj.decision_hash), body)
+    return immutable_response(request, cached)
+
+@router.get("/decisions:root", response_model=MerkleRootRead, tags=["Audit"])
+def get_ledger_root(db: Session = Depends(get_db)):
+    """
+    Current Merkle root over every decision_hash in chain order (see vte.core.merkle).
+    """
+    return read_root(db)
+
+@router.get("/decisions/{decision_id}/proof", response_model=InclusionProofRead, tags=["Audit"])
+def get_inclusion_proof(decision_id: str, db: Session = Depends(get_db)):
+    """
+    O(log n) proof that the decision is in the ledger under the returned root;
+    check it with ProofVerifier.verify_inclusion_proof against a trusted root.
+    """
+    import uuid
+    try:
+        uid = uuid.UUID(decision_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid UUID")
+    proof = inclusion_proof(db, uid)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Decision not found in the ledger")
+    return proof
+
+# Newest first; decision_id breaks timestamp ties so the order is total.
+DECISION_LIST_ORDER = [DecisionObject.timestamp, DecisionObject.decision_id]
+MAX_DECISION_PAGE = 500
 
 @router.get("/decisions", response_model=List[DecisionRead])
-def get_decisions(status: Optional[OutcomeEnum] = None, limit: int = 50, db: Session = Depends(get_db)):
+def get_decisions(
+    response: Response,
+    status: Optional[OutcomeEnum] = None,
+    actor: Optional[str] = None,
+    target: Optional[str] = None,
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """
-    Get list of decisions, optionally filtered by status (e.g., PROPOSED).
-    Returns most recent first.
+    Get list of decisions, optionally filtered by status (e.g., PROPOSED), actor,
+    target and time window [since, until). Returns most recent first.
+    Pages are keyset-based: pass the X-Next-Cursor response header back as 'cursor'.
+    Decisions created meanwhile do not shift later pages.
     """
+    if limit < 1 or limit > MAX_DECISION_PAGE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_DECISION_PAGE}")
+
     query = db.query(DecisionObject)
     
     if status:
         query = query.filter(DecisionObject.outcome == status)
+    if actor:
+        query = query.filter(DecisionObject.actor_user_id == actor)
+    if target:
+        query = query.filter(DecisionObject.intent_target == target)
+    if since:
+        query = query.filter(DecisionObject.timestamp >= since)
+    if until:
+        query = query.filter(DecisionObject.timestamp < until)
+    if cursor:
+        try:
+            query = query.filter(keyset_filter(DECISION_LIST_ORDER, decode_cursor(cursor, DECISION_LIST_ORDER), descending=True))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-    query = query.order_by(desc(DecisionObject.timestamp))
-    return query.limit(limit).all()
+    query = query.order_by(*[desc(c) for c in DECISION_LIST_ORDER])
+    decisions = query.limit(limit).all()
 
-    return {"status": "triggered", "task_id": str(task.id)}
+    if len(decisions) == limit:
+        last = decisions[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor([last.timestamp, last.decision_id])
+    return decisions
 
-@router.get("/queue", tags=["Unified Queue"])
-def get_unified_queue(
-    skip: int = 0,
-    limit: int = 50,
-    search: Optional[str] = None,
-    sort_by: Optional[str] = "priority",
-    order: Optional[str] = "asc",
-    status: Optional[str] = "PENDING",
-    priority: Optional[str] = "ALL", 
+EXPORT_ROLES = ("auditor", "admin", "super_admin")
+
+@router.get("/decisions:export", tags=["Audit"])
+def export_decision_chain(
+    after: Optional[str] = None,
+    include_evidence: bool = False,
+    claims: dict = Depends(get_current_user_claims),
     db: Session = Depends(get_db)
 ):
     """
-    Unified Workbench Queue.
+    Streams the decision chain as NDJSON in chain order (see vte.core.chain_export),
+    optionally with the linked evidence bundles, ending with a manifest line.
+    'after' resumes after the given decision_hash (e.g. a previous manifest's head_hash).
     """
-    query = db.query(DecisionObject)
-    
-    # 1. Filtering
-    if status and status != "ALL":
-        if status == "PENDING":
-            query = query.filter(DecisionObject.outcome == "PROPOSED")
-        elif status == "COMPLETED":
-            query = query.filter(DecisionObject.outcome != "PROPOSED")
-            
-    # 2. Search
-    if search:
-        query = query.filter(DecisionObject.intent_action.contains(search)) 
-        
-    # 3. Sorting
-    sort_field = DecisionObject.timestamp
-    if sort_by == "sla_deadline":
-        sort_field = DecisionObject.timestamp
-    elif sort_by == "title":
-        # 'intent_action' is the field name in DecisionObject
-        sort_field = DecisionObject.intent_action
-        
-    if order == "desc":
-        query = query.order_by(desc(sort_field))
-    else:
-        query = query.order_by(sort_field)
-        
-    # Execute (Fetch all to filter by mock priority if needed, or just paginate)
-    all_items = query.all()
-    
-    result = []
-    for item in all_items:
-        # Mock Priority Logic
-        prio = 2
-        if item.intent_action and "High" in item.intent_action: prio = 1
-        elif item.intent_action and "Low" in item.intent_action: prio = 3
-        
-        # Filter Priority
-        if priority != "ALL" and str(prio) != priority:
-            continue
-            
-        # Outcome Access
-        status_val = str(item.outcome)
-        if hasattr(item.outcome, "value"):
-            status_val = item.outcome.value
+    if claims.get("role") not in EXPORT_ROLES:
+        raise HTTPException(status_code=403, detail="Chain export requires an auditor or admin role")
 
-        result.append({
-            "id": str(item.decision_id),
-            "title": f"{item.intent_action} {item.intent_target}",
-            "priority": prio,
-            "status": status_val,
-            "assigned_to": str(item.actor_user_id),
-            "sla_deadline": (item.timestamp + datetime.timedelta(days=1)).isoformat()
-        })
-        
-    # Manual Pagination after Priority Filter
-    start = skip
-    end = skip + limit
-    paginated = result[start:end]
-    
-    return paginated
+    exporter = ChainExporter(include_evidence=include_evidence, after_hash=after)
+    try:
+        exporter.start_position(db)
+    except UnknownChainPosition as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    # The export reads through its own session, open for as long as the stream.
+    return StreamingResponse(exporter.lines(), media_type="application/x-ndjson")
+
+# Queue totals are an estimate: cached per filter for this long.
+QUEUE_COUNT_TTL_SECONDS = 30
+queue_counts = CountCache(ttl=QUEUE_COUNT_TTL_SECONDS)
+
+QUEUE_SORT_FIELDS = {
+    "priority": DecisionObject.priority,
+    "sla_deadline": DecisionObject.sla_deadline,
+    "title": DecisionObject.intent_action, # 'intent_action' is the field name in DecisionObject
+    "timestamp": DecisionObject.timestamp,
+}
 
 @router.get("/queue", tags=["Unified Queue"])
 def get_unified_queue(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
-    sort_by: Optional[str] = "priority",
+    sort_by: Optional[str] = None,
     order: Optional[str] = "asc",
     status: Optional[str] = "PENDING",
     priority: Optional[str] = "ALL", 
@@ -294,8 +403,13 @@ def get_unified_queue(
 ):
     """
     Unified Workbench Queue.
-    Aggregates Decisions (Tasks) and Evidence (New Signals).
-    Supports: Pagination, Sorting, Filtering, Search.
+    Supports: Keyset Pagination, Sorting, Filtering, Search.
+    Priority and SLA deadline are stored on the decision when it is written, so filtering,
+    sorting and paging all happen in SQL. Pass the X-Next-Cursor response header back as
+    'cursor' for the next page ('skip' is still honoured for the first page only).
+    X-Total-Count is a cached estimate (refreshed every QUEUE_COUNT_TTL_SECONDS).
+    Search uses the decision search index (action, target, tenant name, key parameters);
+    sort_by=relevance (the default when searching) ranks the matches.
     """
     query = db.query(DecisionObject)
     
@@ -306,42 +420,48 @@ def get_unified_queue(
             query = query.filter(DecisionObject.outcome == "PROPOSED")
         elif status == "COMPLETED":
             query = query.filter(DecisionObject.outcome != "PROPOSED")
+    if priority and priority != "ALL":
+        try:
+            query = query.filter(DecisionObject.priority == int(priority))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid priority: {priority}")
             
     # 2. Search
+    rank = None
     if search:
-        query = query.filter(DecisionObject.intent_action.contains(search)) 
-        
-    # 3. Sorting
-    sort_field = DecisionObject.timestamp
-    if sort_by == "sla_deadline":
-        sort_field = DecisionObject.timestamp
-    elif sort_by == "title":
-        # 'intent_action' is the field name in DecisionObject
-        sort_field = DecisionObject.intent_action
+        query, rank = apply_search(db, query, search)
+
+    total = queue_counts.get_or_count((status, priority, search), query.count)
         
-    if order == "desc":
-        query = query.order_by(desc(sort_field))
+    # 3. Sorting: (sort_key, decision_id) keeps the order total, so cursors are stable.
+    if sort_by is None:
+        sort_by = "relevance" if search else "priority"
+    if sort_by == "relevance" and rank is not None:
+        sort_key = rank
     else:
-        query = query.order_by(sort_field)
-        
-    # Execute (Fetch all to filter by mock priority if needed, or just paginate)
-    # Note: Filtering priority in memory after fetch breaks pagination if we drop items.
-    # For MVP Gap Fix, we accept this or implement basic pagination without priority filter first.
-    # Given we have few items, fetching all then slicing is safer for correctness.
-    
-    all_items = query.all()
-    
+        if sort_by not in QUEUE_SORT_FIELDS:
+            sort_by = "timestamp"
+        sort_key = QUEUE_SORT_FIELDS[sort_by]
+    sort_columns = [sort_key, DecisionObject.decision_id]
+    descending = order == "desc"
+    query = query.order_by(*[desc(c) if descending else c for c in sort_columns])
+    # A cursor only makes sense in the order it was issued for.
+    cursor_scope = [sort_by, "desc" if descending else "asc"]
+
+    # 4. Pagination
+    if cursor:
+        try:
+            query = query.filter(keyset_filter(sort_columns, decode_cursor(cursor, sort_columns, cursor_scope), descending))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    elif skip:
+        query = query.offset(skip)
+    # The sort values ride along with each row to build the next cursor.
+    rows = query.add_columns(*sort_columns).limit(limit).all()
+    items = [row[0] for row in rows]
+
     result = []
-    for item in all_items:
-        # Mock Priority Logic
-        prio = 2
-        if item.intent_action and "High" in item.intent_action: prio = 1
-        elif item.intent_action and "Low" in item.intent_action: prio = 3
-        
-        # Filter Priority
-        if priority != "ALL" and str(prio) != priority:
-            continue
-            
+    for item in items:
         # Outcome Access: item.outcome is likely a string or Enum proxy. 
         # Safe access via str() or .value check
         status_val = str(item.outcome)
@@ -351,16 +471,13 @@ def get_unified_queue(
         result.append({
             "id": str(item.decision_id),
             "title": f"{item.intent_action} {item.intent_target}",
-            "priority": prio,
+            "priority": item.priority,
             "status": status_val,
             "assigned_to": str(item.actor_user_id),
-            "sla_deadline": (item.timestamp + datetime.timedelta(days=1)).isoformat()
+            "sla_deadline": item.sla_deadline.isoformat()
         })
-        
-    # Manual Pagination after Priority Filter
-    total = len(result)
-    start = skip
-    end = skip + limit
-    paginated = result[start:end]
-    
-    return paginated
+
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(list(rows[-1][1:]), cursor_scope)
+    response.headers["X-Total-Count"] = str(total)
+    return result
@@ -102,3 +102,47 @@ class DecisionRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+# --- Merkle Ledger ---
+class MerkleRootRead(BaseModel):
+    leaf_count: int
+    root: Optional[str] # None for an empty ledger
+    peaks: List[str]
+
+class MerklePathStep(BaseModel):
+    side: str # "left" | "right": where the sibling sits
+    hash: str
+
+class InclusionProofRead(BaseModel):
+    decision_id: UUID4
+    decision_hash: str
+    leaf_index: int
+    leaf_count: int
+    path: List[MerklePathStep] # leaf to peak
+    peak_index: int
+    peaks: List[str]
+    root: str
+
+# --- Decision Batch ---
+class DecisionBatchItem(BaseModel):
+    index: int # Position in the submitted array
+    status: str # "created" | "rejected" (policy) | "failed"
+    decision: Optional[DecisionRead] = None
+    error: Optional[str] = None
+
+class DecisionBatchResult(BaseModel):
+    created: int
+    rejected: int
+    failed: int
+    results: List[DecisionBatchItem]
+
+# --- Evidence Stream ---
+class EvidenceBundleSummary(BaseModel):
+    bundle_id: UUID4
+    bundle_hash: str
+    collected_at: datetime
+    item_count: int
+
+class EvidenceStreamResult(BaseModel):
+    bundles: List[EvidenceBundleSummary]
+    items: int
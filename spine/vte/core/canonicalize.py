@@ -1,36 +1,223 @@
-import json
-from typing import Any, Union
+import hashlib
+import logging
+import os
+from json.encoder import encode_basestring
+from typing import Any, Callable, List
+
+try:
+    import orjson
+except ImportError: # Optional accelerated backend
+    orjson = None
+
+logger = logging.getLogger("vte.core.canonicalize")
+
+# Encoded text is handed to the sink once this many fragments have piled up,
+# so hashing a large payload never holds more than a slice of it in memory.
+CANONICAL_FLUSH_PARTS = 2048
+
+# "auto" uses orjson when it is installed, "python" forces the pure-Python encoder.
+# Both produce identical bytes (tests/test_canonical_conformance.py).
+CANONICAL_BACKEND = os.getenv("VTE_CANONICAL_BACKEND", "auto")
+
+_FLOAT_ERROR = "Floats are not permitted in Canonical JSON for VTE. Use strings or integers."
+
+
+def canonical_backend() -> str:
+    """
+    Name of the serializer used for plain payloads: "orjson" or "python".
+    """
+    if CANONICAL_BACKEND == "python" or orjson is None:
+        return "python"
+    return "orjson"
+
 
 def canonical_json_dumps(data: Any) -> bytes:
     """
     Serializes data to Canonical JSON format (RFC 8785 compliant).
-    
+
     Rules:
     - Keys are sorted lexicographically.
     - No whitespace (separators are used efficiently).
     - Output is UTF-8 encoded bytes.
     - Floats are NOT supported to prevent precision drift (using Decimal or string is preferred in VTE).
+
+    The output is byte-for-byte what json.dumps(sort_keys=True, separators=(',', ':'),
+    ensure_ascii=False) produces, built in the same single pass that rejects floats.
+    """
+    fast = _orjson_dumps(data)
+    if fast is not None:
+        return fast
+    parts: List[str] = []
+    _encode(data, parts, None)
+    return "".join(parts).encode("utf-8")
+
+
+def canonical_encode(data: Any, write: Callable[[bytes], Any]):
+    """
+    Streams the canonical JSON bytes of data into write (e.g. hash.update,
+    hmac.update or a buffer's write) without materializing the whole document.
+    (The orjson backend serializes in one call and writes once.)
     """
-    # Fail fast on floats to prevent non-deterministic serialization
-    if _contains_float(data):
-        raise ValueError("Floats are not permitted in Canonical JSON for VTE. Use strings or integers.")
-
-    # sort_keys=True ensures deterministic ordering
-    # separators=(',', ':') removes whitespace
-    # ensure_ascii=False allows direct UTF-8 characters (required for RFC 8785)
-    return json.dumps(
-        data,
-        sort_keys=True,
-        separators=(',', ':'),
-        ensure_ascii=False
-    ).encode('utf-8')
-
-def _contains_float(data: Any) -> bool:
-    """Recursively checks for float types."""
-    if isinstance(data, float):
+    fast = _orjson_dumps(data)
+    if fast is not None:
+        write(fast)
+        return
+    parts: List[str] = []
+    _encode(data, parts, write)
+    if parts:
+        write("".join(parts).encode("utf-8"))
+
+
+def canonical_sha256(data: Any) -> str:
+    """
+    Hex sha256 of the canonical JSON of data: hashlib.sha256(canonical_json_dumps(data)).hexdigest(),
+    in one pass.
+    """
+    digest = hashlib.sha256()
+    canonical_encode(data, digest.update)
+    return digest.hexdigest()
+
+
+# --- orjson backend ---
+# orjson with OPT_SORT_KEYS matches the canonical bytes for plain JSON data (dicts
+# with str keys, lists, str, bool, None and 64-bit ints). Anything else (subclasses
+# such as str enums, tuples, non-str keys, big ints) goes to the pure-Python encoder,
+# whose behaviour is the reference, as does anything orjson refuses.
+_ORJSON_INT_MIN = -(2 ** 63)
+_ORJSON_INT_MAX = 2 ** 64 - 1
+
+
+def _orjson_dumps(data: Any):
+    """
+    Canonical bytes via orjson, or None when the pure-Python encoder must handle data
+    (including anything it rejects, so errors are raised exactly as it raises them).
+    """
+    if orjson is None or CANONICAL_BACKEND == "python" or not _is_plain(data):
+        return None
+    try:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # e.g. lone surrogates or very deep nesting: let the reference path decide.
+        return None
+
+
+def _is_plain(o: Any) -> bool:
+    """
+    True if o only holds exact dict (str keys) / list / str / int (64-bit) / bool / None.
+    """
+    t = type(o)
+    if t is dict:
+        for k, v in o.items():
+            if type(k) is not str:
+                return False
+            tv = type(v)
+            if tv is str or tv is bool or v is None:
+                continue
+            if not _is_plain(v):
+                return False
+        return True
+    if t is list:
+        for v in o:
+            tv = type(v)
+            if tv is str or tv is bool or v is None:
+                continue
+            if not _is_plain(v):
+                return False
         return True
-    if isinstance(data, dict):
-        return any(_contains_float(v) for v in data.values())
-    if isinstance(data, list):
-        return any(_contains_float(x) for x in data)
+    if t is str or t is bool or o is None:
+        return True
+    if t is int:
+        return _ORJSON_INT_MIN <= o <= _ORJSON_INT_MAX
     return False
+
+
+# --- Pure-Python encoder (reference) ---
+def _key(key: Any) -> str:
+    # Same key coercion as json.dumps (floats excepted).
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, float):
+        raise ValueError(_FLOAT_ERROR)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"keys must be str, int, bool or None, not {key.__class__.__name__}")
+
+
+def _encode(data: Any, parts: List[str], write) -> None:
+    """
+    Appends the canonical encoding of data to parts, flushing full slices to write
+    (when given). Type checks go exact-type first: plain dict/list/str/int are the
+    hot path; subclasses (str enums, IntEnum, tuples) follow json's rules.
+    """
+    append = parts.append
+    encode_str = encode_basestring
+    int_repr = int.__repr__
+
+    def flush():
+        write("".join(parts).encode("utf-8"))
+        parts.clear()
+
+    def encode(o):
+        t = type(o)
+        if t is str:
+            append(encode_str(o))
+        elif t is dict:
+            if not o:
+                append("{}")
+                return
+            separator = "{"
+            if all(type(k) is str for k in o):
+                for k in sorted(o):
+                    append(separator + encode_str(k) + ":")
+                    separator = ","
+                    encode(o[k])
+            else:
+                # json.dumps sorts on the original keys, then coerces them.
+                for k, v in sorted(o.items()):
+                    append(separator + encode_str(_key(k)) + ":")
+                    separator = ","
+                    encode(v)
+            append("}")
+            if write is not None and len(parts) >= CANONICAL_FLUSH_PARTS:
+                flush()
+        elif t is list or t is tuple:
+            if not o:
+                append("[]")
+                return
+            separator = "["
+            for v in o:
+                append(separator)
+                separator = ","
+                encode(v)
+            append("]")
+            if write is not None and len(parts) >= CANONICAL_FLUSH_PARTS:
+                flush()
+        elif o is None:
+            append("null")
+        elif o is True:
+            append("true")
+        elif o is False:
+            append("false")
+        elif t is int:
+            append(int_repr(o))
+        elif isinstance(o, float):
+            # Fail fast on floats to prevent non-deterministic serialization
+            raise ValueError(_FLOAT_ERROR)
+        elif isinstance(o, str):
+            append(encode_str(o))
+        elif isinstance(o, int):
+            append(int_repr(o))
+        elif isinstance(o, (list, tuple)):
+            encode(list(o))
+        elif isinstance(o, dict):
+            encode(dict(o))
+        else:
+            raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+    encode(data)
@@ -0,0 +1,286 @@
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from vte.db import SessionLocal
+from vte.orm import ChainHead, DecisionObject
+from vte.core import metrics
+from vte.core.outbox import enqueue_execution
+from vte.core.merkle import append_leaf
+
+logger = logging.getLogger("vte.core.chain")
+
+DECISION_CHAIN = "decisions"
+GENESIS_HASH = "GENESIS"
+
+# How often an append is retried after losing a race for the chain head.
+CHAIN_APPEND_RETRIES = int(os.getenv("VTE_CHAIN_APPEND_RETRIES", "5"))
+# Max drafts chained and committed together by the group-commit writer.
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("VTE_GROUP_COMMIT_MAX_BATCH", "256"))
+
+
+class ChainConflict(Exception):
+    """
+    The chain head moved (or was created) by a concurrent writer.
+    """
+
+
+def _value(v):
+    return getattr(v, "value", v) # Enums are hashed by value
+
+
+def _hashed_timestamp(timestamp: datetime.datetime) -> str:
+    # Naive UTC ISO-8601 with a Z suffix; the DB may hand the column back naive (SQLite) or aware.
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return timestamp.isoformat() + "Z"
+
+
+def hashed_payload(decision) -> Dict[str, Any]:
+    """
+    The payload a decision's decision_hash is the canonical sha256 of, built from
+    its stored columns (a DecisionObject or a row with the same columns). Used both
+    when a decision is written and when the chain is verified, so the two agree.
+    """
+    params = decision.intent_params
+    if isinstance(params, str): # Some early rows hold intent_params as a JSON string.
+        params = json.loads(params)
+    return {
+        "timestamp": _hashed_timestamp(decision.timestamp),
+        "actor": {
+            "user_id": decision.actor_user_id,
+            "role": _value(decision.actor_role),
+            "session_id": decision.actor_session_id
+        },
+        "intent": {
+            "action": decision.intent_action,
+            "target_resource": decision.intent_target,
+            "parameters": params
+        },
+        "evidence_hash": decision.evidence_hash,
+        "outcome": _value(decision.outcome),
+        "policy_version": decision.policy_version,
+        "permit_token_id": str(decision.permit_token_id) if decision.permit_token_id else None,
+        "previous_hash": decision.previous_hash
+    }
+
+
+def read_head(db: Session, lock: bool = False) -> ChainHead:
+    """
+    Returns the decision chain head (primary-key read). With lock=True the row is
+    locked for the rest of the transaction (SELECT ... FOR UPDATE where supported).
+    Created from the existing chain on first use.
+    """
+    query = db.query(ChainHead).filter(ChainHead.chain == DECISION_CHAIN)
+    if lock:
+        query = query.with_for_update()
+    head = query.first()
+    return head if head is not None else _bootstrap_head(db)
+
+
+def _bootstrap_head(db: Session) -> ChainHead:
+    # One-time lookup for chains written before the head record existed
+    # (their chain_seq is backfilled by migration 9a2c4e7f1b65).
+    last = db.query(DecisionObject.decision_id, DecisionObject.decision_hash, DecisionObject.chain_seq) \
+        .filter(DecisionObject.chain_seq.isnot(None)) \
+        .order_by(desc(DecisionObject.chain_seq)).first()
+    head = ChainHead(
+        chain=DECISION_CHAIN,
+        head_hash=last.decision_hash if last else GENESIS_HASH,
+        head_decision_id=last.decision_id if last else None,
+        length=last.chain_seq if last else 0
+    )
+    try:
+        with db.begin_nested():
+            db.add(head)
+    except IntegrityError:
+        raise ChainConflict("Chain head was created concurrently")
+    logger.info(f"Chain head initialized at {head.head_hash} ({head.length} decisions)")
+    return head
+
+
+def append_decisions(
+    db: Session,
+    builders: List[Callable[[str], DecisionObject]],
+    retries: int = CHAIN_APPEND_RETRIES
+) -> List[DecisionObject]:
+    """
+    Appends decisions to the chain and commits, atomically with the head move
+    (and with the execution outbox rows of APPROVED decisions).
+    Each builder receives the previous_hash to link to and returns the (unsaved)
+    DecisionObject, hash included; builders are chained in order. A builder may
+    return None to contribute nothing (its slot in the result is None).
+
+    The head is advanced with a compare-and-swap on its current hash in the same
+    transaction as the inserts, so two writers can never link to the same parent:
+    the loser rolls back and rebuilds on the new head (up to `retries` times).
+    """
+    for attempt in range(retries + 1):
+        try:
+            return _append_once(db, builders)
+        except ChainConflict as e:
+            db.rollback()
+            metrics.increment("chain_append_conflicts_total")
+            if attempt == retries:
+                raise
+            logger.info(f"Chain append lost the race for the head ({e}); retrying")
+        except Exception:
+            db.rollback()
+            raise
+
+
+def append_decision(db: Session, build: Callable[[str], DecisionObject], retries: int = CHAIN_APPEND_RETRIES) -> DecisionObject:
+    return append_decisions(db, [build], retries=retries)[0]
+
+
+def append_each(
+    db: Session,
+    builders: List[Callable[[str], DecisionObject]],
+    retries: int = CHAIN_APPEND_RETRIES
+) -> Tuple[List[Optional[DecisionObject]], Dict[int, Exception]]:
+    """
+    Like append_decisions, but a builder that raises is left out of the chain
+    instead of aborting the append. Returns the decisions (None where left out)
+    and the builder errors by index. Commit failures still raise.
+    """
+    errors: Dict[int, Exception] = {}
+
+    def guarded(i: int, build: Callable[[str], DecisionObject]) -> Callable[[str], Optional[DecisionObject]]:
+        def run(previous_hash: str) -> Optional[DecisionObject]:
+            try:
+                decision = build(previous_hash)
+            except Exception as e:
+                errors[i] = e
+                return None
+            errors.pop(i, None)
+            return decision
+        return run
+
+    decisions = append_decisions(db, [guarded(i, build) for i, build in enumerate(builders)], retries=retries)
+    return decisions, errors
+
+
+def _append_once(db: Session, builders: List[Callable[[str], DecisionObject]]) -> List[DecisionObject]:
+    head = read_head(db, lock=True)
+
+    previous = head.head_hash
+    length = head.length
+    appended = []
+    for build in builders:
+        decision = build(previous)
+        appended.append(decision)
+        if decision is None:
+            continue
+        # The position is taken from the head it links to, so it is as ordered as the CAS.
+        decision.chain_seq = length + 1
+        db.add(decision)
+        try:
+            db.flush()
+        except IntegrityError as e:
+            # Another writer took this position first: same as losing the CAS below.
+            if "chain_seq" in str(e.orig):
+                raise ChainConflict(f"Position {length + 1} was taken concurrently")
+            raise
+        # The head moves with every insert, so the DB trigger (0007) can check each link against it.
+        moved = db.query(ChainHead) \
+            .filter(ChainHead.chain == DECISION_CHAIN, ChainHead.head_hash == previous, ChainHead.length == length) \
+            .update({
+                ChainHead.head_hash: decision.decision_hash,
+                ChainHead.head_decision_id: decision.decision_id,
+                ChainHead.length: length + 1
+            }, synchronize_session=False)
+        if moved != 1:
+            raise ChainConflict(f"Head is no longer {previous}")
+        # Approved decisions are queued for execution atomically with the append,
+        # and every decision becomes the next leaf of the Merkle mountain range.
+        enqueue_execution(db, decision)
+        append_leaf(db, decision)
+        previous = decision.decision_hash
+        length += 1
+
+    db.commit()
+    return appended
+
+
+class _Draft(NamedTuple):
+    build: Callable[[str], DecisionObject]
+    future: Future
+
+
+class GroupCommitWriter:
+    """
+    Group commit for concurrent appends. Callers queue their drafts; whichever
+    caller gets the commit lock becomes the leader, chains everything queued so
+    far (up to max_batch) in order and commits it in ONE transaction, then hands
+    each caller its own DecisionObject. While a leader commits, new drafts pile
+    up and go out together in the next commit, so commits per second stay flat
+    as concurrency grows.
+
+    A draft whose builder raises is left out of the batch and fails alone; if the
+    batch itself fails to commit, its drafts are retried one by one. Either way a
+    bad draft only fails its own caller. Returned objects are detached and fully loaded.
+    """
+    def __init__(self, session_factory: Callable[..., Session] = SessionLocal, max_batch: int = GROUP_COMMIT_MAX_BATCH):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self._pending: List[_Draft] = []
+        self._pending_lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+
+    def submit(self, build: Callable[[str], DecisionObject]) -> DecisionObject:
+        """
+        Appends one decision (see append_decisions for the builder contract) and
+        blocks until it is committed. Raises whatever the append raised.
+        """
+        draft = _Draft(build, Future())
+        with self._pending_lock:
+            self._pending.append(draft)
+
+        while not draft.future.done():
+            with self._commit_lock:
+                if draft.future.done():
+                    break
+                with self._pending_lock:
+                    batch = self._pending[:self.max_batch]
+                    del self._pending[:self.max_batch]
+                if batch:
+                    self._commit(batch)
+        return draft.future.result()
+
+    def _commit(self, batch: List[_Draft]):
+        start = time.perf_counter()
+        db = self.session_factory(expire_on_commit=False)
+        try:
+            try:
+                decisions, build_errors = append_each(db, [draft.build for draft in batch])
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0].future.set_exception(e)
+                    return
+                logger.warning(f"Group commit of {len(batch)} decisions failed ({e}); committing them one by one")
+                for draft in batch:
+                    self._commit([draft])
+                return
+            for i, (draft, decision) in enumerate(zip(batch, decisions)):
+                if i in build_errors:
+                    draft.future.set_exception(build_errors[i])
+                else:
+                    draft.future.set_result(decision)
+            metrics.increment("chain_group_commits_total")
+            metrics.increment("chain_group_commit_decisions_total", len(batch))
+            metrics.observe("chain_group_commit_seconds", time.perf_counter() - start)
+        finally:
+            db.close()
+
+
+# One writer per API process.
+decision_writer = GroupCommitWriter()
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from vte.api.schema import DecisionRead, EvidenceBundleRead
+from vte.db import SessionLocal
+from vte.orm import DecisionObject, EvidenceBundle
+from vte.core import metrics
+from vte.core.chain import GENESIS_HASH
+from vte.core.evidence_store import resolve_bundle_items
+
+logger = logging.getLogger("vte.core.chain_export")
+
+# Rows per server-side cursor fetch (and per evidence lookup).
+CHAIN_EXPORT_FETCH_SIZE = int(os.getenv("VTE_CHAIN_EXPORT_FETCH_SIZE", "500"))
+# Recently exported bundles remembered to avoid re-emitting shared evidence.
+CHAIN_EXPORT_SEEN_BUNDLES = 10000
+
+_DECISION_COLUMNS = list(DecisionObject.__table__.c)
+
+
+class UnknownChainPosition(LookupError):
+    """
+    The decision_hash to resume from is not in the chain.
+    """
+
+
+class ChainExporter:
+    """
+    Streams the decision chain as NDJSON in chain order (chain_seq),
+    one line per record:
+      {"type": "evidence", "bundle": {...}}      (include_evidence: before the first decision citing it)
+      {"type": "decision", "decision": {...}}
+      {"type": "manifest", ...}                  (last line: counts, head hash, link check)
+
+    Rows come from a server-side cursor CHAIN_EXPORT_FETCH_SIZE at a time and are
+    written out as they arrive, so memory stays flat whatever the chain length.
+    An export can resume after any decision_hash (e.g. the head hash of a previous
+    export's manifest).
+    """
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        include_evidence: bool = False,
+        after_hash: Optional[str] = None,
+        fetch_size: int = CHAIN_EXPORT_FETCH_SIZE
+    ):
+        self.session_factory = session_factory
+        self.include_evidence = include_evidence
+        self.after_hash = after_hash
+        self.fetch_size = fetch_size
+
+    def start_position(self, db: Session):
+        """
+        chain_seq to export after (0 from genesis).
+        Raises UnknownChainPosition for an unknown after_hash.
+        """
+        if not self.after_hash:
+            return 0
+        seq = db.query(DecisionObject.chain_seq) \
+            .filter(DecisionObject.decision_hash == self.after_hash, DecisionObject.chain_seq.isnot(None)).scalar()
+        if seq is None:
+            raise UnknownChainPosition(f"No decision with hash {self.after_hash}")
+        return seq
+
+    def lines(self) -> Iterator[bytes]:
+        db = self.session_factory()
+        try:
+            yield from self._lines(db, self.start_position(db))
+        finally:
+            db.close()
+
+    def _lines(self, db: Session, start) -> Iterator[bytes]:
+        # Rows never appended through the chain (no chain_seq) are not part of it.
+        query = select(*_DECISION_COLUMNS).where(DecisionObject.chain_seq > start).order_by(DecisionObject.chain_seq)
+        result = db.execute(query.execution_options(yield_per=self.fetch_size))
+
+        seen_bundles: "OrderedDict[str, None]" = OrderedDict()
+        previous = self.after_hash or GENESIS_HASH
+        first_hash = None
+        counts = {"decisions": 0, "evidence_bundles": 0, "broken_links": 0}
+
+        for rows in result.partitions():
+            bundles = self._bundles(db, rows, seen_bundles) if self.include_evidence else {}
+            for row in rows:
+                bundle = bundles.pop(row.evidence_hash, None) if row.evidence_hash else None
+                if bundle is not None:
+                    counts["evidence_bundles"] += 1
+                    yield b'{"type":"evidence","bundle":' + bundle + b"}\n"
+
+                if row.previous_hash != previous:
+                    counts["broken_links"] += 1
+                previous = row.decision_hash
+                first_hash = first_hash or row.decision_hash
+                counts["decisions"] += 1
+                yield b'{"type":"decision","decision":' + _decision_json(row) + b"}\n"
+
+        manifest = {
+            "type": "manifest",
+            **counts,
+            "resumed_after": self.after_hash,
+            "first_decision_hash": first_hash,
+            "head_hash": previous,
+        }
+        metrics.increment("chain_export_decisions_total", counts["decisions"])
+        logger.info(f"Chain export finished: {counts['decisions']} decisions, head {previous}")
+        yield json.dumps(manifest).encode("utf-8") + b"\n"
+
+    def _bundles(self, db: Session, rows, seen: "OrderedDict[str, None]") -> Dict[str, bytes]:
+        # One bundle query and one (chunked) item query per fetched page; bundles
+        # already exported recently are skipped.
+        wanted: List[str] = list(dict.fromkeys(
+            row.evidence_hash for row in rows if row.evidence_hash and row.evidence_hash not in seen
+        ))
+        if not wanted:
+            return {}
+
+        serialized = {}
+        bundles = db.query(EvidenceBundle).filter(EvidenceBundle.bundle_hash.in_(wanted)).all()
+        resolve_bundle_items(db, bundles)
+        for bundle in bundles:
+            serialized[bundle.bundle_hash] = EvidenceBundleRead.model_validate(bundle).model_dump_json().encode("utf-8")
+        db.expunge_all()
+
+        for h in wanted:
+            seen[h] = None
+            if len(seen) > CHAIN_EXPORT_SEEN_BUNDLES:
+                seen.popitem(last=False)
+        return serialized
+
+
+def _decision_json(row) -> bytes:
+    decision = row._asdict()
+    # Some early rows hold intent_params as a JSON string.
+    if isinstance(decision["intent_params"], str):
+        decision["intent_params"] = json.loads(decision["intent_params"])
+    return DecisionRead.model_validate(decision).model_dump_json().encode("utf-8")
@@ -0,0 +1,257 @@
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from vte.db import SessionLocal
+from vte.orm import ChainCheckpoint, DecisionObject
+from vte.core import metrics
+from vte.core.canonicalize import canonical_sha256
+from vte.core.chain import DECISION_CHAIN, GENESIS_HASH, hashed_payload
+from vte.core.security import sign_payload, verify_signature
+
+logger = logging.getLogger("vte.core.chain_verify")
+
+# Hashing processes (1 hashes in the calling process).
+CHAIN_VERIFY_WORKERS = int(os.getenv("VTE_CHAIN_VERIFY_WORKERS", str(os.cpu_count() or 1)))
+# Rows per server-side cursor fetch; each fetched page is one hashing task.
+CHAIN_VERIFY_FETCH_SIZE = int(os.getenv("VTE_CHAIN_VERIFY_FETCH_SIZE", "5000"))
+# Problems listed in a report (all of them are counted).
+CHAIN_VERIFY_MAX_REPORTED = 100
+
+_VERIFY_COLUMNS = [
+    DecisionObject.decision_id, DecisionObject.timestamp,
+    DecisionObject.actor_user_id, DecisionObject.actor_role, DecisionObject.actor_session_id,
+    DecisionObject.intent_action, DecisionObject.intent_target, DecisionObject.intent_params,
+    DecisionObject.evidence_hash, DecisionObject.outcome, DecisionObject.policy_version,
+    DecisionObject.permit_token_id, DecisionObject.decision_hash, DecisionObject.previous_hash,
+    DecisionObject.chain_seq,
+]
+
+
+class ChainVerification(NamedTuple):
+    height: int                       # decisions in the chain up to head_hash
+    head_hash: str
+    verified: int                     # decisions hashed and linked by this run
+    resumed_from: int                 # height of the checkpoint the run started from (0: genesis)
+    hash_mismatches: int
+    broken_links: int
+    legacy_hash_mismatches: int       # at or below a links_only (legacy) checkpoint; not failures
+    problems: List[Dict[str, Any]]    # the first CHAIN_VERIFY_MAX_REPORTED, in chain order
+    checkpoint_rejected: Optional[str]
+    checkpoint_written: bool
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.hash_mismatches == 0 and self.broken_links == 0
+
+
+def _hash_payloads(payloads: List[Dict[str, Any]]) -> List[Optional[str]]:
+    # Runs in the worker processes: hashes are independent of each other.
+    hashes = []
+    for payload in payloads:
+        try:
+            hashes.append(canonical_sha256(payload))
+        except (TypeError, ValueError):
+            hashes.append(None)
+    return hashes
+
+
+def _checkpoint_claims(checkpoint: ChainCheckpoint) -> Dict[str, Any]:
+    return {
+        "chain": checkpoint.chain,
+        "height": checkpoint.height,
+        "head_hash": checkpoint.head_hash,
+        "head_decision_id": str(checkpoint.head_decision_id),
+        "links_only": bool(checkpoint.links_only),
+    }
+
+
+class ChainVerifier:
+    """
+    Verifies the decision chain in the database: every decision_hash is recomputed
+    from the stored columns (chain.hashed_payload) and every previous_hash must be
+    the hash of the decision before it, in chain order (chain_seq).
+
+    Rows are streamed from a server-side cursor; each fetched page is hashed in a
+    pool of worker processes while the next pages are read, and only the linkage
+    check runs sequentially, in order, as hashed pages come back.
+
+    A clean run stores a signed ChainCheckpoint (height, head hash). Later runs
+    start after the latest checkpoint whose signature, head decision and height
+    still check out, so they only verify the tail; full=True ignores checkpoints.
+
+    Decisions appended before hashes were recomputable from the stored columns do
+    not rehash. seal_legacy=True accepts them once, at upgrade: their links are
+    still checked, hash mismatches are counted as legacy_hash_mismatches, and the
+    checkpoint written is marked links_only. Full runs report mismatches at or
+    below that checkpoint as legacy too; anything after it must rehash.
+    """
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int = CHAIN_VERIFY_WORKERS,
+        fetch_size: int = CHAIN_VERIFY_FETCH_SIZE,
+        full: bool = False,
+        seal_legacy: bool = False
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.fetch_size = fetch_size
+        self.full = full
+        self.seal_legacy = seal_legacy
+
+    def verify(self) -> ChainVerification:
+        start = time.perf_counter()
+        db = self.session_factory()
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            checkpoint, position, rejected = (None, 0, None) if self.full else self._resume_point(db)
+            height = checkpoint.height if checkpoint else 0
+            previous = checkpoint.head_hash if checkpoint else GENESIS_HASH
+            last_id = checkpoint.head_decision_id if checkpoint else None
+            legacy_height = self._legacy_height(db)
+            counts = {"verified": 0, "hash_mismatches": 0, "broken_links": 0, "legacy_hash_mismatches": 0}
+            problems: List[Dict[str, Any]] = []
+
+            def problem(kind: str, row, **details):
+                counts[kind] += 1
+                if len(problems) < CHAIN_VERIFY_MAX_REPORTED:
+                    problems.append({"type": kind, "height": height, "decision_id": str(row.decision_id), **details})
+
+            # Pages being hashed, oldest first; at most two per worker in flight.
+            in_flight: "deque[tuple]" = deque()
+
+            def check_oldest():
+                nonlocal height, previous, last_id
+                rows, hashed = in_flight.popleft()
+                for row, computed in zip(rows, hashed.result()):
+                    height += 1
+                    if computed != row.decision_hash:
+                        if self.seal_legacy or row.chain_seq <= legacy_height:
+                            counts["legacy_hash_mismatches"] += 1
+                        else:
+                            problem("hash_mismatches", row, stored=row.decision_hash, computed=computed)
+                    if row.previous_hash != previous:
+                        problem("broken_links", row, previous_hash=row.previous_hash, expected=previous)
+                    previous = row.decision_hash
+                    last_id = row.decision_id
+                    counts["verified"] += 1
+
+            for rows in self._pages(db, position):
+                payloads = [hashed_payload(row) for row in rows]
+                if executor is not None:
+                    hashed = executor.submit(_hash_payloads, payloads)
+                else:
+                    hashed = Future()
+                    hashed.set_result(_hash_payloads(payloads))
+                in_flight.append((rows, hashed))
+                if len(in_flight) > 2 * max(self.workers, 1):
+                    check_oldest()
+            while in_flight:
+                check_oldest()
+
+            report = ChainVerification(
+                height=height,
+                head_hash=previous,
+                verified=counts["verified"],
+                resumed_from=checkpoint.height if checkpoint else 0,
+                hash_mismatches=counts["hash_mismatches"],
+                broken_links=counts["broken_links"],
+                legacy_hash_mismatches=counts["legacy_hash_mismatches"],
+                problems=problems,
+                checkpoint_rejected=rejected,
+                checkpoint_written=False,
+                seconds=0.0
+            )
+            if report.ok and counts["verified"]:
+                self._write_checkpoint(db, height, previous, last_id, links_only=self.seal_legacy)
+                report = report._replace(checkpoint_written=True)
+            db.rollback()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            db.close()
+
+        report = report._replace(seconds=time.perf_counter() - start)
+        metrics.increment("chain_verify_decisions_total", report.verified)
+        metrics.observe("chain_verify_seconds", report.seconds)
+        metrics.set_gauge("chain_verify_problems", report.hash_mismatches + report.broken_links)
+        log = logger.info if report.ok else logger.error
+        log(
+            f"Chain verified up to height {report.height} ({report.verified} decisions from height "
+            f"{report.resumed_from} in {report.seconds:.1f}s): {report.hash_mismatches} hash mismatches, "
+            f"{report.broken_links} broken links, {report.legacy_hash_mismatches} legacy hash mismatches"
+        )
+        return report
+
+    def _pages(self, db: Session, position: int):
+        # Rows never appended through the chain (no chain_seq) are not part of it.
+        query = select(*_VERIFY_COLUMNS).where(DecisionObject.chain_seq > position).order_by(DecisionObject.chain_seq)
+        result = db.execute(query.execution_options(yield_per=self.fetch_size))
+        yield from result.partitions()
+
+    def _resume_point(self, db: Session):
+        """
+        (checkpoint, chain_seq to resume after, None) for the latest usable
+        checkpoint, or (None, 0, reason) if the latest one fails its checks.
+        """
+        checkpoint = db.query(ChainCheckpoint) \
+            .filter(ChainCheckpoint.chain == DECISION_CHAIN) \
+            .order_by(ChainCheckpoint.height.desc(), ChainCheckpoint.id.desc()).first()
+        if checkpoint is None:
+            return None, 0, None
+
+        reason = None
+        head = db.query(DecisionObject.chain_seq, DecisionObject.decision_hash) \
+            .filter(DecisionObject.decision_id == checkpoint.head_decision_id).first()
+        if not verify_signature(_checkpoint_claims(checkpoint), checkpoint.signature):
+            reason = "bad signature"
+        elif head is None or head.decision_hash != checkpoint.head_hash or head.chain_seq != checkpoint.height:
+            reason = "head decision missing or changed"
+        else:
+            # Rows inserted into or deleted from the verified prefix change its length.
+            prefix = db.query(func.count(DecisionObject.decision_id)).filter(DecisionObject.chain_seq <= head.chain_seq).scalar()
+            if prefix != checkpoint.height:
+                reason = f"prefix holds {prefix} decisions, checkpoint says {checkpoint.height}"
+
+        if reason is not None:
+            metrics.increment("chain_verify_checkpoints_rejected_total")
+            logger.error(f"Checkpoint {checkpoint.id} at height {checkpoint.height} rejected ({reason}); verifying from genesis")
+            return None, 0, reason
+        return checkpoint, head.chain_seq, None
+
+    def _legacy_height(self, db: Session) -> int:
+        # Height sealed by the latest links_only checkpoint that still checks out.
+        checkpoints = db.query(ChainCheckpoint) \
+            .filter(ChainCheckpoint.chain == DECISION_CHAIN, ChainCheckpoint.links_only.is_(True)) \
+            .order_by(ChainCheckpoint.height.desc(), ChainCheckpoint.id.desc())
+        for checkpoint in checkpoints:
+            head = db.query(DecisionObject.chain_seq, DecisionObject.decision_hash) \
+                .filter(DecisionObject.decision_id == checkpoint.head_decision_id).first()
+            if verify_signature(_checkpoint_claims(checkpoint), checkpoint.signature) \
+                    and head is not None and head.decision_hash == checkpoint.head_hash and head.chain_seq == checkpoint.height:
+                return checkpoint.height
+            logger.error(f"Legacy checkpoint {checkpoint.id} at height {checkpoint.height} does not check out; ignored")
+        return 0
+
+    def _write_checkpoint(self, db: Session, height: int, head_hash: str, head_decision_id, links_only: bool = False):
+        checkpoint = ChainCheckpoint(
+            chain=DECISION_CHAIN,
+            height=height,
+            head_hash=head_hash,
+            head_decision_id=head_decision_id,
+            links_only=links_only,
+            signature=""
+        )
+        checkpoint.signature = sign_payload(_checkpoint_claims(checkpoint))
+        db.add(checkpoint)
+        db.commit()
+        logger.info(f"Chain {'legacy (links only) ' if links_only else ''}checkpoint written at height {height} ({head_hash})")
+
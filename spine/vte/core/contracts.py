@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger("vte.core.contracts")
+
+# How often (seconds) a registry re-stats its files to look for changes.
+RELOAD_CHECK_INTERVAL_SECONDS = float(os.getenv("VTE_CONTRACT_RELOAD_INTERVAL", "2"))
+
+
+class TransitionBinding(NamedTuple):
+    """
+    A single compiled trigger entry: the owning contract, the transition
+    definition and the side effects the contract declares for that trigger.
+    """
+    contract: Dict[str, Any]
+    transition: Dict[str, Any]
+    side_effects: Tuple[str, ...]
+
+
+class ContractIndex:
+    """
+    Compiled view over a set of feature contracts.
+    Maps trigger -> candidate TransitionBindings so that contract lookup and
+    transition validation are hash lookups instead of scans over every contract.
+    """
+    def __init__(self, contracts: Dict[str, Any]):
+        self.contracts = contracts
+        self._by_trigger: Dict[str, Tuple[TransitionBinding, ...]] = self._compile(contracts)
+
+    @staticmethod
+    def _compile(contracts: Dict[str, Any]) -> Dict[str, Tuple[TransitionBinding, ...]]:
+        """
+        Builds the trigger index. Candidates keep contract/transition declaration order,
+        so the first match is the same one the old linear scan would have returned.
+        """
+        index: Dict[str, List[TransitionBinding]] = {}
+        for feature_id, contract in contracts.items():
+            side_effects = contract.get("side_effects", {})
+            for transition in contract.get("transitions", []):
+                trigger = transition.get("trigger")
+                if not trigger:
+                    logger.warning(f"Contract {feature_id} has a transition without a trigger. Ignored.")
+                    continue
+
+                candidates = index.setdefault(trigger, [])
+                if candidates and candidates[0].contract is not contract:
+                    logger.warning(
+                        f"Trigger {trigger} is declared by {candidates[0].contract.get('feature_id')} "
+                        f"and {feature_id}. The first contract wins."
+                    )
+                candidates.append(TransitionBinding(
+                    contract=contract,
+                    transition=transition,
+                    side_effects=tuple(side_effects.get(trigger, []))
+                ))
+        return {trigger: tuple(bindings) for trigger, bindings in index.items()}
+
+    def __len__(self) -> int:
+        return len(self._by_trigger)
+
+    def __contains__(self, trigger: str) -> bool:
+        return trigger in self._by_trigger
+
+    def candidates(self, trigger: str, contract: Optional[Dict[str, Any]] = None) -> Tuple[TransitionBinding, ...]:
+        """
+        Returns all bindings for a trigger, optionally restricted to one contract.
+        """
+        bindings = self._by_trigger.get(trigger, ())
+        if contract is None:
+            return bindings
+        feature_id = contract.get("feature_id")
+        return tuple(b for b in bindings if b.contract.get("feature_id") == feature_id)
+
+    def find_contract(self, trigger: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the contract that handles this trigger, or None.
+        """
+        bindings = self._by_trigger.get(trigger)
+        return bindings[0].contract if bindings else None
+
+
+def validate_feature_contract(data: Dict[str, Any]) -> None:
+    """
+    Structural checks for a vte_feature_scope_v1 contract. Raises ValueError.
+    """
+    if not isinstance(data.get("feature_id"), str) or not data["feature_id"]:
+        raise ValueError("Missing 'feature_id'")
+    transitions = data.get("transitions", [])
+    if not isinstance(transitions, list):
+        raise ValueError("'transitions' must be a list")
+    for t in transitions:
+        missing = [k for k in ("trigger", "from", "to") if k not in t]
+        if missing:
+            raise ValueError(f"Transition {t} missing {missing}")
+    side_effects = data.get("side_effects", {})
+    if not isinstance(side_effects, dict) or not all(isinstance(v, list) for v in side_effects.values()):
+        raise ValueError("'side_effects' must map trigger -> list of effects")
+
+
+class ContractSnapshot(NamedTuple):
+    """
+    One immutable generation of a registry. Callers hold on to the snapshot they
+    started with, so a reload never changes contracts under an in-flight execution.
+    """
+    contracts: Dict[str, Any]
+    index: Optional[ContractIndex]
+    fingerprint: Tuple[Tuple[str, int, int], ...]
+    loaded_at: float
+
+
+class ContractRegistry:
+    """
+    Process-wide, hot-reloadable cache of JSON contracts under a directory.
+    Files are parsed, validated and (optionally) compiled once; afterwards the
+    directory is re-stat'ed at most every `check_interval` seconds and a new
+    snapshot is swapped in only when a file's mtime/size changed.
+    """
+    def __init__(
+        self,
+        root: Path,
+        pattern: str,
+        key: Callable[[Path, Dict[str, Any]], Optional[str]],
+        validate: Optional[Callable[[Dict[str, Any]], None]] = None,
+        compile_index: bool = False,
+        check_interval: float = RELOAD_CHECK_INTERVAL_SECONDS
+    ):
+        self.root = Path(root)
+        self.pattern = pattern
+        self.key = key
+        self.validate = validate
+        self.compile_index = compile_index
+        self.check_interval = check_interval
+
+        self._snapshot: Optional[ContractSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> ContractSnapshot:
+        """
+        Returns the current snapshot, loading on first use and picking up file
+        changes once the check interval has elapsed.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._reload_locked(force=True)
+                return self._snapshot
+
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            # Only one thread re-stats; the others keep serving the current snapshot.
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._reload_locked(force=False)
+                finally:
+                    self._lock.release()
+        return self._snapshot
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-reads the directory now. Returns True if a new snapshot was swapped in.
+        """
+        with self._lock:
+            return self._reload_locked(force=force)
+
+    def _fingerprint(self) -> Tuple[Tuple[str, int, int], ...]:
+        entries = []
+        for path in sorted(self.root.glob(self.pattern)):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    def _reload_locked(self, force: bool) -> bool:
+        self._checked_at = time.monotonic()
+        fingerprint = self._fingerprint()
+        current = self._snapshot
+        if not force and current is not None and current.fingerprint == fingerprint:
+            return False
+
+        contracts: Dict[str, Any] = {}
+        failed = False
+        for path_str, _, _ in fingerprint:
+            path = Path(path_str)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if self.validate:
+                    self.validate(data)
+                name = self.key(path, data)
+                if name:
+                    contracts[name] = data
+                    logger.info(f"Loaded Contract: {name}")
+            except Exception as e:
+                failed = True
+                logger.error(f"Failed to load contract {path}: {e}")
+
+        if failed and current is not None:
+            # Likely a partially written file. Keep serving the last good snapshot
+            # and retry on the next check.
+            logger.warning(f"Contract reload under {self.root} failed. Keeping previous snapshot.")
+            return False
+
+        index = ContractIndex(contracts) if self.compile_index else None
+        if index is not None:
+            logger.info(f"Compiled {len(index)} triggers from {len(contracts)} contracts")
+        self._snapshot = ContractSnapshot(
+            contracts=contracts,
+            index=index,
+            fingerprint=fingerprint,
+            loaded_at=time.time()
+        )
+        if current is not None:
+            logger.info(f"Contract registry {self.root} reloaded ({len(contracts)} contracts)")
+        return True
@@ -1,55 +1,99 @@
 import json
 import logging
 import uuid
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from vte.orm import DecisionObject, PermitToken, Property, Unit
 from vte.core.integrity_verifier import IntegrityVerifier
 from vte.core.permits import PermitIssuer
+from vte.core.contracts import ContractIndex, ContractRegistry, ContractSnapshot, TransitionBinding, validate_feature_contract
+from vte.core.side_effects import effect_handlers, invoke_handler, run_external_effects, traced
+from vte.core.state_cache import target_states
+from vte.core.tracing import Span, tracer
 from vte.api.schema import OutcomeEnum
 
 logger = logging.getLogger("vte.core.engine")
 
 CONTRACTS_DIR = Path("C:/Bintloop/VTE/contracts/features")
 
+# Max decisions loaded / committed together by execute_decisions (keeps IN lists under driver limits).
+BATCH_CHUNK_SIZE = 500
+
+# Shared by every WorkflowEngine in the process; reloads when contract files change.
+feature_contracts = ContractRegistry(
+    CONTRACTS_DIR,
+    "*/*scope_contract*.json",
+    key=lambda path, data: data.get("feature_id"),
+    validate=validate_feature_contract,
+    compile_index=True
+)
+
+class EffectDecision(NamedTuple):
+    """
+    What an external side effect sees of its decision: plain values copied on the
+    engine's thread before commit. External effects run on pool threads after
+    commit, where the ORM instance is expired and its Session must not be used.
+    """
+    decision_id: uuid.UUID
+    decision_hash: str
+    intent_action: str
+    intent_target: Optional[str]
+    intent_params: Dict[str, Any]
+    actor_user_id: str
+
+    @classmethod
+    def of(cls, decision: DecisionObject) -> "EffectDecision":
+        params = decision.intent_params or {}
+        if isinstance(params, str):
+            # JSON column may hold an encoded object (legacy writers)
+            params = json.loads(params)
+        return cls(
+            decision_id=decision.decision_id,
+            decision_hash=decision.decision_hash,
+            intent_action=decision.intent_action,
+            intent_target=decision.intent_target,
+            intent_params=params,
+            actor_user_id=decision.actor_user_id
+        )
+
 class WorkflowEngine:
     def __init__(self, db: Session):
         self.db = db
         self.verifier = IntegrityVerifier()
         self.permit_issuer = PermitIssuer(db)
-        self.contracts = self._load_contracts()
+        snapshot = feature_contracts.snapshot()
+        self.contracts = self._load_contracts(snapshot)
+        # The registry compiles each snapshot once; a contract set supplied any
+        # other way (tests) is compiled for this engine.
+        if self.contracts is snapshot.contracts and snapshot.index is not None:
+            self.index = snapshot.index
+        else:
+            self.index = ContractIndex(self.contracts)
 
-    def _load_contracts(self) -> Dict[str, Any]:
+        # Batch mode (execute_decisions): target states come from a prefetched view instead of one query each.
+        self._state_view: Optional[Dict[Tuple[str, str], str]] = None
+        # Target states written by the current (uncommitted) transaction, in write order.
+        # Published to the shared state cache on commit and invalidated on rollback.
+        self._dirty_states: List[Tuple[Tuple[str, str], str]] = []
+        # External side effects queued until the current transaction commits:
+        # (decision snapshot, binding, effect, results list, the decision's execution span)
+        self._pending_external: List[Tuple[EffectDecision, TransitionBinding, str, List[str], Optional[Span]]] = []
+
+    def _load_contracts(self, snapshot: ContractSnapshot) -> Dict[str, Any]:
         """
-        Loads all feature contracts into memory.
+        Returns the feature contract set of the shared registry's current snapshot.
+        The engine keeps this snapshot for its whole lifetime.
         """
-        contracts = {}
-        # Recursive glob or specific bundle list
-        # MVP: Load vte_inventory_v1 explicitly or via glob
-        for schema_path in CONTRACTS_DIR.glob("*/*.json"):
-            if "scope_contract" in schema_path.name:
-                try:
-                    with open(schema_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        feature_id = data.get("feature_id")
-                        if feature_id:
-                            contracts[feature_id] = data
-                            logger.info(f"Loaded Contract: {feature_id}")
-                except Exception as e:
-                    logger.error(f"Failed to load contract {schema_path}: {e}")
-        return contracts
+        return snapshot.contracts
 
     def find_contract_for_trigger(self, trigger: str) -> Optional[Dict[str, Any]]:
         """
         Finds the contract that handles this trigger.
         """
-        for contract in self.contracts.values():
-            for transition in contract.get("transitions", []):
-                if transition.get("trigger") == trigger:
-                    return contract
-        return None
+        return self.index.find_contract(trigger)
 
     def execute_decision(self, decision_id: uuid.UUID) -> Dict[str, Any]:
         """
@@ -59,135 +103,340 @@ class WorkflowEngine:
         3. Validate State Transition.
         4. Issue Permit.
         5. Execute Side Effects.
+
+        Unit of Work: the permit and all DB projections are written in ONE transaction
+        and committed once. If any of them fails, everything is rolled back (no permit,
+        no partial projection) and the error is raised. External effects (AppFolio,
+        email) cannot be rolled back, so they run only after that commit succeeded.
+
+        Every stage is recorded as a span under one 'execute_decision' span
+        carrying decision_id, trigger and outcome (see vte.core.tracing).
+        """
+        with tracer.span("execute_decision", decision_id=str(decision_id)) as span:
+            with tracer.span("decision.load"):
+                decision = self.db.query(DecisionObject).filter(DecisionObject.decision_id == decision_id).first()
+            if not decision:
+                span.set_attribute("outcome", "not_found")
+                raise ValueError(f"Decision {decision_id} not found")
+            span.set_attribute("trigger", decision.intent_action)
+
+            try:
+                result = self._execute_loaded(decision)
+                with tracer.span("commit"):
+                    self.db.commit()
+            except Exception:
+                span.set_attribute("outcome", "failed")
+                self.db.rollback()
+                self._pending_external.clear()
+                self._discard_states()
+                raise
+
+            span.set_attribute("outcome", result["status"])
+            self._publish_states()
+            self._run_external_effects()
+        return result
+
+    def execute_decisions(self, decision_ids: List[uuid.UUID]) -> List[Dict[str, Any]]:
+        """
+        Batch Entry Point (backfills / catch-up runs).
+        Executes decisions in the given order, BATCH_CHUNK_SIZE at a time:
+        one query loads the chunk, bulk IN queries resolve target states,
+        and permits + projections for the whole chunk are committed together.
+        Each decision runs in its own SAVEPOINT, so one failure does not
+        discard the rest of the chunk.
+        Returns one result per id, in input order.
         """
-        decision = self.db.query(DecisionObject).filter(DecisionObject.decision_id == decision_id).first()
-        if not decision:
-            raise ValueError(f"Decision {decision_id} not found")
+        results = []
+        for start in range(0, len(decision_ids), BATCH_CHUNK_SIZE):
+            results.extend(self._execute_chunk(decision_ids[start:start + BATCH_CHUNK_SIZE]))
+        return results
+
+    def _execute_chunk(self, decision_ids: List[uuid.UUID]) -> List[Dict[str, Any]]:
+        ids = [d if isinstance(d, uuid.UUID) else uuid.UUID(str(d)) for d in decision_ids]
+        decisions = {
+            d.decision_id: d
+            for d in self.db.query(DecisionObject).filter(DecisionObject.decision_id.in_(ids)).all()
+        }
+
+        results = []
+        self._state_view = self._prefetch_states(decisions.values())
+        try:
+            for decision_id in ids:
+                decision = decisions.get(decision_id)
+                if not decision:
+                    results.append({"decision_id": str(decision_id), "status": "failed", "error": f"Decision {decision_id} not found"})
+                    continue
+
+                saved_states = self._saved_states(decision.intent_target)
+                pending_mark = len(self._pending_external)
+                dirty_mark = len(self._dirty_states)
+                with tracer.span("execute_decision", decision_id=str(decision_id), trigger=decision.intent_action) as span:
+                    try:
+                        with self.db.begin_nested():
+                            result = self._execute_loaded(decision)
+                    except Exception as e:
+                        logger.error(f"Batch execution failed for {decision_id}: {e}")
+                        for key, _ in self._dirty_states[dirty_mark:]:
+                            self._state_view.pop(key, None)
+                        self._state_view.update(saved_states)
+                        del self._pending_external[pending_mark:]
+                        self._discard_states(dirty_mark)
+                        result = {"status": "failed", "error": str(e)}
+                        span.status, span.error = "error", str(e)
+                    span.set_attribute("outcome", result["status"])
+                results.append({"decision_id": str(decision_id), **result})
+
+            with tracer.span("commit", decisions=len(ids)):
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self._pending_external.clear()
+            self._discard_states()
+            raise
+        finally:
+            self._state_view = None
+
+        self._publish_states()
+        self._run_external_effects()
+        return results
 
+    def _execute_loaded(self, decision: DecisionObject) -> Dict[str, Any]:
         # 1. Integrity Check (Kernel)
         # We assume Evidence was verified at ingestion, but we verify Decision Integrity here
-        # TODO: self.verifier.verify_decision_integrity(decision)
+        with tracer.span("integrity.check"):
+            pass # TODO: self.verifier.verify_decision_integrity(decision)
 
         # 2. Identify Contract
         action = decision.intent_action
-        contract = self.find_contract_for_trigger(action)
+        with tracer.span("contract.lookup") as span:
+            contract = self.find_contract_for_trigger(action)
+            span.set_attribute("feature_id", contract["feature_id"] if contract else None)
         if not contract:
             logger.warning(f"No contract found for action {action}. execution skipped (or legacy fallback).")
             return {"status": "skipped", "reason": "no_contract"}
 
         # 3. Validate Transition (State Machine)
-        transition = self._validate_transition(decision, contract)
+        with tracer.span("transition.validate"):
+            binding = self._validate_transition(decision, contract)
+
+            # Fail closed before any write if the contract names an effect nobody implements.
+            unknown = [e for e in binding.side_effects if e not in effect_handlers]
+            if unknown:
+                raise ValueError(f"No handler registered for side effect(s) {unknown} in {contract['feature_id']}")
         
         # 4. Issue Permit (Kernel)
-        permit = self.permit_issuer.issue_permit(decision)
+        with tracer.span("permit.issue"):
+            permit = self.permit_issuer.issue_permit(decision, commit=False)
         
         # 5. Execute Side Effects
-        result = self._execute_side_effects(decision, transition, contract)
+        result = self._execute_side_effects(decision, binding)
         
         return {"status": "success", "permit_id": str(permit.token_id), "side_effects": result}
 
-    def _validate_transition(self, decision: DecisionObject, contract: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_transition(self, decision: DecisionObject, contract: Dict[str, Any]) -> TransitionBinding:
         """
         Checks if the transition is allowed given the current state of the target entity.
-        Returns the transition definition.
+        Returns the compiled binding (transition definition + side effects).
         """
         action = decision.intent_action
         target_id = decision.intent_target
         
-        # Find transition definition
-        transition_def = None
-        for t in contract["transitions"]:
-            if t["trigger"] == action:
-                transition_def = t
-                break
-        
-        if not transition_def:
+        # Find transition definition(s) for this trigger in the compiled index
+        bindings = self.index.candidates(action, contract)
+        if not bindings:
             raise ValueError(f"Action {action} is not a valid transition in {contract['feature_id']}")
 
-        # Resolve Current State of Target
-        current_state = self._get_current_state(target_id, transition_def["target_type"])
-        
-        # Check 'from' state
-        allowed_from = transition_def["from"]
-        if allowed_from != "*" and current_state != allowed_from:
-             raise ValueError(f"Invalid Transition. Current State: {current_state}, Action requires: {allowed_from}")
-             
-        # Check Logic/Invariants (Stub)
-        
-        return transition_def
+        # Resolve Current State of Target (once per target type) and pick the
+        # first transition whose 'from' state matches.
+        states: Dict[str, str] = {}
+        for binding in bindings:
+            target_type = binding.transition["target_type"]
+            if target_type not in states:
+                states[target_type] = self._get_current_state(target_id, target_type)
+
+            allowed_from = binding.transition["from"]
+            if allowed_from == "*" or states[target_type] == allowed_from:
+                # Check Logic/Invariants (Stub)
+                return binding
+
+        first = bindings[0].transition
+        raise ValueError(f"Invalid Transition. Current State: {states[first['target_type']]}, Action requires: {first['from']}")
+
+    def _prefetch_states(self, decisions: Iterable[DecisionObject]) -> Dict[Tuple[str, str], str]:
+        """
+        Resolves the current state of every target in a batch with one IN query per target type.
+        Targets already in the shared state cache are not queried.
+        """
+        targets: Dict[str, set] = {}
+        for decision in decisions:
+            try:
+                target = uuid.UUID(decision.intent_target)
+            except (TypeError, ValueError):
+                continue
+            for binding in self.index.candidates(decision.intent_action):
+                target_type = binding.transition.get("target_type")
+                if target_type in ("property", "unit"):
+                    targets.setdefault(target_type, set()).add(target)
+
+        view: Dict[Tuple[str, str], str] = {}
+        for target_type, ids in targets.items():
+            missing = []
+            for target in ids:
+                cached = target_states.get(target_type, str(target))
+                if cached is not None:
+                    view[(target_type, str(target))] = cached
+                else:
+                    view[(target_type, str(target))] = "VOID"
+                    missing.append(target)
+            if not missing:
+                continue
+
+            if target_type == "property":
+                rows = self.db.query(Property.property_id).filter(Property.property_id.in_(missing)).all()
+                rows = [(pid, "ACTIVE") for (pid,) in rows]
+            else:
+                rows = self.db.query(Unit.unit_id, Unit.status).filter(Unit.unit_id.in_(missing)).all()
+            for target, state in rows:
+                view[(target_type, str(target))] = state
+                target_states.put(target_type, str(target), state)
+        return view
+
+    def _saved_states(self, target_id: str) -> Dict[Tuple[str, str], str]:
+        """
+        Copies the batch view entries for one target, so they can be restored if its decision rolls back.
+        """
+        try:
+            key = str(uuid.UUID(target_id))
+        except (TypeError, ValueError):
+            return {}
+        return {k: self._state_view[k] for k in (("property", key), ("unit", key)) if k in self._state_view}
+
+    def _remember_state(self, target_type: str, target_id: uuid.UUID, state: str):
+        """
+        Called by projections that change a target's state (not yet committed).
+        """
+        key = (target_type, str(target_id))
+        self._dirty_states.append((key, state))
+        if self._state_view is not None:
+            self._state_view[key] = state
+
+    def _publish_states(self):
+        """
+        After commit: the states this transaction wrote are now the truth.
+        """
+        dirty, self._dirty_states = self._dirty_states, []
+        for (target_type, target_id), state in dirty:
+            target_states.put(target_type, target_id, state)
+
+    def _discard_states(self, mark: int = 0):
+        """
+        After rollback: forget the states written since `mark` (default: all).
+        Touched targets are dropped from the cache and from the journal, so the
+        next read goes to the DB.
+        """
+        keys = {key for key, _ in self._dirty_states[mark:]}
+        self._dirty_states = [(key, state) for key, state in self._dirty_states[:mark] if key not in keys]
+        for key in keys:
+            target_states.invalidate(*key)
 
     def _get_current_state(self, target_id: str, target_type: str) -> str:
         """
-        Resolves current state from DB based on type.
+        Resolves current state based on type: batch view, then the shared
+        state cache, then the DB (read-through).
         """
         if not target_id: 
             return "VOID" # or PROPOSED?
+
+        if target_type not in ("property", "unit"):
+            return "UNKNOWN"
+
+        try:
+            # Ensure UUID compatibility
+            tid = uuid.UUID(target_id)
+        except ValueError:
+            return "VOID" # Invalid UUID
+        key_id = str(tid)
+
+        if self._state_view is not None:
+            cached = self._state_view.get((target_type, key_id))
+            if cached is not None:
+                return cached
+
+        cached = target_states.get(target_type, key_id)
+        if cached is not None:
+            return cached
             
         if target_type == "property":
             # For REGISTER, target might not exist yet.
-            try:
-                # Ensure UUID compatibility
-                pid = uuid.UUID(target_id)
-                prop = self.db.query(Property).filter(Property.property_id == pid).first()
-            except ValueError:
-                return "VOID" # Invalid UUID
-                
-            return "ACTIVE" if prop else "VOID"
+            prop = self.db.query(Property.property_id).filter(Property.property_id == tid).first()
+            state = "ACTIVE" if prop else "VOID"
+        else:
+            unit = self.db.query(Unit.status).filter(Unit.unit_id == tid).first()
+            state = unit.status if unit else "VOID"
 
-        elif target_type == "unit":
-            try:
-                # Ensure UUID compatibility
-                uid = uuid.UUID(target_id)
-                unit = self.db.query(Unit).filter(Unit.unit_id == uid).first()
-            except ValueError:
-                return "VOID"
-                
-            return unit.status if unit else "VOID"
-            
-        return "UNKNOWN"
+        if state != "VOID":
+            target_states.put(target_type, key_id, state)
+        return state
 
-    def _execute_side_effects(self, decision: DecisionObject, transition: Dict[str, Any], contract: Dict[str, Any]) -> List[str]:
+    def _execute_side_effects(self, decision: DecisionObject, binding: TransitionBinding) -> List[str]:
         """
-        Executes the side effects defined in the contract.
+        Executes the side effects defined in the contract through the handler registry.
+        Transactional handlers (DB projections) run now, inside the decision's transaction.
+        External handlers are queued and run by _run_external_effects after commit, with
+        an EffectDecision snapshot instead of the ORM instance.
+        Returns the decision's side_effects list: the transactional effects now, the
+        successful external ones appended after commit.
         """
         results = []
-        action = decision.intent_action
-        defined_effects = contract.get("side_effects", {}).get(action, [])
+        span = tracer.current()
+        snapshot = None
         
-        for effect in defined_effects:
+        for effect in binding.side_effects:
+            handler = effect_handlers.get(effect)
+            if not handler.transactional:
+                snapshot = snapshot or EffectDecision.of(decision)
+                self._pending_external.append((snapshot, binding, effect, results, span))
+                continue
+
             logger.info(f"Executing Side Effect: {effect}")
-            
-            if effect == "db_projection_property":
-                 self._project_property(decision)
-                 results.append("db_projection_property")
-            elif effect == "db_projection_unit":
-                 self._project_unit(decision)
-                 results.append("db_projection_unit")
-            elif effect == "db_projection_unit_status":
-                 self._project_unit_status(decision, transition["to"])
-                 results.append("db_projection_unit_status")
-            elif effect == "appfolio_sync":
-                 self._execute_appfolio_sync(decision)
-                 results.append("appfolio_sync")
-            elif effect == "db_update_tenant_info":
-                 self._project_unit_tenant_info(decision)
-                 results.append("db_update_tenant_info")
-            elif effect == "email_notification_welcome":
-                 pass
-            else:
-                logger.warning(f"Unknown side effect: {effect}")
+            invoke_handler(traced(handler, span), self, decision, binding)
+            results.append(effect)
                 
         return results
 
-    def _execute_appfolio_sync(self, decision: DecisionObject):
+    def _run_external_effects(self):
+        """
+        Runs the external side effects queued by committed decisions (concurrently where
+        the handler is independent). Successful effects are appended to the owning
+        decision's side_effects list after its transactional effects, so the list
+        reads: transactional effects in contract order, then external effects in
+        contract order (not the contract's interleaving).
+        """
+        pending, self._pending_external = self._pending_external, []
+        if not pending:
+            return
+
+        calls = []
+        for decision, binding, effect, _, span in pending:
+            logger.info(f"Executing Side Effect: {effect}")
+            calls.append((traced(effect_handlers.get(effect), span), (self, decision, binding)))
+
+        for (_, _, effect, results, _), ok in zip(pending, run_external_effects(calls)):
+            if ok:
+                results.append(effect)
+
+    def _execute_appfolio_sync(self, decision: EffectDecision) -> Future:
         """
         Executes 'write_note' or other AppFolio actions.
+        Write-backs are handed to the coalescer, which groups them per tenant page
+        (one navigation per group) on a warm pooled browser session.
+        Returns a Future resolving to True/False for this decision.
         """
-        from vte.adapters.appfolio.client import AppFolioClient
+        from vte.adapters.appfolio.coalescer import appfolio_coalescer
         
         action = decision.intent_action
         target = decision.intent_target
-        params = decision.intent_params or {}
+        params = decision.intent_params
         
         # We map generic intent to AppFolio actions
         # In this specific case, the 'action' might be 'WRITE_NOTE' if the contract says so,
@@ -197,29 +446,24 @@ class WorkflowEngine:
         # Legacy/Contract Mapping:
         # If action is WRITE_NOTE (from contract) or write_note (legacy)
         
-        logger.info("Executing AppFolio Sync...")
-        client = AppFolioClient() 
-        try:
-            client.start()
-            if not client.navigate_to_tenant(target):
-                 logger.error("AppFolio Navigation Failed")
-                 return
-            
-            # Helper to determine content based on action
-            content = params.get("content", "")
+        # Helper to determine content based on action
+        content = params.get("content", "")
+        dry_run = params.get("dry_run", False)
+
+        def write_back(client) -> bool:
             if action == "REGISTER_UNIT": # Example: Create Unit in AppFolio?
                 # Stub
-                pass
+                return True
             elif action == "WRITE_NOTE" or action == "write_note":
-                if client.write_note(content, dry_run=params.get("dry_run", False)):
+                if client.write_note(content, dry_run=dry_run):
                     logger.info(f"AppFolio Note Written: {content}")
-                else:
-                    logger.error("AppFolio Write Failed")
-            
-        except Exception as e:
-            logger.error(f"AppFolio Error: {e}")
-        finally:
-            client.close()
+                    return True
+                logger.error("AppFolio Write Failed")
+                return False
+            return True
+
+        logger.info("Executing AppFolio Sync...")
+        return appfolio_coalescer.submit(target, str(decision.decision_id), write_back)
 
     # --- Projections (Moved from Tasks.py) ---
     def _project_property(self, decision: DecisionObject):
@@ -235,7 +479,8 @@ class WorkflowEngine:
             updated_at_decision_hash=decision.decision_hash
         )
         self.db.add(prop)
-        self.db.commit()
+        self.db.flush()
+        self._remember_state("property", prop.property_id, "ACTIVE")
 
     def _project_unit(self, decision: DecisionObject):
         import uuid
@@ -249,7 +494,8 @@ class WorkflowEngine:
             updated_at_decision_hash=decision.decision_hash
         )
         self.db.add(unit)
-        self.db.commit()
+        self.db.flush()
+        self._remember_state("unit", unit.unit_id, unit.status)
 
     def _project_unit_status(self, decision: DecisionObject, new_status: str):
         import uuid
@@ -260,7 +506,8 @@ class WorkflowEngine:
                 unit.status = new_status
                 unit.updated_at_decision_hash = decision.decision_hash
                 self.db.add(unit)
-                self.db.commit()
+                self.db.flush()
+                self._remember_state("unit", unit.unit_id, new_status)
         except ValueError:
              logger.error(f"Invalid UUID for unit target: {decision.intent_target}")
 
@@ -285,6 +532,35 @@ class WorkflowEngine:
                 
                 unit.updated_at_decision_hash = decision.decision_hash
                 self.db.add(unit)
-                self.db.commit()
+                self.db.flush()
         except ValueError:
              logger.error(f"Invalid UUID for unit target: {decision.intent_target}")
+
+
+# --- Built-in Side Effect Handlers ---
+# Called as handler(engine, decision, binding).
+
+@effect_handlers.register("db_projection_property", transactional=True, io_bound=False)
+def _handle_projection_property(engine: WorkflowEngine, decision: DecisionObject, binding: TransitionBinding):
+    engine._project_property(decision)
+
+@effect_handlers.register("db_projection_unit", transactional=True, io_bound=False)
+def _handle_projection_unit(engine: WorkflowEngine, decision: DecisionObject, binding: TransitionBinding):
+    engine._project_unit(decision)
+
+@effect_handlers.register("db_projection_unit_status", transactional=True, io_bound=False)
+def _handle_projection_unit_status(engine: WorkflowEngine, decision: DecisionObject, binding: TransitionBinding):
+    engine._project_unit_status(decision, binding.transition["to"])
+
+@effect_handlers.register("db_update_tenant_info", transactional=True, io_bound=False)
+def _handle_update_tenant_info(engine: WorkflowEngine, decision: DecisionObject, binding: TransitionBinding):
+    engine._project_unit_tenant_info(decision)
+
+@effect_handlers.register("appfolio_sync", independent=True, timeout=180)
+def _handle_appfolio_sync(engine: WorkflowEngine, decision: EffectDecision, binding: TransitionBinding):
+    return engine._execute_appfolio_sync(decision)
+
+@effect_handlers.register("email_notification_welcome", independent=True, timeout=30)
+def _handle_email_notification_welcome(engine: WorkflowEngine, decision: EffectDecision, binding: TransitionBinding):
+    # Stub: no mail transport wired into the spine yet.
+    pass
@@ -0,0 +1,111 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, object_session
+
+from vte.orm import EvidenceBundle, EvidenceItemRecord
+from vte.core import metrics
+from vte.core.canonicalize import canonical_sha256
+
+logger = logging.getLogger("vte.core.evidence_store")
+
+# Keeps IN lists under driver limits.
+ITEM_QUERY_CHUNK = 500
+
+
+def store_items(db: Session, items: List[Dict[str, Any]], hashes: Optional[List[str]] = None) -> List[str]:
+    """
+    Stores items in the content-addressed item table (in the caller's transaction)
+    and returns their hashes, in order. Items already stored are not written again.
+    An item's content address is the sha256 of its canonical JSON (canonical_sha256).
+    `hashes` may be passed when the caller already canonicalized the items.
+    """
+    if hashes is None:
+        hashes = [canonical_sha256(item) for item in items]
+
+    unique: Dict[str, Dict[str, Any]] = {}
+    for h, item in zip(hashes, items):
+        unique.setdefault(h, item)
+
+    candidates = list(unique)
+    existing = set()
+    for start in range(0, len(candidates), ITEM_QUERY_CHUNK):
+        chunk = candidates[start:start + ITEM_QUERY_CHUNK]
+        existing.update(h for (h,) in db.query(EvidenceItemRecord.item_hash).filter(EvidenceItemRecord.item_hash.in_(chunk)))
+
+    rows = [{"item_hash": h, "content": item} for h, item in unique.items() if h not in existing]
+    if rows:
+        db.execute(_insert_ignoring_duplicates(db), rows)
+
+    metrics.increment("evidence_items_stored_total", len(rows))
+    metrics.increment("evidence_items_deduplicated_total", len(hashes) - len(rows))
+    return hashes
+
+
+def _insert_ignoring_duplicates(db: Session):
+    # A concurrent ingestion may store the same item between our check and insert.
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(EvidenceItemRecord)
+    return dialect_insert(EvidenceItemRecord).on_conflict_do_nothing(index_elements=["item_hash"])
+
+
+def load_items(db: Session, hashes: List[str]) -> List[Dict[str, Any]]:
+    """
+    Returns the items for the given hashes, in order (duplicates included).
+    """
+    wanted = list(dict.fromkeys(hashes))
+    content: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(wanted), ITEM_QUERY_CHUNK):
+        chunk = wanted[start:start + ITEM_QUERY_CHUNK]
+        for h, item in db.query(EvidenceItemRecord.item_hash, EvidenceItemRecord.content).filter(EvidenceItemRecord.item_hash.in_(chunk)):
+            content[h] = item
+
+    missing = [h for h in wanted if h not in content]
+    if missing:
+        raise ValueError(f"Evidence items missing from the store: {missing[:5]}")
+    return [content[h] for h in hashes]
+
+
+def bundle_items(bundle: EvidenceBundle) -> List[Dict[str, Any]]:
+    """
+    Reassembles a content-addressed bundle's items (cached on the instance).
+    """
+    cached = getattr(bundle, "_resolved_items", None)
+    if cached is not None:
+        return cached
+    db = object_session(bundle)
+    if db is None:
+        raise ValueError(f"Bundle {bundle.bundle_id} is detached; its items cannot be loaded")
+    items = load_items(db, bundle.item_hashes or [])
+    bundle._resolved_items = items
+    return items
+
+
+def resolve_bundle_items(db: Session, bundles: List[EvidenceBundle]):
+    """
+    Loads the items of several content-addressed bundles with one chunked IN query
+    (instead of one per bundle) and caches them on each instance.
+    """
+    pending = [b for b in bundles if b.items_json is None and getattr(b, "_resolved_items", None) is None]
+    items = load_items(db, [h for bundle in pending for h in (bundle.item_hashes or [])])
+    offset = 0
+    for bundle in pending:
+        count = len(bundle.item_hashes or [])
+        bundle._resolved_items = items[offset:offset + count]
+        offset += count
+
+
+def new_bundle(db: Session, items: List[Dict[str, Any]], hashes: Optional[List[str]] = None, **columns) -> EvidenceBundle:
+    """
+    Stores the items and returns an (unsaved) EvidenceBundle referencing them.
+    bundle_hash is computed by the caller over the full items, as before.
+    """
+    bundle = EvidenceBundle(item_hashes=store_items(db, items, hashes), **columns)
+    bundle._resolved_items = items
+    return bundle
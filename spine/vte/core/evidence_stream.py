@@ -0,0 +1,174 @@
+import datetime
+import hashlib
+import json
+import logging
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from vte.api.schema import EvidenceItem
+from vte.orm import EvidenceBundle
+from vte.core.canonicalize import canonical_encode
+from vte.core.evidence_store import new_bundle
+
+logger = logging.getLogger("vte.core.evidence_stream")
+
+# Completed bundles persisted per commit.
+EVIDENCE_STREAM_BATCH_BUNDLES = int(os.getenv("VTE_EVIDENCE_STREAM_BATCH_BUNDLES", "50"))
+
+
+class EvidenceStreamError(ValueError):
+    def __init__(self, line: int, message: str):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+        self.message = message
+
+
+class BundleAccumulator:
+    """
+    Builds one evidence bundle item by item, hashing as it goes.
+    The digest equals sha256(canonical_json_dumps({"collected_at", "items", "normalization_schema"})),
+    i.e. what POST /evidence computes, without ever serializing the whole bundle.
+    """
+    def __init__(self, normalization_schema: str, collected_at: datetime.datetime):
+        self.normalization_schema = normalization_schema
+        self.collected_at = collected_at
+        self.items: List[Dict[str, Any]] = []
+        self.item_hashes: List[str] = []
+        collected_iso = collected_at.replace(tzinfo=None).isoformat() + "Z"
+        self._hash = hashlib.sha256()
+        # Canonical key order: collected_at < items < normalization_schema
+        self._hash.update(b'{"collected_at":' + _json_string(collected_iso) + b',"items":[')
+
+    def add(self, item: Dict[str, Any]):
+        # One encoding pass feeds both the bundle digest and the item's content address.
+        item_digest = hashlib.sha256()
+        bundle_update, item_update = self._hash.update, item_digest.update
+
+        def write(chunk: bytes):
+            bundle_update(chunk)
+            item_update(chunk)
+
+        if self.items:
+            bundle_update(b",")
+        canonical_encode(item, write)
+        self.items.append(item)
+        self.item_hashes.append(item_digest.hexdigest())
+
+    def bundle_hash(self) -> str:
+        digest = self._hash.copy()
+        digest.update(b'],"normalization_schema":' + _json_string(self.normalization_schema) + b"}")
+        return digest.hexdigest()
+
+    def to_orm(self, db: Session) -> EvidenceBundle:
+        # Items go to the content-addressed store; the bundle references them by hash.
+        return new_bundle(
+            db,
+            self.items,
+            self.item_hashes,
+            bundle_id=uuid.uuid4(),
+            collected_at=self.collected_at,
+            normalization_schema=self.normalization_schema,
+            bundle_hash=self.bundle_hash()
+        )
+
+
+def _json_string(value: str) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+class EvidenceStreamIngestor:
+    """
+    Consumes NDJSON evidence one line at a time:
+    - a line with "normalization_schema" starts a new bundle (it may carry
+      "items" too, i.e. a whole bundle on one line);
+    - any other line is an EvidenceItem appended to the current bundle.
+    Each item is validated and parsed once; completed bundles are written
+    EVIDENCE_STREAM_BATCH_BUNDLES at a time.
+    """
+    def __init__(self, db: Session, batch_bundles: Optional[int] = None):
+        self.db = db
+        self.batch_bundles = batch_bundles or EVIDENCE_STREAM_BATCH_BUNDLES
+        # Summaries (not the bundles) of what has been persisted so far.
+        self.committed: List[Dict[str, Any]] = []
+        self._current: Optional[BundleAccumulator] = None
+        self._ready: List[BundleAccumulator] = []
+
+    def feed(self, line_no: int, line: bytes) -> bool:
+        """
+        Consumes one line. Returns True when a batch is ready to flush().
+        """
+        if not line.strip():
+            return False
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise EvidenceStreamError(line_no, f"invalid JSON ({e})")
+        if not isinstance(record, dict):
+            raise EvidenceStreamError(line_no, "expected a JSON object")
+
+        if "normalization_schema" in record:
+            schema = record["normalization_schema"]
+            if not isinstance(schema, str):
+                raise EvidenceStreamError(line_no, "normalization_schema must be a string")
+            items = record.get("items") or []
+            if not isinstance(items, list):
+                raise EvidenceStreamError(line_no, "items must be a list")
+            self._finish_current()
+            self._current = BundleAccumulator(schema, datetime.datetime.now(datetime.timezone.utc))
+            for item in items:
+                self._add(line_no, item)
+        else:
+            if self._current is None:
+                raise EvidenceStreamError(line_no, "item before any bundle header")
+            self._add(line_no, record)
+
+        return len(self._ready) >= self.batch_bundles
+
+    def _add(self, line_no: int, record: Any):
+        try:
+            item = EvidenceItem.model_validate(record).model_dump()
+            self._current.add(item)
+        except ValidationError as e:
+            raise EvidenceStreamError(line_no, f"invalid evidence item ({e.error_count()} errors: {e.errors()[0]['msg']})")
+        except ValueError as e:
+            raise EvidenceStreamError(line_no, str(e))
+
+    def _finish_current(self):
+        if self._current is not None:
+            self._ready.append(self._current)
+            self._current = None
+
+    def flush(self):
+        """
+        Persists the completed bundles in one transaction.
+        """
+        if not self._ready:
+            return
+        try:
+            bundles = [acc.to_orm(self.db) for acc in self._ready]
+            summaries = [
+                {"bundle_id": b.bundle_id, "bundle_hash": b.bundle_hash, "collected_at": b.collected_at, "item_count": len(b.item_hashes)}
+                for b in bundles
+            ]
+            self.db.add_all(bundles)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        # Committed rows are not needed in this session any more.
+        for bundle in bundles:
+            self.db.expunge(bundle)
+        self._ready = []
+        self.committed.extend(summaries)
+        logger.info(f"Persisted {len(bundles)} streamed evidence bundles")
+
+    def close(self):
+        """
+        End of stream: the open bundle is complete; persist what is left.
+        """
+        self._finish_current()
+        self.flush()
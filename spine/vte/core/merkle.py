@@ -0,0 +1,225 @@
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from vte.orm import DecisionObject, MerkleNode
+from vte.core import metrics
+
+logger = logging.getLogger("vte.core.merkle")
+
+# Merkle mountain range over the decision ledger: leaf i is the i-th decision in
+# chain order. Nodes are stored by their post-order position and never change once
+# written, so appending a leaf writes the leaf plus at most log2(n) parents, and a
+# proof for any decision is one sibling per level plus the current peaks.
+#
+# Hashes (RFC 6962 style domain separation, hex encoded):
+#   leaf = sha256(0x00 || decision_hash)
+#   node = sha256(0x01 || left || right)
+#   root = peaks bagged right to left: node(p0, node(p1, ... node(pk-1, pk)))
+
+# Bootstrap inserts per flush.
+MERKLE_BOOTSTRAP_BATCH = 1000
+
+
+def leaf_hash(decision_hash: str) -> str:
+    return hashlib.sha256(b"\x00" + decision_hash.encode("utf-8")).hexdigest()
+
+
+def node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(b"\x01" + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def bag_peaks(peaks: List[str]) -> Optional[str]:
+    if not peaks:
+        return None
+    root = peaks[-1]
+    for peak in reversed(peaks[:-1]):
+        root = node_hash(peak, root)
+    return root
+
+
+def mmr_size(leaf_count: int) -> int:
+    """
+    Number of nodes in a mountain range of leaf_count leaves.
+    """
+    return 2 * leaf_count - bin(leaf_count).count("1")
+
+
+def _peaks(leaf_count: int) -> List[Tuple[int, int]]:
+    # (position, height) of each peak, left to right: one per set bit of leaf_count.
+    peaks = []
+    end = 0
+    for height in range(leaf_count.bit_length() - 1, -1, -1):
+        if leaf_count >> height & 1:
+            end += 2 ** (height + 1) - 1
+            peaks.append((end - 1, height))
+    return peaks
+
+
+def _locate(leaf_index: int, leaf_count: int) -> Tuple[int, List[Tuple[str, int]]]:
+    """
+    Index of the peak above leaf_index, and the path up to it, bottom-up, as
+    (side of the sibling, sibling position) per level.
+    """
+    first_leaf = 0
+    for peak_index, (position, height) in enumerate(_peaks(leaf_count)):
+        if leaf_index < first_leaf + 2 ** height:
+            path = []
+            while height > 0:
+                half = 2 ** (height - 1)
+                left, right = position - 2 ** height, position - 1
+                if leaf_index < first_leaf + half:
+                    path.append(("right", right))
+                    position = left
+                else:
+                    path.append(("left", left))
+                    position = right
+                    first_leaf += half
+                height -= 1
+            path.reverse()
+            return peak_index, path
+        first_leaf += 2 ** height
+    raise ValueError(f"Leaf {leaf_index} is not in a tree of {leaf_count} leaves")
+
+
+def _appended_nodes(leaf_count: int, leaf: str, stored: Callable[[int], str]) -> List[Tuple[int, int, str]]:
+    # (position, height, hash) written when leaf number leaf_count is appended: the
+    # leaf, then one parent per peak it completes (the trailing 1 bits of leaf_count).
+    position = mmr_size(leaf_count)
+    nodes = [(position, 0, leaf)]
+    current, height = leaf, 0
+    while leaf_count >> height & 1:
+        current = node_hash(stored(position - (2 ** (height + 1) - 1)), current)
+        position += 1
+        height += 1
+        nodes.append((position, height, current))
+    return nodes
+
+
+def leaf_count(db: Session) -> int:
+    last = db.query(func.max(MerkleNode.leaf_index)).scalar()
+    return 0 if last is None else last + 1
+
+
+def _stored_hash(db: Session, position: int) -> str:
+    return db.query(MerkleNode.hash).filter(MerkleNode.position == position).scalar()
+
+
+def append_leaf(db: Session, decision: DecisionObject):
+    """
+    Adds a (flushed) decision to the mountain range, in the caller's transaction.
+    The chain head CAS serializes appends, so leaves follow chain order.
+    """
+    count = leaf_count(db)
+    if count == 0:
+        _bootstrap(db)
+        return
+    for position, height, value in _appended_nodes(count, leaf_hash(decision.decision_hash), lambda p: _stored_hash(db, p)):
+        db.add(MerkleNode(
+            position=position, height=height, hash=value,
+            leaf_index=count if height == 0 else None,
+            decision_id=decision.decision_id if height == 0 else None
+        ))
+
+
+def _bootstrap(db: Session):
+    # One-time build over the chain written before the mountain range existed
+    # (including the decision being appended, which is already flushed).
+    peaks: Dict[int, str] = {}
+    rows = db.query(DecisionObject.decision_id, DecisionObject.decision_hash) \
+        .filter(DecisionObject.chain_seq.isnot(None)) \
+        .order_by(DecisionObject.chain_seq) \
+        .execution_options(yield_per=MERKLE_BOOTSTRAP_BATCH)
+    count = 0
+    batch = []
+    for row in rows:
+        nodes = _appended_nodes(count, leaf_hash(row.decision_hash), peaks.pop)
+        for position, height, value in nodes:
+            batch.append({
+                "position": position, "height": height, "hash": value,
+                "leaf_index": count if height == 0 else None,
+                "decision_id": row.decision_id if height == 0 else None
+            })
+        peaks[nodes[-1][0]] = nodes[-1][2]
+        count += 1
+        if len(batch) >= MERKLE_BOOTSTRAP_BATCH:
+            db.bulk_insert_mappings(MerkleNode, batch)
+            batch = []
+    if batch:
+        db.bulk_insert_mappings(MerkleNode, batch)
+    logger.info(f"Merkle mountain range initialized over {count} decisions")
+
+
+def read_root(db: Session) -> Dict[str, Any]:
+    """
+    Current root of the decision ledger, with its leaf count and peaks.
+    """
+    count = leaf_count(db)
+    peaks = _node_hashes(db, [position for position, _ in _peaks(count)])
+    return {"leaf_count": count, "root": bag_peaks(peaks), "peaks": peaks}
+
+
+def inclusion_proof(db: Session, decision_id) -> Optional[Dict[str, Any]]:
+    """
+    Proof that a decision is leaf leaf_index of the current root (None if it has
+    no leaf yet). Check it with verify_inclusion.
+    """
+    leaf = db.query(MerkleNode.leaf_index).filter(MerkleNode.decision_id == decision_id).first()
+    if leaf is None:
+        return None
+    decision_hash = db.query(DecisionObject.decision_hash).filter(DecisionObject.decision_id == decision_id).scalar()
+    # Nodes are append-only: everything below the size read here stays valid.
+    count = leaf_count(db)
+    peak_index, path = _locate(leaf.leaf_index, count)
+    peak_positions = [position for position, _ in _peaks(count)]
+    hashes = _node_hashes(db, [position for _, position in path] + peak_positions)
+    metrics.increment("merkle_proofs_total")
+    return {
+        "decision_id": str(decision_id),
+        "decision_hash": decision_hash,
+        "leaf_index": leaf.leaf_index,
+        "leaf_count": count,
+        "path": [{"side": side, "hash": value} for (side, _), value in zip(path, hashes)],
+        "peak_index": peak_index,
+        "peaks": hashes[len(path):],
+        "root": bag_peaks(hashes[len(path):]),
+    }
+
+
+def _node_hashes(db: Session, positions: List[int]) -> List[str]:
+    if not positions:
+        return []
+    found = dict(db.query(MerkleNode.position, MerkleNode.hash).filter(MerkleNode.position.in_(positions)))
+    return [found[position] for position in positions]
+
+
+def verify_inclusion(proof: Dict[str, Any], root: str) -> bool:
+    """
+    True if proof shows proof["decision_hash"] at proof["leaf_index"] under root.
+    Needs nothing but the proof: O(log n) hashes. A malformed or truncated proof
+    is False, never an exception.
+    """
+    try:
+        return _verify_inclusion(proof, root)
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+        return False
+
+
+def _verify_inclusion(proof: Dict[str, Any], root: str) -> bool:
+    leaf_index, count = proof["leaf_index"], proof["leaf_count"]
+    if type(leaf_index) is not int or type(count) is not int or not 0 <= leaf_index < count:
+        return False
+    peak_index, path = _locate(leaf_index, count)
+    peaks = proof["peaks"]
+    steps = proof["path"]
+    if peak_index != proof["peak_index"] or len(peaks) != len(_peaks(count)) or len(steps) != len(path):
+        return False
+    current = leaf_hash(proof["decision_hash"])
+    for (side, _), step in zip(path, steps):
+        if step["side"] != side:
+            return False
+        current = node_hash(step["hash"], current) if side == "left" else node_hash(current, step["hash"])
+    return peaks[peak_index] == current and bag_peaks(peaks) == root
@@ -0,0 +1,56 @@
+import logging
+import threading
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger("vte.metrics")
+
+# In-process metric store. Each worker/API process keeps its own series;
+# an exporter (or the /metrics style endpoint of a caller) reads snapshot().
+_lock = threading.Lock()
+_timings: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Dict[str, float]] = {}
+_counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+_gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def observe(name: str, seconds: float, **labels):
+    """
+    Records one latency observation (count / total / max per label set).
+    """
+    key = _key(name, labels)
+    with _lock:
+        series = _timings.get(key)
+        if series is None:
+            series = _timings[key] = {"count": 0, "total": 0.0, "max": 0.0}
+        series["count"] += 1
+        series["total"] += seconds
+        if seconds > series["max"]:
+            series["max"] = seconds
+    logger.debug(f"{name} {dict(key[1])} {seconds * 1000:.1f}ms")
+
+def increment(name: str, value: float = 1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def set_gauge(name: str, value: float, **labels):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+def snapshot() -> Dict[str, Any]:
+    """
+    Returns a copy of all series as plain dicts: {"timings": [...], "counters": [...], "gauges": [...]}.
+    """
+    with _lock:
+        return {
+            "timings": [{"name": n, "labels": dict(l), **v} for (n, l), v in _timings.items()],
+            "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in _counters.items()],
+            "gauges": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in _gauges.items()],
+        }
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+        _gauges.clear()
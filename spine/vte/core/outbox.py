@@ -0,0 +1,191 @@
+import datetime
+import logging
+import os
+import threading
+from typing import Callable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from vte.db import SessionLocal
+from vte.orm import DecisionObject, ExecutionOutbox
+from vte.core import metrics
+
+logger = logging.getLogger("vte.core.outbox")
+
+# Outbox rows claimed (and sent to the workers as one task) per dispatch.
+OUTBOX_DISPATCH_BATCH = int(os.getenv("VTE_OUTBOX_DISPATCH_BATCH", "500"))
+# Idle polling interval of the background dispatcher.
+OUTBOX_POLL_SECONDS = float(os.getenv("VTE_OUTBOX_POLL_SECONDS", "1.0"))
+# How the API drains the outbox after writing approved decisions:
+#   thread - a dispatcher thread in the API process is woken up; requests never call the broker
+#   off    - nothing in the API; run scripts/run_outbox_dispatcher.py next to it
+#   inline - the writing request dispatches whatever is pending (opt-in: dev / tests with eager Celery)
+OUTBOX_DISPATCH_MODE = os.getenv("VTE_OUTBOX_DISPATCH", "thread")
+
+
+def enqueue_execution(db: Session, decision: DecisionObject):
+    """
+    Queues an APPROVED decision for execution, in the caller's transaction.
+    """
+    outcome = getattr(decision.outcome, "value", decision.outcome)
+    if outcome == "APPROVED":
+        db.add(ExecutionOutbox(decision_id=decision.decision_id))
+
+
+def _send_to_workers(decision_ids: List[str]):
+    from vte.tasks import execute_decision_batch
+    execute_decision_batch.delay(decision_ids=decision_ids)
+
+
+def _age_seconds(timestamp: datetime.datetime, now: datetime.datetime) -> float:
+    if timestamp.tzinfo is None: # SQLite returns naive UTC
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (now - timestamp).total_seconds())
+
+
+class OutboxDispatcher:
+    """
+    Drains the execution outbox in order, OUTBOX_DISPATCH_BATCH rows at a time.
+
+    Each dispatch claims pending rows with SELECT ... FOR UPDATE SKIP LOCKED (so
+    several dispatchers never claim the same rows), sends their decisions to the
+    workers as ONE execute_decision_batch task and marks them dispatched in the
+    same transaction. If the send fails the rows stay pending and are retried by
+    the next dispatch. Delivery is at-least-once: a decision sent twice is not
+    executed twice, because its permit can only be issued once.
+
+    Metrics: outbox_lag_seconds (age of the oldest pending row), outbox_pending,
+    outbox_dispatched_total, outbox_dispatch_failures_total.
+    """
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = OUTBOX_DISPATCH_BATCH,
+        send: Callable[[List[str]], None] = _send_to_workers,
+        poll_interval: float = OUTBOX_POLL_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.send = send
+        self.poll_interval = poll_interval
+        self._dispatching = threading.Lock()
+        self._wanted = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def dispatch_once(self) -> int:
+        """
+        Claims and sends one batch. Returns the number of decisions dispatched.
+        """
+        db = self.session_factory()
+        try:
+            rows = db.query(ExecutionOutbox) \
+                .filter(ExecutionOutbox.dispatched_at.is_(None)) \
+                .order_by(ExecutionOutbox.id) \
+                .limit(self.batch_size) \
+                .with_for_update(skip_locked=True) \
+                .all()
+            if not rows:
+                self._record_lag(db)
+                db.rollback()
+                return 0
+
+            now = datetime.datetime.now(datetime.timezone.utc)
+            try:
+                self.send([str(row.decision_id) for row in rows])
+            except Exception as e:
+                for row in rows:
+                    row.attempts += 1
+                    row.last_error = str(e)[:500]
+                db.commit()
+                metrics.increment("outbox_dispatch_failures_total")
+                logger.error(f"Outbox dispatch of {len(rows)} decisions failed: {e}")
+                self._record_lag(db)
+                return 0
+
+            for row in rows:
+                row.attempts += 1
+                row.dispatched_at = now
+                row.last_error = None
+            oldest_wait = _age_seconds(rows[0].created_at, now)
+            db.commit()
+
+            metrics.increment("outbox_dispatched_total", len(rows))
+            metrics.observe("outbox_dispatch_delay_seconds", oldest_wait)
+            self._record_lag(db)
+            logger.info(f"Dispatched {len(rows)} decisions from the outbox")
+            return len(rows)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _record_lag(self, db: Session):
+        pending, oldest = db.query(func.count(ExecutionOutbox.id), func.min(ExecutionOutbox.created_at)) \
+            .filter(ExecutionOutbox.dispatched_at.is_(None)).one()
+        now = datetime.datetime.now(datetime.timezone.utc)
+        metrics.set_gauge("outbox_pending", pending)
+        metrics.set_gauge("outbox_lag_seconds", _age_seconds(oldest, now) if oldest else 0.0)
+
+    def dispatch_pending(self):
+        """
+        Dispatches until the outbox is drained. If another thread is already
+        dispatching, it is asked to go round once more instead of waiting for it.
+        """
+        self._wanted.set()
+        while self._wanted.is_set():
+            if not self._dispatching.acquire(blocking=False):
+                return
+            try:
+                self._wanted.clear()
+                while self.dispatch_once() == self.batch_size:
+                    pass
+            finally:
+                self._dispatching.release()
+
+    def notify(self):
+        """
+        Called after committing approved decisions.
+        """
+        if OUTBOX_DISPATCH_MODE == "inline":
+            try:
+                self.dispatch_pending()
+            except Exception as e:
+                # The rows are committed; the next dispatch picks them up.
+                logger.error(f"Inline outbox dispatch failed: {e}")
+        elif OUTBOX_DISPATCH_MODE == "thread":
+            self.start()
+            self._wanted.set()
+
+    def start(self):
+        """
+        Starts the background dispatcher thread (idempotent).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wanted.set()
+
+    def run(self):
+        """
+        Dispatch loop: drains the outbox, then waits for a notify() or the poll interval.
+        """
+        logger.info("Outbox dispatcher started")
+        while not self._stop.is_set():
+            try:
+                self.dispatch_pending()
+            except Exception as e:
+                logger.error(f"Outbox dispatcher error: {e}")
+            self._wanted.wait(self.poll_interval)
+        logger.info("Outbox dispatcher stopped")
+
+
+# One dispatcher per process.
+outbox_dispatcher = OutboxDispatcher()
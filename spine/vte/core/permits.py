@@ -12,10 +12,11 @@ class PermitIssuer:
     def __init__(self, db: Session):
         self.db = db
 
-    def issue_permit(self, decision: DecisionObject, required_scope: List[str] = None) -> PermitToken:
+    def issue_permit(self, decision: DecisionObject, required_scope: List[str] = None, commit: bool = True) -> PermitToken:
         """
         Issues a cryptographically signed PermitToken for a specific Decision.
         This token authorizes the Engine to execute the side-effects.
+        With commit=False the token is only flushed; the caller owns the transaction.
         """
         if not decision.decision_id:
             raise ValueError("Cannot issue permit for unsaved decision.")
@@ -54,8 +55,11 @@ class PermitIssuer:
         )
         
         self.db.add(token)
-        self.db.commit()
-        self.db.refresh(token)
+        if commit:
+            self.db.commit()
+            self.db.refresh(token)
+        else:
+            self.db.flush()
         
         print(f"[PermitIssuer] Issued Permit {token.token_id} for Decision {decision.decision_id}")
         return token
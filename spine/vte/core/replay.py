@@ -0,0 +1,314 @@
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from vte.orm import DecisionObject, PermitToken, ProjectionCheckpoint, Property, Unit
+from vte.core import metrics
+from vte.core.contracts import ContractIndex, TransitionBinding
+from vte.core.engine import BATCH_CHUNK_SIZE, feature_contracts
+from vte.core.side_effects import effect_handlers
+from vte.core.state_cache import target_states
+
+logger = logging.getLogger("vte.core.replay")
+
+# Decisions applied (and committed, with the checkpoint) per batch.
+REPLAY_BATCH_SIZE = int(os.getenv("VTE_REPLAY_BATCH_SIZE", "5000"))
+# Rows fetched per round trip while streaming a batch.
+REPLAY_FETCH_SIZE = 1000
+
+
+class _ProjectionBatch:
+    """
+    In-memory copy of the Property/Unit rows touched by one batch.
+    Projections are applied here in chain order, then written with
+    one bulk insert and one bulk update per table.
+    """
+    def __init__(self):
+        self.properties: Dict[uuid.UUID, Dict[str, Any]] = {}
+        self.units: Dict[uuid.UUID, Dict[str, Any]] = {}
+        self.new_properties: Set[uuid.UUID] = set()
+        self.new_units: Set[uuid.UUID] = set()
+        self.updated_properties: Set[uuid.UUID] = set()
+        self.updated_units: Set[uuid.UUID] = set()
+        # Inside savepoint(): (table, key) -> (row copy or None, was new, was updated)
+        self._undo: Optional[Dict[Tuple[str, uuid.UUID], tuple]] = None
+
+    def _table(self, table: str):
+        if table == "property":
+            return self.properties, self.new_properties, self.updated_properties
+        return self.units, self.new_units, self.updated_units
+
+    @contextmanager
+    def savepoint(self):
+        """
+        The in-memory counterpart of the SAVEPOINT execute_decisions wraps each
+        decision in: if the block raises, every row it touched is put back as it
+        was, so a failed decision leaves nothing in the batch's bulk writes.
+        """
+        self._undo = {}
+        try:
+            yield
+        except Exception:
+            for (table, key), (row, was_new, was_updated) in self._undo.items():
+                rows, new, updated = self._table(table)
+                if row is None:
+                    rows.pop(key, None)
+                else:
+                    rows[key] = row
+                (new.add if was_new else new.discard)(key)
+                (updated.add if was_updated else updated.discard)(key)
+            raise
+        finally:
+            self._undo = None
+
+    def _touch(self, table: str, key: uuid.UUID):
+        # Called before a projection changes a row: remembers it for savepoint().
+        if self._undo is None or (table, key) in self._undo:
+            return
+        rows, new, updated = self._table(table)
+        row = rows.get(key)
+        self._undo[(table, key)] = (dict(row) if row is not None else None, key in new, key in updated)
+
+    def load(self, db: Session, targets: Iterable[uuid.UUID]):
+        targets = list(targets)
+        for start in range(0, len(targets), BATCH_CHUNK_SIZE):
+            chunk = targets[start:start + BATCH_CHUNK_SIZE]
+            for (pid,) in db.query(Property.property_id).filter(Property.property_id.in_(chunk)):
+                self.properties[pid] = {"property_id": pid}
+            for unit_id, status, tenant_info in db.query(Unit.unit_id, Unit.status, Unit.tenant_info).filter(Unit.unit_id.in_(chunk)):
+                self.units[unit_id] = {"unit_id": unit_id, "status": status, "tenant_info": tenant_info}
+
+    def state(self, target_id: str, target_type: str) -> str:
+        """
+        Same resolution rules as WorkflowEngine._get_current_state, against the replayed rows.
+        """
+        if target_type not in ("property", "unit"):
+            return "UNKNOWN"
+        tid = _target_uuid(target_id)
+        if tid is None:
+            return "VOID"
+        if target_type == "property":
+            return "ACTIVE" if tid in self.properties else "VOID"
+        unit = self.units.get(tid)
+        return unit["status"] if unit else "VOID"
+
+    # --- Projections (mirror WorkflowEngine._project_*) ---
+    # A create for a row that already exists overwrites it, so replaying over
+    # an existing read model is idempotent.
+    def project_property(self, decision: DecisionObject, binding: TransitionBinding, params: Dict[str, Any]):
+        pid = uuid.UUID(decision.intent_target) if decision.intent_target else uuid.uuid4()
+        row = {
+            "property_id": pid,
+            "name": params.get("name"),
+            "address": params.get("address"),
+            "external_ref_id": params.get("external_ref_id"),
+            "updated_at_decision_hash": decision.decision_hash
+        }
+        self._touch("property", pid)
+        if pid in self.properties and pid not in self.new_properties:
+            self.properties[pid].update(row)
+            self.updated_properties.add(pid)
+        else:
+            self.properties[pid] = {**row, "created_at_decision_hash": decision.decision_hash}
+            self.new_properties.add(pid)
+
+    def project_unit(self, decision: DecisionObject, binding: TransitionBinding, params: Dict[str, Any]):
+        unit_id = uuid.UUID(decision.intent_target) if decision.intent_target else uuid.uuid4()
+        row = {
+            "unit_id": unit_id,
+            "property_id": uuid.UUID(params.get("property_id")),
+            "name": params.get("name"),
+            "status": params.get("status", "VACANT"),
+            "updated_at_decision_hash": decision.decision_hash
+        }
+        self._touch("unit", unit_id)
+        if unit_id in self.units and unit_id not in self.new_units:
+            self.units[unit_id].update(row)
+            self.updated_units.add(unit_id)
+        else:
+            self.units[unit_id] = {**row, "tenant_info": None, "created_at_decision_hash": decision.decision_hash}
+            self.new_units.add(unit_id)
+
+    def project_unit_status(self, decision: DecisionObject, binding: TransitionBinding, params: Dict[str, Any]):
+        self._update_unit(decision, status=binding.transition["to"])
+
+    def project_unit_tenant_info(self, decision: DecisionObject, binding: TransitionBinding, params: Dict[str, Any]):
+        unit = self.units.get(_target_uuid(decision.intent_target))
+        if unit:
+            self._update_unit(decision, tenant_info={**(unit.get("tenant_info") or {}), **params})
+
+    def _update_unit(self, decision: DecisionObject, **values):
+        # Unknown or invalid targets are a no-op, as in live execution.
+        unit_id = _target_uuid(decision.intent_target)
+        unit = self.units.get(unit_id)
+        if not unit:
+            return
+        self._touch("unit", unit_id)
+        unit.update(values, updated_at_decision_hash=decision.decision_hash)
+        if unit_id not in self.new_units:
+            self.updated_units.add(unit_id)
+
+    def write(self, db: Session):
+        db.bulk_insert_mappings(Property, [self.properties[p] for p in self.new_properties])
+        db.bulk_update_mappings(Property, [self.properties[p] for p in self.updated_properties])
+        db.bulk_insert_mappings(Unit, [self.units[u] for u in self.new_units])
+        db.bulk_update_mappings(Unit, [self.units[u] for u in self.updated_units])
+
+
+# Transactional side effect -> replay projection. External effects are never replayed.
+_REPLAYED_EFFECTS = {
+    "db_projection_property": _ProjectionBatch.project_property,
+    "db_projection_unit": _ProjectionBatch.project_unit,
+    "db_projection_unit_status": _ProjectionBatch.project_unit_status,
+    "db_update_tenant_info": _ProjectionBatch.project_unit_tenant_info,
+}
+
+
+def _target_uuid(target_id: Optional[str]) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(target_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class ProjectionReplayer:
+    """
+    Rebuilds the inventory read model (Property, Unit) from the decision log.
+
+    Decisions are streamed in chain order (chain_seq), a batch at a time.
+    Only decisions that were executed (they hold a PermitToken) are replayed, through
+    the same contract bindings as live execution. Permits are not issued and external
+    side effects (AppFolio, email) are not run. Each batch is written with bulk
+    inserts/updates and committed together with its checkpoint, so an interrupted
+    rebuild resumes after the last committed batch.
+    """
+    def __init__(
+        self,
+        db: Session,
+        name: str = "inventory",
+        batch_size: int = REPLAY_BATCH_SIZE,
+        contracts: Optional[Dict[str, Any]] = None
+    ):
+        self.db = db
+        self.name = name
+        self.batch_size = batch_size
+        self.index = ContractIndex(contracts) if contracts is not None else feature_contracts.snapshot().index
+
+    def rebuild(self, reset: bool = False, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        Replays from the checkpoint (or from genesis with reset=True, which first
+        deletes the projection rows). Returns counts of applied/skipped/failed decisions.
+        """
+        if reset:
+            self._reset()
+
+        checkpoint = self._checkpoint()
+        stats = {"batches": 0, "applied": 0, "skipped": 0, "failed": 0}
+        try:
+            while max_batches is None or stats["batches"] < max_batches:
+                decisions = self._next_batch(checkpoint)
+                if not decisions:
+                    break
+                self._apply_batch(decisions, checkpoint, stats)
+                stats["batches"] += 1
+        finally:
+            # Projection rows changed underneath the shared state cache.
+            target_states.clear()
+
+        logger.info(f"Projection '{self.name}' replay finished: {stats}, {checkpoint.decisions_applied} applied in total")
+        return stats
+
+    def _reset(self):
+        self.db.query(Unit).delete(synchronize_session=False)
+        self.db.query(Property).delete(synchronize_session=False)
+        self.db.query(ProjectionCheckpoint).filter(ProjectionCheckpoint.name == self.name).delete(synchronize_session=False)
+        self.db.commit()
+        logger.info(f"Projection '{self.name}' reset")
+
+    def _checkpoint(self) -> ProjectionCheckpoint:
+        checkpoint = self.db.get(ProjectionCheckpoint, self.name)
+        if checkpoint is None:
+            checkpoint = ProjectionCheckpoint(name=self.name, decisions_applied=0)
+            self.db.add(checkpoint)
+        return checkpoint
+
+    def _next_batch(self, checkpoint: ProjectionCheckpoint) -> List[DecisionObject]:
+        # Chain order is chain_seq; the checkpoint's last decision gives the position to resume after.
+        after = 0
+        if checkpoint.last_decision_id is not None:
+            after = self.db.query(DecisionObject.chain_seq) \
+                .filter(DecisionObject.decision_id == checkpoint.last_decision_id).scalar() or 0
+        query = (
+            self.db.query(DecisionObject)
+            .join(PermitToken, PermitToken.decision_id == DecisionObject.decision_id)
+            .filter(DecisionObject.chain_seq > after)
+            .order_by(DecisionObject.chain_seq)
+        )
+        # Keyset pages keep every batch a short, index-driven query; rows within a page are streamed.
+        return list(query.limit(self.batch_size).yield_per(REPLAY_FETCH_SIZE))
+
+    def _apply_batch(self, decisions: List[DecisionObject], checkpoint: ProjectionCheckpoint, stats: Dict[str, int]):
+        start = time.perf_counter()
+        batch = _ProjectionBatch()
+        batch.load(self.db, {t for t in (_target_uuid(d.intent_target) for d in decisions) if t is not None})
+
+        applied = 0
+        for decision in decisions:
+            try:
+                with batch.savepoint():
+                    result = self._apply(batch, decision)
+            except Exception as e:
+                logger.error(f"Replay of decision {decision.decision_id} failed: {e}")
+                result = "failed"
+            stats[result] += 1
+            applied += result == "applied"
+            metrics.increment("projection_replay_decisions_total", projection=self.name, result=result)
+
+        last = decisions[-1]
+        try:
+            batch.write(self.db)
+            checkpoint.last_timestamp = last.timestamp
+            checkpoint.last_decision_id = last.decision_id
+            checkpoint.last_decision_hash = last.decision_hash
+            checkpoint.decisions_applied += applied
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        metrics.observe("projection_replay_batch_seconds", time.perf_counter() - start, projection=self.name)
+        logger.info(f"Projection '{self.name}' replayed {len(decisions)} decisions up to {last.decision_hash}")
+
+    def _apply(self, batch: _ProjectionBatch, decision: DecisionObject) -> str:
+        contract = self.index.find_contract(decision.intent_action)
+        if not contract:
+            return "skipped"
+
+        bindings = self.index.candidates(decision.intent_action, contract)
+        binding = next((
+            b for b in bindings
+            if b.transition["from"] == "*"
+            or batch.state(decision.intent_target, b.transition["target_type"]) == b.transition["from"]
+        ), None)
+        if binding is None:
+            raise ValueError(f"No transition for {decision.intent_action} matches the replayed state of {decision.intent_target}")
+
+        params = decision.intent_params or {}
+        if isinstance(params, str):
+            params = json.loads(params)
+
+        projected = False
+        for effect in binding.side_effects:
+            project = _REPLAYED_EFFECTS.get(effect)
+            if project is not None:
+                project(batch, decision, binding, params)
+                projected = True
+            elif effect in effect_handlers and effect_handlers.get(effect).transactional:
+                raise ValueError(f"Side effect {effect} has no replay projection")
+        return "applied" if projected else "skipped"
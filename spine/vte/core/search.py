@@ -0,0 +1,57 @@
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, Float, MetaData, Table, Text, func, literal_column, select, type_coerce
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.types import Uuid as UUID
+
+from vte.orm import DECISION_SEARCH_FTS, DecisionObject
+
+logger = logging.getLogger("vte.core.search")
+
+# Search terms beyond this are ignored.
+MAX_SEARCH_TERMS = 8
+
+# The FTS5 table is created by DDL (vte.orm), not by the ORM metadata.
+_fts = Table(
+    DECISION_SEARCH_FTS, MetaData(),
+    Column("decision_id", UUID(as_uuid=True)),
+    Column("document", Text),
+)
+
+
+def search_terms(text: str) -> List[str]:
+    """
+    Words of a search box query, lowercased (punctuation and '_' separate words).
+    """
+    return re.findall(r"[^\W_]+", (text or "").lower())[:MAX_SEARCH_TERMS]
+
+
+def apply_search(db: Session, query: Query, text: str) -> Tuple[Query, Optional[object]]:
+    """
+    Restricts a DecisionObject query to decisions matching every term of `text`
+    (as a word prefix on SQLite, a substring on Postgres) using the search index.
+    Returns the query and a rank expression where lower is more relevant (None
+    when the backend has no ranking), usable in ORDER BY and keyset filters.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return query, None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        # FTS5: every term as a quoted prefix, ranked by bm25 (already lower-is-better).
+        match = " ".join(f'"{t}"*' for t in terms)
+        hits = select(
+            _fts.c.decision_id,
+            type_coerce(func.bm25(literal_column(DECISION_SEARCH_FTS)), Float).label("rank")
+        ).where(_fts.c.document.op("MATCH")(match)).subquery()
+        return query.join(hits, hits.c.decision_id == DecisionObject.decision_id), hits.c.rank
+
+    for term in terms:
+        query = query.filter(DecisionObject.search_text.icontains(term, autoescape=True))
+    if dialect == "postgresql":
+        # pg_trgm: the ILIKEs use the GIN trigram index; similarity ranks the matches.
+        return query, type_coerce(-func.similarity(DecisionObject.search_text, " ".join(terms)), Float)
+    return query, None
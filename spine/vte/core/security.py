@@ -2,7 +2,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from jose import jwt, JWTError
 import os
-from vte.core.canonicalize import canonical_json_dumps
+from vte.core.canonicalize import canonical_encode
 import hashlib
 
 # Configuration
@@ -33,16 +33,11 @@ def sign_payload(payload: Dict[str, Any]) -> str:
     Signs a canonicalized payload using the system secret (HMAC).
     Returns a hex signature.
     """
-    canonical_bytes = canonical_json_dumps(payload)
-    # We use the SECRET_KEY to salt the hash for a simple HMAC
-    # For robust usage, use hmac module, but here we just hash(content + secret) or use JWT logic.
-    # Let's use a simple JWT-style signature approach or just HMAC-SHA256
+    # HMAC-SHA256 keyed with SECRET_KEY; the canonical bytes are streamed straight into it.
     import hmac
-    signature = hmac.new(
-        SECRET_KEY.encode('utf-8'), 
-        canonical_bytes, 
-        hashlib.sha256
-    ).hexdigest()
+    mac = hmac.new(SECRET_KEY.encode('utf-8'), digestmod=hashlib.sha256)
+    canonical_encode(payload, mac.update)
+    signature = mac.hexdigest()
     return signature
 
 def verify_signature(payload: Dict[str, Any], signature: str) -> bool:
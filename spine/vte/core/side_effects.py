@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from vte.core import metrics
+from vte.core.tracing import Span, tracer
+
+logger = logging.getLogger("vte.core.side_effects")
+
+# Shared pool for external (I/O-bound) side effects.
+EXTERNAL_EFFECT_WORKERS = int(os.getenv("VTE_EXTERNAL_EFFECT_WORKERS", "4"))
+# Used when a handler does not declare its own timeout.
+DEFAULT_EFFECT_TIMEOUT_SECONDS = float(os.getenv("VTE_EFFECT_TIMEOUT", "120"))
+
+# Timed-out handlers keep their thread (it cannot be killed). Past this many still
+# running, new external effects fail fast instead of starting.
+MAX_HUNG_EFFECTS = int(os.getenv("VTE_MAX_HUNG_EFFECTS", str(2 * EXTERNAL_EFFECT_WORKERS)))
+
+_pool = ThreadPoolExecutor(max_workers=EXTERNAL_EFFECT_WORKERS, thread_name_prefix="vte-effect")
+_pool_lock = threading.Lock()
+_hung: set = set()
+
+
+class SideEffectHandler(NamedTuple):
+    """
+    A registered side effect.
+    - transactional: writes only through the engine's DB session. Runs inline, inside
+      the decision's transaction. Everything else is external and runs after commit.
+    - is_async: func is a coroutine function.
+    - io_bound: external I/O-bound handlers run on the shared pool; CPU-bound ones run inline.
+    - independent: may overlap with other effects instead of waiting for the previous one.
+    """
+    name: str
+    func: Callable[..., Any]
+    transactional: bool
+    is_async: bool
+    io_bound: bool
+    independent: bool
+    timeout: Optional[float]
+
+
+class SideEffectRegistry:
+    """
+    Maps contract side-effect names (e.g. 'db_projection_unit', 'appfolio_sync') to handlers.
+    Handlers are called as func(engine, decision, binding). External handlers get a plain
+    snapshot of the decision (engine.EffectDecision), never the Session-bound instance.
+    An external handler may return False to report failure, or a Future when the work
+    is completed elsewhere (e.g. a coalescing stage); the Future's result is then awaited.
+    """
+    def __init__(self):
+        self._handlers: Dict[str, SideEffectHandler] = {}
+
+    def register(
+        self,
+        name: str,
+        transactional: bool = False,
+        is_async: bool = False,
+        io_bound: bool = True,
+        independent: bool = False,
+        timeout: Optional[float] = None
+    ):
+        """
+        Decorator registering a handler under a side-effect name.
+        """
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            if name in self._handlers:
+                raise ValueError(f"Side effect '{name}' is already registered")
+            if transactional and is_async:
+                raise ValueError(f"Side effect '{name}': transactional handlers must be synchronous")
+            self._handlers[name] = SideEffectHandler(
+                name=name,
+                func=func,
+                transactional=transactional,
+                is_async=is_async,
+                io_bound=io_bound,
+                independent=independent,
+                timeout=timeout
+            )
+            return func
+        return decorator
+
+    def get(self, name: str) -> Optional[SideEffectHandler]:
+        return self._handlers.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._handlers
+
+    def names(self) -> List[str]:
+        return list(self._handlers)
+
+
+effect_handlers = SideEffectRegistry()
+
+
+def invoke_handler(handler: SideEffectHandler, *args) -> Any:
+    """
+    Runs one handler on the calling thread and records its latency
+    as side_effect_latency_seconds{effect, status}.
+    """
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        if handler.is_async:
+            coro = handler.func(*args)
+            if handler.timeout:
+                coro = asyncio.wait_for(coro, handler.timeout)
+            return asyncio.run(coro)
+        return handler.func(*args)
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        metrics.observe("side_effect_latency_seconds", time.perf_counter() - start, effect=handler.name, status=status)
+
+
+def traced(handler: SideEffectHandler, parent: Optional[Span]) -> SideEffectHandler:
+    """
+    Returns a copy of the handler whose calls are recorded as a 'side_effect.<name>' span
+    under the given parent. Handlers returning a Future end their span when it resolves,
+    so the span covers the real work rather than the hand-off.
+    """
+    def finish(span: Span, result: Any):
+        if isinstance(result, Future):
+            result.add_done_callback(lambda f: finish(span, f.result() if not f.exception() else f.exception()))
+        elif isinstance(result, BaseException):
+            tracer.end_span(span, error=result)
+        else:
+            tracer.end_span(span, error="reported failure" if result is False else None)
+
+    if handler.is_async:
+        async def func(*args):
+            span = tracer.start_span(f"side_effect.{handler.name}", parent=parent, effect=handler.name)
+            try:
+                result = await handler.func(*args)
+            except BaseException as e:
+                tracer.end_span(span, error=e)
+                raise
+            finish(span, result)
+            return result
+    else:
+        def func(*args):
+            span = tracer.start_span(f"side_effect.{handler.name}", parent=parent, effect=handler.name)
+            try:
+                result = handler.func(*args)
+            except BaseException as e:
+                tracer.end_span(span, error=e)
+                raise
+            finish(span, result)
+            return result
+
+    return handler._replace(func=func)
+
+
+def _submit(handler: SideEffectHandler, args: tuple) -> Future:
+    with _pool_lock:
+        hung = len(_hung)
+        pool = _pool
+    if hung >= MAX_HUNG_EFFECTS:
+        metrics.increment("side_effect_rejections_total", effect=handler.name)
+        future = Future()
+        future.set_exception(RuntimeError(f"{hung} timed-out side effects still running; not starting another"))
+        return future
+    return pool.submit(invoke_handler, handler, *args)
+
+
+def _abandon(future: Future):
+    """
+    A handler timed out while holding a pool thread: give up that pool to its hung
+    threads (queued work still runs there) and send new work to a fresh one, so a
+    few hung calls cannot starve every later effect.
+    """
+    global _pool
+    with _pool_lock:
+        if future.done():
+            return
+        _hung.add(future)
+        old, _pool = _pool, ThreadPoolExecutor(max_workers=EXTERNAL_EFFECT_WORKERS, thread_name_prefix="vte-effect")
+        metrics.set_gauge("side_effects_hung", len(_hung))
+    old.shutdown(wait=False)
+    future.add_done_callback(_forget_hung)
+
+
+def _forget_hung(future: Future):
+    with _pool_lock:
+        _hung.discard(future)
+        metrics.set_gauge("side_effects_hung", len(_hung))
+
+
+def _wait(handler: SideEffectHandler, future: Future) -> bool:
+    timeout = handler.timeout or DEFAULT_EFFECT_TIMEOUT_SECONDS
+    deadline = time.monotonic() + timeout
+    try:
+        result = future.result(timeout=timeout)
+        if isinstance(result, Future):
+            result = result.result(timeout=max(0.0, deadline - time.monotonic()))
+        if result is False:
+            logger.error(f"Side effect {handler.name} reported failure")
+            return False
+        return True
+    except FutureTimeout:
+        # The thread keeps running; we only stop waiting for it.
+        logger.error(f"Side effect {handler.name} timed out after {timeout}s")
+        metrics.increment("side_effect_timeouts_total", effect=handler.name)
+        _abandon(future)
+        return False
+    except Exception as e:
+        logger.error(f"Side effect {handler.name} failed: {e}")
+        return False
+
+
+def run_external_effects(calls: List[Tuple[SideEffectHandler, tuple]]) -> List[bool]:
+    """
+    Runs external (non-transactional) effects and returns a success flag per call, in order.
+    Independent I/O-bound effects all start immediately and overlap; dependent I/O-bound
+    effects run one after another on the pool (so their timeout is enforced); CPU-bound
+    effects run inline. Failures and timeouts are logged, not raised: the decision is
+    already committed at this point. A timed-out handler's pool is replaced (see
+    _abandon); with MAX_HUNG_EFFECTS of them still running, effects fail fast.
+    """
+    ok = [False] * len(calls)
+
+    started: Dict[int, Future] = {}
+    for i, (handler, args) in enumerate(calls):
+        if handler.independent and handler.io_bound:
+            started[i] = _submit(handler, args)
+
+    for i, (handler, args) in enumerate(calls):
+        if i in started:
+            continue
+        if handler.io_bound:
+            ok[i] = _wait(handler, _submit(handler, args))
+        else:
+            try:
+                ok[i] = invoke_handler(handler, *args) is not False
+            except Exception as e:
+                logger.error(f"Side effect {handler.name} failed: {e}")
+
+    for i, future in started.items():
+        ok[i] = _wait(calls[i][0], future)
+
+    return ok
@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+# Max staleness for states written by OTHER processes. Writes made by this
+# process's engine are pushed into the cache on commit, so they are never stale here.
+STATE_CACHE_TTL_SECONDS = float(os.getenv("VTE_STATE_CACHE_TTL", "5"))
+STATE_CACHE_MAX_ENTRIES = int(os.getenv("VTE_STATE_CACHE_SIZE", "10000"))
+
+
+class TargetStateCache:
+    """
+    Bounded LRU + TTL cache of target entity states keyed by (target_type, target_id).
+
+    Staleness rules:
+    1. An entry expires `ttl` seconds after it was stored, whatever its source.
+    2. The engine stores states it read from the DB, and states it wrote once the
+       writing transaction has committed (never before).
+    3. If a transaction that wrote a target rolls back, the target is invalidated.
+    4. Absent targets ('VOID') are not cached, so an entity created elsewhere is
+       visible immediately.
+    """
+    def __init__(
+        self,
+        max_entries: int = STATE_CACHE_MAX_ENTRIES,
+        ttl: float = STATE_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, target_type: str, target_id: str) -> Optional[str]:
+        key = (target_type, target_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            state, expires_at = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return state
+
+    def put(self, target_type: str, target_id: str, state: str):
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        key = (target_type, target_id)
+        with self._lock:
+            self._entries[key] = (state, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, target_type: str, target_id: str):
+        with self._lock:
+            self._entries.pop((target_type, target_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by every WorkflowEngine in the process.
+target_states = TargetStateCache()
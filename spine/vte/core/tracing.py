@@ -0,0 +1,176 @@
+import contextvars
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from vte.core import metrics
+
+logger = logging.getLogger("vte.core.tracing")
+
+# Where finished spans go:
+#   unset / ""                 -> not exported (durations still land in vte.core.metrics)
+#   "file:/var/log/vte/spans.jsonl" -> one JSON object per line
+#   "http(s)://collector/..."  -> batched JSON POSTs {"spans": [...]}
+TRACE_EXPORT = os.getenv("VTE_TRACE_EXPORT", "")
+
+# Attributes a child span inherits from its parent.
+PROPAGATED_ATTRIBUTES = ("decision_id", "trigger")
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("vte_current_span", default=None)
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.duration_ms: Optional[float] = None
+        self._t0 = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class JsonlFileExporter:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, span: Dict[str, Any]):
+        line = json.dumps(span, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class HttpCollectorExporter:
+    """
+    Buffers spans and POSTs them in batches from a background thread,
+    so a slow collector never adds latency to execution.
+    """
+    def __init__(self, url: str, batch_size: int = 100, flush_interval: float = 2.0):
+        self.url = url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=10000)
+        threading.Thread(target=self._run, name="vte-trace-export", daemon=True).start()
+
+    def export(self, span: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            metrics.increment("trace_spans_dropped_total")
+
+    def _run(self):
+        while True:
+            batch: List[Dict[str, Any]] = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                body = json.dumps({"spans": batch}, default=str).encode("utf-8")
+                request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+                urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                metrics.increment("trace_spans_dropped_total", len(batch))
+                logger.warning(f"Trace export to {self.url} failed: {e}")
+
+
+def exporter_from_config(value: str):
+    if not value:
+        return None
+    if value.startswith("file:"):
+        return JsonlFileExporter(value[len("file:"):])
+    if value.startswith("http://") or value.startswith("https://"):
+        return HttpCollectorExporter(value)
+    logger.error(f"Unsupported VTE_TRACE_EXPORT value: {value}")
+    return None
+
+
+class Tracer:
+    """
+    Minimal structured tracer. Every finished span is recorded as
+    trace_span_seconds{span, status} and, if an exporter is configured, exported.
+    """
+    def __init__(self, exporter: Any = None):
+        self.exporter = exporter
+
+    def current(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """
+        Starts a span without making it current (for work finishing on another thread).
+        """
+        if parent is None:
+            parent = _current_span.get()
+        inherited = {k: parent.attributes[k] for k in PROPAGATED_ATTRIBUTES if parent and k in parent.attributes}
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent else None,
+            attributes={**inherited, **attributes}
+        )
+
+    def end_span(self, span: Span, error: Optional[Any] = None):
+        span.duration_ms = (time.perf_counter() - span._t0) * 1000
+        if error is not None:
+            span.status = "error"
+            span.error = str(error)
+        metrics.observe("trace_span_seconds", span.duration_ms / 1000, span=span.name, status=span.status)
+        if self.exporter is not None:
+            try:
+                self.exporter.export(span.to_dict())
+            except Exception as e:
+                logger.warning(f"Span export failed: {e}")
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes) -> Iterator[Span]:
+        span = self.start_span(name, parent=parent, **attributes)
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span, error=error)
+
+
+tracer = Tracer(exporter_from_config(TRACE_EXPORT))
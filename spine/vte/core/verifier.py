@@ -1,25 +1,24 @@
-import json
-import hashlib
 from pathlib import Path
 from typing import Dict, Any, Optional
-from vte.core.canonicalize import canonical_json_dumps
+from vte.core.canonicalize import canonical_sha256
+from vte.core.contracts import ContractRegistry
+from vte.core.merkle import verify_inclusion
 
 # Hardcoded paths for Phase 0 (Production would use ENV or config)
 CONTRACTS_ROOT = Path("C:/Bintloop/VTE/contracts/core")
 
+# Shared by every ProofVerifier in the process.
+# Key by filename logic or internal schema id
+# Using filename stem for simplicity: 'decision_object_v1'
+core_schemas = ContractRegistry(CONTRACTS_ROOT, "*.json", key=lambda path, data: path.stem)
+
 class ProofVerifier:
-    def __init__(self):
-        self._schemas = self._load_schemas()
+    @property
+    def _schemas(self) -> Dict[str, Any]:
+        return self._load_schemas()
 
     def _load_schemas(self) -> Dict[str, Any]:
-        schemas = {}
-        for f in CONTRACTS_ROOT.glob("*.json"):
-            with open(f, "r", encoding="utf-8") as schema_file:
-                data = json.load(schema_file)
-                # Key by filename logic or internal schema id
-                # Using filename stem for simplicity: 'decision_object_v1'
-                schemas[f.stem] = data
-        return schemas
+        return core_schemas.snapshot().contracts
 
     def verify_decision_integrity(self, decision: Dict[str, Any]) -> bool:
         """
@@ -39,8 +38,7 @@ class ProofVerifier:
         # If previous_hash exists, it IS part of the payload for hashing.
         
         # Canonicalize
-        canonical_bytes = canonical_json_dumps(payload)
-        calculated_hash = hashlib.sha256(canonical_bytes).hexdigest()
+        calculated_hash = canonical_sha256(payload)
         
         if provided_hash != calculated_hash:
             raise ValueError(f"Decision Hash Mismatch. Provided: {provided_hash}, Calculated: {calculated_hash}")
@@ -54,8 +52,7 @@ class ProofVerifier:
         if "decision_hash" in decision_payload:
              raise ValueError("Input payload should not contain 'decision_hash' field.")
              
-        canonical_bytes = canonical_json_dumps(decision_payload)
-        return hashlib.sha256(canonical_bytes).hexdigest()
+        return canonical_sha256(decision_payload)
 
     def verify_evidence_link(self, decision: Dict[str, Any], evidence_bundle: Dict[str, Any]) -> bool:
         """
@@ -82,10 +79,19 @@ class ProofVerifier:
         # So the JSON representation on the wire/disk usually implies the ID is the hash, or it's a separate field.
         # Let's assume for VTE strictness, we calculate hash of the Canonical JSON of the bundle (excluding any hash field if present).
         
-        canonical_bundle = canonical_json_dumps(evidence_bundle)
-        calc_bundle_hash = hashlib.sha256(canonical_bundle).hexdigest()
+        calc_bundle_hash = canonical_sha256(evidence_bundle)
         
         if decision["evidence_hash"] != calc_bundle_hash:
              raise ValueError(f"Evidence mismatch. Decision expects {decision['evidence_hash']}, Bundle is {calc_bundle_hash}")
              
         return True
+
+    def verify_inclusion_proof(self, proof: Dict[str, Any], root: str) -> bool:
+        """
+        Verifies that a decision is in the ledger with the given Merkle root, from an
+        inclusion proof (GET /decisions/{id}/proof) alone: O(log n) hashes, no chain replay.
+        """
+        if not verify_inclusion(proof, root):
+            decision_hash = proof.get("decision_hash") if isinstance(proof, dict) else None
+            raise ValueError(f"Inclusion proof for {decision_hash} does not match root {root}")
+        return True
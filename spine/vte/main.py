@@ -41,6 +41,18 @@ app.include_router(oidc.router, prefix="/.well-known", tags=["OIDC Discovery"])
 from vte.api import inventory
 app.include_router(inventory.router, prefix="/api/v1/inventory", tags=["Inventory (Read Only)"])
 
+# Execution outbox: in "thread" mode the API process runs the dispatcher.
+from vte.core.outbox import OUTBOX_DISPATCH_MODE, outbox_dispatcher
+
+@app.on_event("startup")
+def start_outbox_dispatcher():
+    if OUTBOX_DISPATCH_MODE == "thread":
+        outbox_dispatcher.start()
+
+@app.on_event("shutdown")
+def stop_outbox_dispatcher():
+    outbox_dispatcher.stop()
+
 @app.get("/health", tags=["System"])
 def health_check(db: Session = Depends(get_db)):
     """
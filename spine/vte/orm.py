@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, JSON, Enum
+from sqlalchemy import Column, String, Text, TIMESTAMP, ForeignKey, JSON, Enum, Integer, Boolean, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import Uuid as UUID
 # from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
 from sqlalchemy.sql import func
 from vte.db import Base
 import uuid
+import datetime
 
 # Define Enums (must match DB types)
 RoleEnum = Enum('super_admin', 'admin', 'user', 'auditor', 'system_bot', name='role_enum')
@@ -17,15 +18,84 @@ class EvidenceBundle(Base):
     bundle_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     collected_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     normalization_schema = Column(String, nullable=False)
-    items_json = Column(JSON, nullable=False)
+    items_json = Column(JSON, nullable=True) # Legacy inline items
+    item_hashes = Column(JSON, nullable=True) # Ordered keys into evidence_items (content-addressed)
     bundle_hash = Column(String, nullable=False, unique=True)
 
     @property
     def items(self):
-        return self.items_json
+        if self.items_json is not None:
+            return self.items_json
+        from vte.core.evidence_store import bundle_items
+        return bundle_items(self)
+
+class EvidenceItemRecord(Base):
+    """
+    One evidence item, stored once no matter how many bundles reference it.
+    Keyed by the sha256 of the item's canonical JSON.
+    """
+    __tablename__ = "evidence_items"
+
+    item_hash = Column(String, primary_key=True)
+    content = Column(JSON, nullable=False)
+    first_seen_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+# --- Queue Attributes (derived once, when a decision is written) ---
+QUEUE_SLA = datetime.timedelta(days=1)
+
+def queue_priority(action: str) -> int:
+    """
+    1 = High, 2 = Normal, 3 = Low.
+    """
+    if action and "High" in action:
+        return 1
+    if action and "Low" in action:
+        return 3
+    return 2
+
+def _default_priority(context) -> int:
+    return queue_priority(context.get_current_parameters().get("intent_action"))
+
+def _default_sla_deadline(context) -> datetime.datetime:
+    timestamp = context.get_current_parameters().get("timestamp") or datetime.datetime.now(datetime.timezone.utc)
+    return timestamp + QUEUE_SLA
+
+# --- Search Document (indexed by vte.core.search) ---
+# Parameters worth finding a decision by (tenant name first).
+SEARCH_PARAM_KEYS = ("tenant_name", "name", "unit_name", "address", "email", "external_ref_id")
+
+def search_document(action: str, target: str, params) -> str:
+    """
+    Text a decision is found by: action, target and key parameters.
+    """
+    parts = [action or "", target or ""]
+    if isinstance(params, dict):
+        parts.extend(str(params[k]) for k in SEARCH_PARAM_KEYS if params.get(k) not in (None, ""))
+    return " ".join(p for p in parts if p)
+
+def _default_search_text(context) -> str:
+    values = context.get_current_parameters()
+    return search_document(values.get("intent_action"), values.get("intent_target"), values.get("intent_params"))
 
 class DecisionObject(Base):
     __tablename__ = "decision_objects"
+    __table_args__ = (
+        # Chain order (vte.core.chain, chain_verify, chain_export, merkle, replay)
+        Index("ix_decision_objects_chain_seq", "chain_seq", unique=True),
+        # Unified queue: status filter + keyset order (sort_key, decision_id)
+        Index("ix_decision_objects_queue_priority", "outcome", "priority", "decision_id"),
+        Index("ix_decision_objects_queue_sla", "outcome", "sla_deadline", "decision_id"),
+        # GET /decisions: optional equality filter + keyset order (timestamp, decision_id)
+        Index("ix_decision_objects_timestamp", "timestamp", "decision_id"),
+        Index("ix_decision_objects_outcome_timestamp", "outcome", "timestamp", "decision_id"),
+        Index("ix_decision_objects_actor_timestamp", "actor_user_id", "timestamp", "decision_id"),
+        Index("ix_decision_objects_target_timestamp", "intent_target", "timestamp", "decision_id"),
+        # Search on Postgres (SQLite uses the FTS5 table from vte.core.search)
+        Index(
+            "ix_decision_objects_search_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     decision_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     timestamp = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
@@ -53,9 +123,17 @@ class DecisionObject(Base):
     # It does NOT have a foreign key constraint in the SQL migration to permit_tokens (likely to avoid cycle).
     permit_token_id = Column(UUID(as_uuid=True), nullable=True)
 
+    # Queue (not part of the hashed payload)
+    priority = Column(Integer, nullable=False, default=_default_priority)
+    sla_deadline = Column(TIMESTAMP(timezone=True), nullable=False, default=_default_sla_deadline)
+    search_text = Column(Text, nullable=True, default=_default_search_text)
+
     # Chain
     decision_hash = Column(String, nullable=False, unique=True)
-    previous_hash = Column(String, nullable=True) # Managed by DB Trigger
+    previous_hash = Column(String, nullable=True) # Set by vte.core.chain, checked by DB Trigger (0007)
+    # Position in the chain (1-based), assigned by vte.core.chain under the head CAS.
+    # Chain order is chain_seq, not timestamp: appends committed together share a clock tick.
+    chain_seq = Column(Integer, nullable=True)
 
     @property
     def actor(self):
@@ -76,6 +154,90 @@ class DecisionObject(Base):
                 self.parameters = p
         return IntentProxy(self.intent_action, self.intent_target, self.intent_params)
 
+# SQLite search index: an FTS5 table over search_text, kept in sync by triggers.
+DECISION_SEARCH_FTS = "decision_search"
+DECISION_SEARCH_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {DECISION_SEARCH_FTS} USING fts5(decision_id UNINDEXED, document)",
+    f"""CREATE TRIGGER IF NOT EXISTS decision_search_insert AFTER INSERT ON decision_objects BEGIN
+        INSERT INTO {DECISION_SEARCH_FTS} (decision_id, document) VALUES (NEW.decision_id, COALESCE(NEW.search_text, ''));
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS decision_search_delete AFTER DELETE ON decision_objects BEGIN
+        DELETE FROM {DECISION_SEARCH_FTS} WHERE decision_id = OLD.decision_id;
+    END""",
+]
+for _statement in DECISION_SEARCH_FTS_DDL:
+    event.listen(DecisionObject.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(DecisionObject.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+event.listen(DecisionObject.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {DECISION_SEARCH_FTS}").execute_if(dialect="sqlite"))
+
+class ChainHead(Base):
+    """
+    Current tip of a hash chain (one row per chain, e.g. "decisions").
+    Moved by vte.core.chain in the same transaction as the append, so reading
+    the head is a primary-key lookup instead of an ORDER BY over the chain.
+    """
+    __tablename__ = "chain_heads"
+
+    chain = Column(String, primary_key=True)
+    head_hash = Column(String, nullable=False)
+    head_decision_id = Column(UUID(as_uuid=True), nullable=True)
+    length = Column(Integer, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+class ChainCheckpoint(Base):
+    """
+    A verified prefix of a hash chain: its first `height` decisions end at head_hash.
+    Written and HMAC-signed by vte.core.chain_verify after a clean verification,
+    so the next run only verifies what was appended since. A links_only checkpoint
+    seals decisions hashed before hashes were reproducible: only their links were
+    checked, and later full runs report their hash mismatches as legacy.
+    """
+    __tablename__ = "chain_checkpoints"
+    __table_args__ = (
+        Index("ix_chain_checkpoints_chain_height", "chain", "height"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chain = Column(String, nullable=False)
+    height = Column(Integer, nullable=False)
+    head_hash = Column(String, nullable=False)
+    head_decision_id = Column(UUID(as_uuid=True), nullable=False)
+    links_only = Column(Boolean, nullable=False, default=False)
+    verified_at = Column(TIMESTAMP(timezone=True), nullable=False, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    signature = Column(String, nullable=False)
+
+class MerkleNode(Base):
+    """
+    Node of the Merkle mountain range over the decision ledger (vte.core.merkle),
+    by post-order position. Leaves carry their leaf_index and decision. Written in
+    the same transaction as the decision; never updated.
+    """
+    __tablename__ = "merkle_nodes"
+
+    position = Column(Integer, primary_key=True, autoincrement=False)
+    height = Column(Integer, nullable=False)
+    hash = Column(String, nullable=False)
+    leaf_index = Column(Integer, nullable=True, unique=True)
+    decision_id = Column(UUID(as_uuid=True), ForeignKey("decision_objects.decision_id"), nullable=True, unique=True)
+
+class ExecutionOutbox(Base):
+    """
+    Approved decisions waiting to be handed to the execution workers.
+    Written in the same transaction as the decision (vte.core.chain), drained by
+    vte.core.outbox. One row per decision; dispatched_at is set once sent.
+    """
+    __tablename__ = "execution_outbox"
+    __table_args__ = (
+        Index("ix_execution_outbox_pending", "dispatched_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    decision_id = Column(UUID(as_uuid=True), ForeignKey("decision_objects.decision_id"), nullable=False, unique=True)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    dispatched_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+
 class PermitToken(Base):
     __tablename__ = "permit_tokens"
     
@@ -121,6 +283,20 @@ class Unit(Base):
 
     property = relationship("Property", back_populates="units")
 
+class ProjectionCheckpoint(Base):
+    """
+    Progress of a projection replay (vte.core.replay): the last decision applied,
+    in chain order. Written in the same transaction as the projected rows.
+    """
+    __tablename__ = "projection_checkpoints"
+
+    name = Column(String, primary_key=True) # e.g. "inventory"
+    last_timestamp = Column(TIMESTAMP(timezone=True), nullable=True)
+    last_decision_id = Column(UUID(as_uuid=True), nullable=True)
+    last_decision_hash = Column(String, nullable=True)
+    decisions_applied = Column(Integer, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
 # --- Security & Identity ---
 
 class TOTPDevice(Base):
@@ -1,4 +1,5 @@
 from vte.worker import celery_app
+from celery.signals import worker_process_init
 import time
 from vte.agents.ingest import IngestionAgent
 from vte.agents.auditor import AuditorAgent
@@ -38,9 +39,19 @@ from vte.orm import DecisionObject
 from vte.api.schema import OutcomeEnum
 from vte.adapters.appfolio.client import AppFolioClient
 import logging
+from typing import List
 
 logger = logging.getLogger("vte.tasks.execution")
 
+@worker_process_init.connect
+def warm_contract_registry(**kwargs):
+    """
+    Loads and compiles contracts once when a worker process starts,
+    so the first decision does not pay for it.
+    """
+    from vte.core.engine import feature_contracts
+    feature_contracts.snapshot()
+
 @celery_app.task(name="execution.decision.execute")
 def execute_decision(decision_id: str):
     """
@@ -66,5 +77,50 @@ def execute_decision(decision_id: str):
     finally:
         db.close()
 
+@celery_app.task(name="execution.decision.execute_batch")
+def execute_decision_batch(decision_ids: List[str]):
+    """
+    Executes a batch of APPROVED decisions (backfills, nightly catch-up) in order.
+    Per-decision failures are reported in the results, not raised.
+    """
+    logger.info(f"Delegate Batch Execution to Engine: {len(decision_ids)} decisions")
+    db = SessionLocal()
+    try:
+        from vte.core.engine import WorkflowEngine
+        import uuid
+
+        engine = WorkflowEngine(db)
+        results = engine.execute_decisions([uuid.UUID(d) for d in decision_ids])
+
+        failed = sum(1 for r in results if r["status"] == "failed")
+        logger.info(f"Engine Batch Result: {len(results) - failed} ok, {failed} failed")
+        return {"status": "success", "total": len(results), "failed": failed, "results": results}
+
+    except Exception as e:
+        logger.error(f"Engine Batch Execution Failed: {e}")
+        return {"status": "failed", "error": str(e)}
+    finally:
+        db.close()
+
+@celery_app.task(name="projection.rebuild")
+def rebuild_projections(reset: bool = False):
+    """
+    Rebuilds the inventory read model from the decision log (no permits, no external effects).
+    Resumes from the last checkpoint unless reset=True.
+    """
+    logger.info(f"Projection Rebuild Started (reset={reset})")
+    db = SessionLocal()
+    try:
+        from vte.core.replay import ProjectionReplayer
+
+        stats = ProjectionReplayer(db).rebuild(reset=reset)
+        return {"status": "success", **stats}
+
+    except Exception as e:
+        logger.error(f"Projection Rebuild Failed: {e}")
+        return {"status": "failed", "error": str(e)}
+    finally:
+        db.close()
+
 # --- Legacy Projections Removed (Moved to Engine) ---
 # def handle_inventory_projection...